@@ -0,0 +1,62 @@
+"""Microbenchmark of IFBench word and stopword counting.
+
+Compares the counting functions of ``instructions_util`` with their previous
+implementations, which built a tokenizer and reloaded the stopword list on
+every call. Requires the NLTK ``stopwords`` corpus.
+
+Usage: python benchmarks/bench_instructions_util.py [--words N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+import nltk
+
+from slam_eval.ifbench.third_party import instructions_util
+
+
+def count_words_baseline(text: str) -> int:
+    tokenizer = nltk.tokenize.RegexpTokenizer(r"\w+")
+    return len(tokenizer.tokenize(text))
+
+
+def count_stopwords_baseline(text: str) -> int:
+    stopwords = nltk.corpus.stopwords.words("english")
+    tokenizer = nltk.tokenize.RegexpTokenizer(r"\w+")
+    tokens = tokenizer.tokenize(text)
+    return len([t for t in tokens if t.lower() in stopwords])
+
+
+def make_response(num_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    vocabulary = instructions_util.WORD_LIST + list(instructions_util.get_stopwords())
+    return " ".join(rng.choice(vocabulary) for _ in range(num_words))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    text = make_response(args.words)
+    benchmarks = [
+        ("count_words", count_words_baseline, instructions_util.count_words),
+        ("count_stopwords", count_stopwords_baseline, instructions_util.count_stopwords),
+    ]
+    for name, baseline, current in benchmarks:
+        assert baseline(text) == current(text)
+        baseline_time = timeit.timeit(lambda: baseline(text), number=args.repeat)
+        current_time = timeit.timeit(lambda: current(text), number=args.repeat)
+        print(
+            f"{name}: baseline {1e6 * baseline_time / args.repeat:.1f} us, "
+            f"current {1e6 * current_time / args.repeat:.1f} us, "
+            f"speedup x{baseline_time / current_time:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
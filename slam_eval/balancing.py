@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Sequence
+
+from slam_eval.transport import is_retriable_error
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Endpoint:
+    url: str
+    outstanding: int = 0
+    num_requests: int = 0
+    num_failures: int = 0
+    num_ejections: int = 0
+    ejected_until: float = 0.0
+
+
+class EndpointBalancer:
+    """Spreads requests over replicas serving the same model.
+
+    Every request goes to the replica with the fewest requests in flight, ties
+    are broken round-robin. A replica failing ``failure_threshold`` times in a
+    row with a retriable error is ejected for ``ejection_time`` seconds and
+    then gets requests again. If every replica is ejected, requests go to all
+    of them rather than nowhere.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        failure_threshold: int = 3,
+        ejection_time: float = 30.0,
+        is_failure: Callable[[BaseException], bool] = is_retriable_error,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one endpoint URL is required")
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._endpoints = [_Endpoint(url) for url in urls]
+        self._next_index = 0
+
+    @property
+    def urls(self) -> list[str]:
+        return [endpoint.url for endpoint in self._endpoints]
+
+    def healthy_urls(self) -> list[str]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                endpoint.url
+                for endpoint in self._endpoints
+                if endpoint.ejected_until <= now
+            ]
+
+    def metrics(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint.url: {
+                    "outstanding": endpoint.outstanding,
+                    "num_requests": endpoint.num_requests,
+                    "num_ejections": endpoint.num_ejections,
+                    "ejected": endpoint.ejected_until > now,
+                }
+                for endpoint in self._endpoints
+            }
+
+    @contextmanager
+    def endpoint(self) -> Iterator[str]:
+        """Pick a replica and record the outcome of the request sent to it."""
+        endpoint = self._acquire()
+        try:
+            yield endpoint.url
+        except BaseException as err:
+            self._release(endpoint, err)
+            raise
+        self._release(endpoint)
+
+    def _acquire(self) -> _Endpoint:
+        now = time.monotonic()
+        with self._lock:
+            num_endpoints = len(self._endpoints)
+            # Starting the scan at a rotating offset breaks ties round-robin
+            candidates = [
+                self._endpoints[(self._next_index + i) % num_endpoints]
+                for i in range(num_endpoints)
+            ]
+            self._next_index = (self._next_index + 1) % num_endpoints
+            healthy = [
+                endpoint for endpoint in candidates if endpoint.ejected_until <= now
+            ]
+            chosen = min(healthy or candidates, key=lambda e: e.outstanding)
+            chosen.outstanding += 1
+            chosen.num_requests += 1
+            return chosen
+
+    def _release(self, endpoint: _Endpoint, error: BaseException | None = None) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            if isinstance(error, asyncio.CancelledError):
+                # E.g. a request that lost to its hedge, it has no outcome
+                return
+            if error is None or not self.is_failure(error):
+                endpoint.num_failures = 0
+                return
+
+            endpoint.num_failures += 1
+            if endpoint.num_failures < self.failure_threshold:
+                return
+            LOGGER.warning(
+                "Eject %s for %.1f s after %s consecutive failures",
+                endpoint.url,
+                self.ejection_time,
+                endpoint.num_failures,
+            )
+            endpoint.num_failures = 0
+            endpoint.num_ejections += 1
+            endpoint.ejected_until = time.monotonic() + self.ejection_time
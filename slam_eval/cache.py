@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Sequence
+
+from slam_eval.model import Model
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Return the cached value or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteResponseCache(ResponseCache):
+    """On-disk response store with size-bounded LRU eviction.
+
+    Cache hits only note the access time in memory. The noted times are
+    written together with the next ``set``, once ``_MAX_PENDING_ACCESSES``
+    hits pile up, or on ``close``, so that a run served from the cache does
+    not commit once per case.
+    """
+
+    # Hits whose access times are written in one transaction
+    _MAX_PENDING_ACCESSES = 1000
+    # Eviction frees space down to this fraction of max_size_bytes, so that a
+    # full cache does not evict on every set
+    _EVICTION_TARGET = 0.9
+
+    def __init__(self, path: str, max_size_bytes: int = 1024**3) -> None:
+        self.path = Path(path).expanduser()
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._total_size = 0
+        self._pending_accesses: dict[str, float] = {}
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._pending_accesses[key] = time.time()
+            if len(self._pending_accesses) >= self._MAX_PENDING_ACCESSES:
+                self._flush_accesses(connection)
+                connection.commit()
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        serialized_value = json.dumps(value)
+        size = len(serialized_value.encode("utf-8"))
+
+        with self._lock:
+            connection = self._get_connection()
+            self._pending_accesses.pop(key, None)
+            self._flush_accesses(connection)
+            row = connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, serialized_value, size, time.time()),
+            )
+            self._total_size += size - (row[0] if row is not None else 0)
+            if self._total_size > self.max_size_bytes:
+                self._evict(connection)
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._flush_accesses(self._connection)
+                self._connection.commit()
+                self._connection.close()
+                self._connection = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL lets readers go on while a set commits, and with
+            # synchronous=NORMAL commits do not wait for an fsync
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access "
+                "ON responses (last_access)"
+            )
+            self._connection.commit()
+            self._total_size = self._count_total_size(self._connection)
+        return self._connection
+
+    def _flush_accesses(self, connection: sqlite3.Connection) -> None:
+        if not self._pending_accesses:
+            return
+        connection.executemany(
+            "UPDATE responses SET last_access = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._pending_accesses.items()],
+        )
+        self._pending_accesses.clear()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # The running total misses entries set by other processes sharing
+        # the file, so it is recounted before evicting
+        self._total_size = self._count_total_size(connection)
+        target_size = self.max_size_bytes * self._EVICTION_TARGET
+        if self._total_size <= self.max_size_bytes:
+            return
+
+        rows = connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        )
+        keys_to_evict = []
+        for key, size in rows:
+            if self._total_size <= target_size:
+                break
+            keys_to_evict.append((key,))
+            self._total_size -= size
+
+        connection.executemany("DELETE FROM responses WHERE key = ?", keys_to_evict)
+
+    @staticmethod
+    def _count_total_size(connection: sqlite3.Connection) -> int:
+        (total_size,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return int(total_size)
+
+
+def make_cache_key(model: Model, x: Any) -> str:
+    key_payload = {
+        "model": model.name,
+        "params": model.cache_params(),
+        "x": x,
+    }
+    serialized = json.dumps(key_payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class CachedModel(Model):
+    def __init__(self, model: Model, cache: ResponseCache) -> None:
+        super().__init__(model.name)
+        self.model = model
+        self.cache = cache
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return self.model.max_concurrent_requests
+
+    def cache_params(self) -> dict[str, Any]:
+        return self.model.cache_params()
+
+    def metrics(self) -> dict[str, Any]:
+        return self.model.metrics()
+
+    def predict(self, x: Any) -> Any:
+        key = make_cache_key(self.model, x)
+        cached_value = self.cache.get(key)
+        if cached_value is not None:
+            return cached_value
+
+        y_pred = self.model.predict(x)
+        self.cache.set(key, y_pred)
+        return y_pred
+
+    def predict_batch(self, xs: Sequence[Any]) -> list[Any]:
+        keys = [make_cache_key(self.model, x) for x in xs]
+        y_preds = [self.cache.get(key) for key in keys]
+
+        missing_indices = [i for i, y_pred in enumerate(y_preds) if y_pred is None]
+        if missing_indices:
+            new_y_preds = self.model.predict_batch([xs[i] for i in missing_indices])
+            for i, y_pred in zip(missing_indices, new_y_preds, strict=True):
+                self.cache.set(keys[i], y_pred)
+                y_preds[i] = y_pred
+
+        return y_preds
+
+    async def apredict(self, x: Any) -> Any:
+        # Cache lookups hit the disk, which would block the event loop
+        key = make_cache_key(self.model, x)
+        cached_value = await asyncio.to_thread(self.cache.get, key)
+        if cached_value is not None:
+            return cached_value
+
+        y_pred = await self.model.apredict(x)
+        await asyncio.to_thread(self.cache.set, key, y_pred)
+        return y_pred
+
+    def close(self) -> None:
+        self.model.close()
+        self.cache.close()
+
+    async def aclose(self) -> None:
+        await self.model.aclose()
+        self.cache.close()
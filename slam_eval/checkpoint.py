@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+from slam_eval.runner import CaseResult
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RunCheckpoint:
+    """Append-only record of finished cases of a single evaluation run.
+
+    Every finished case is written as one JSON line and flushed immediately, so
+    a crashed or preempted run can be resumed from the last finished case.
+    Shards of a run also write the metrics of their model once they finish,
+    to be stored with the merged run.
+    """
+
+    def __init__(self, checkpoint_dir: str | Path, run_id: str) -> None:
+        self.run_id = run_id
+        self.path = Path(checkpoint_dir).expanduser() / f"{run_id}.jsonl"
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[int, CaseResult]:
+        completed_cases: dict[int, CaseResult] = {}
+        for record in self._iter_records():
+            if "index" not in record:
+                # E.g. the model metrics written by a finished shard
+                continue
+            completed_cases[record["index"]] = CaseResult(
+                index=record["index"],
+                model_answer=record["model_answer"],
+                score=record["score"],
+                scores_by_scorer=record.get("scores_by_scorer", {}),
+                num_retries=record.get("num_retries"),
+            )
+
+        return completed_cases
+
+    def load_model_metrics(self) -> dict[str, Any]:
+        """Return the model metrics written last, empty if there are none."""
+        model_metrics: dict[str, Any] = {}
+        for record in self._iter_records():
+            model_metrics = record.get("model_metrics", model_metrics)
+        return model_metrics
+
+    def reset(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text("", encoding="utf-8")
+
+    def append(self, result: CaseResult) -> None:
+        record = {
+            "index": result.index,
+            "model_answer": result.model_answer,
+            "score": result.score,
+        }
+        if result.scores_by_scorer:
+            record["scores_by_scorer"] = result.scores_by_scorer
+        if result.num_retries is not None:
+            record["num_retries"] = result.num_retries
+        self._append_record(record)
+
+    def append_model_metrics(self, model_metrics: dict[str, Any]) -> None:
+        self._append_record({"model_metrics": model_metrics})
+
+    def remove(self) -> None:
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    def _append_record(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            # A resumed run may start before any checkpoint was written
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _iter_records(self) -> Iterator[dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash may leave the last line half-written
+                        continue
+        except FileNotFoundError:
+            pass
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterator
-from typing import Any, Optional, TypedDict, TypeVar, cast
+from typing import Any, Optional, TypedDict, TypeVar, cast, overload
 
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -51,6 +51,57 @@ class EvalCaseCollection(ABC):
             )
         return self.collection_len
 
+    @overload
+    def __getitem__(self, index: int) -> EvalCase: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[EvalCase]: ...
+
+    @check_if_loaded
+    def __getitem__(self, index: int | slice) -> EvalCase | list[EvalCase]:
+        """Return the case at the index, or the list of cases for a slice.
+
+        Random access does not consume the iterator, so a loaded collection can
+        be shared by several workers, each reading its own indices.
+        """
+        if isinstance(index, slice):
+            return [self._get_case(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(
+                f"Index {index} out of range for collection {self.name} "
+                f"of length {len(self)}"
+            )
+        return self._get_case(index)
+
+    @check_if_loaded
+    def iter_range(self, start: int, stop: int) -> Iterator[EvalCase]:
+        """Yield cases from ``start`` up to ``stop``, clipped to the length."""
+        for i in range(*slice(start, stop).indices(len(self))):
+            yield self._get_case(i)
+
+    @check_if_loaded
+    def shard_range(self, shard_index: int, num_shards: int) -> range:
+        """Return the indices of the cases in the shard.
+
+        Shards are contiguous and their sizes differ by at most one case.
+        """
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(
+                f"Shard index must be in [0, {num_shards}), got {shard_index}"
+            )
+        length = len(self)
+        return range(
+            shard_index * length // num_shards,
+            (shard_index + 1) * length // num_shards,
+        )
+
+    def _get_case(self, index: int) -> EvalCase:
+        raise NotImplementedError(
+            f"Collection {self.name} does not support random access"
+        )
+
     @abstractmethod
     def _load(self) -> CollectionInfo: ...
 
@@ -28,6 +28,7 @@ class IFBench(EvalCaseCollection):
         super().__init__(name)
         self.jsonl_path = Path(jsonl_path)
         self.download_url = download_url
+        self._lines: list[str] = []
 
     def _ensure_dataset(self) -> None:
         if self.jsonl_path.exists():
@@ -40,24 +41,36 @@ class IFBench(EvalCaseCollection):
 
     def _load(self) -> CollectionInfo:
         self._ensure_dataset()
-        lines = self.jsonl_path.read_text(encoding="utf-8").splitlines()
+        raw_lines = self.jsonl_path.read_text(encoding="utf-8").splitlines()
+        # Empty lines are dropped so that indices match the iteration order
+        lines = [line for line in raw_lines if line.strip()]
+        self._lines = lines
 
         def _iterator() -> Iterator[_IFBenchExample]:
             for line in lines:
-                if not line.strip():
-                    continue
-                payload = json.loads(line)
-                yield _IFBenchExample(
-                    prompt=payload["prompt"],
-                    instruction_id_list=payload["instruction_id_list"],
-                    kwargs=payload["kwargs"],
-                )
+                yield self._parse_line(line)
 
         return CollectionInfo(collection=_iterator(), collection_len=len(lines))
 
+    @staticmethod
+    def _parse_line(line: str) -> _IFBenchExample:
+        payload = json.loads(line)
+        return _IFBenchExample(
+            prompt=payload["prompt"],
+            instruction_id_list=payload["instruction_id_list"],
+            kwargs=payload["kwargs"],
+        )
+
     @check_if_loaded
     def __next__(self) -> TextGenerationWithUniqueGroundTruth:
         raw_item = next(self.collection)  # type: ignore
+        return self._make_case(raw_item)
+
+    def _get_case(self, index: int) -> TextGenerationWithUniqueGroundTruth:
+        return self._make_case(self._parse_line(self._lines[index]))
+
+    @staticmethod
+    def _make_case(raw_item: _IFBenchExample) -> TextGenerationWithUniqueGroundTruth:
         metadata = {
             "instruction_id_list": raw_item.instruction_id_list,
             "kwargs": raw_item.kwargs,
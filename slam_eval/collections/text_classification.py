@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterator, TypedDict
+from typing import Iterator, Sequence, TypedDict
 
 from kygs.message_provider import Message, MessageProvider
 
@@ -17,9 +17,11 @@ class RedditPostsSmallDataset(EvalCaseCollection):
     def __init__(self, name: str, message_provider: MessageProvider) -> None:
         super().__init__(name)
         self.message_provider = message_provider
+        self._messages: Sequence[Message] = []
 
     def _load(self) -> CollectionInfo:
         messages = self.message_provider.messages
+        self._messages = messages
 
         def _iter_messages() -> Iterator[Message]:
             for message in messages:
@@ -30,7 +32,13 @@ class RedditPostsSmallDataset(EvalCaseCollection):
     @check_if_loaded
     def __next__(self) -> TextClassificationWithUniqueGroundTruth:
         assert self.collection is not None  # check_if_loaded ensures this
-        message = next(self.collection)
+        return self._make_case(next(self.collection))
+
+    def _get_case(self, index: int) -> TextClassificationWithUniqueGroundTruth:
+        return self._make_case(self._messages[index])
+
+    @staticmethod
+    def _make_case(message: Message) -> TextClassificationWithUniqueGroundTruth:
         label = message.true_label if message.true_label is not None else message.label
         if label is None:
             raise ValueError("Message does not contain either true_label or label")
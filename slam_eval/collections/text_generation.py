@@ -39,6 +39,7 @@ class BigBenchHard(EvalCaseCollection):
         self.split = split
         self.subset = subset
         self.user_prompt_template = user_prompt_template
+        self._dataset: Optional[datasets.Dataset] = None
 
     def _load(self) -> CollectionInfo:
         collection = datasets.load_dataset(
@@ -46,6 +47,7 @@ class BigBenchHard(EvalCaseCollection):
             self.subset,
             split=self.split,
         )
+        self._dataset = collection
         return CollectionInfo(
             collection=iter(collection),
             collection_len=collection.num_rows,
@@ -54,6 +56,15 @@ class BigBenchHard(EvalCaseCollection):
     @check_if_loaded
     def __next__(self) -> TextGenerationWithUniqueGroundTruth:
         raw_item = next(self.collection)  # type: ignore
+        return self._make_case(raw_item)
+
+    def _get_case(self, index: int) -> TextGenerationWithUniqueGroundTruth:
+        assert self._dataset is not None  # set together with self.collection
+        return self._make_case(self._dataset[index])
+
+    def _make_case(
+        self, raw_item: dict[str, Any]
+    ) -> TextGenerationWithUniqueGroundTruth:
         return TextGenerationWithUniqueGroundTruth(  # type: ignore[misc]
             x=TextGenerationInput(
                 system_prompt=None,
@@ -82,29 +93,36 @@ class MergeQuality(EvalCaseCollection):
         super().__init__(name)
         self.jsonl_path = Path(jsonl_path).expanduser()
         self.user_prompt_template = user_prompt_template
+        self._lines: list[str] = []
 
     def _load(self) -> CollectionInfo:
         raw_lines = self.jsonl_path.read_text(encoding="utf-8").splitlines()
         non_empty_lines = [line for line in raw_lines if line.strip()]
+        # Lines are parsed on access, both when iterating and by index
+        self._lines = non_empty_lines
 
         def _iterator() -> Iterator[_MergeQualityExample]:
             for line in non_empty_lines:
-                payload = json.loads(line)
-                ground_truth = payload["ground_truth"]
-                attributes = ground_truth["attributes"]
-                unique_identifiers = payload["provided_identifiers"]
-                chunks = [chunk["content"] for chunk in payload.get("chunks", [])]
-
-                yield _MergeQualityExample(
-                    attributes=attributes,
-                    unique_identifiers=unique_identifiers,
-                    chunks=chunks,
-                )
+                yield self._parse_line(line)
 
         return CollectionInfo(
             collection=_iterator(), collection_len=len(non_empty_lines)
         )
 
+    @staticmethod
+    def _parse_line(line: str) -> _MergeQualityExample:
+        payload = json.loads(line)
+        ground_truth = payload["ground_truth"]
+        attributes = ground_truth["attributes"]
+        unique_identifiers = payload["provided_identifiers"]
+        chunks = [chunk["content"] for chunk in payload.get("chunks", [])]
+
+        return _MergeQualityExample(
+            attributes=attributes,
+            unique_identifiers=unique_identifiers,
+            chunks=chunks,
+        )
+
     @staticmethod
     def _format_unique_identifiers(unique_identifiers: dict[str, Any]) -> str:
         return json.dumps(unique_identifiers, ensure_ascii=False, indent=2)
@@ -116,6 +134,14 @@ class MergeQuality(EvalCaseCollection):
     @check_if_loaded
     def __next__(self) -> TextGenerationWithUniqueGroundTruth:
         raw_item = next(self.collection)  # type: ignore
+        return self._make_case(raw_item)
+
+    def _get_case(self, index: int) -> TextGenerationWithUniqueGroundTruth:
+        return self._make_case(self._parse_line(self._lines[index]))
+
+    def _make_case(
+        self, raw_item: _MergeQualityExample | dict[str, Any]
+    ) -> TextGenerationWithUniqueGroundTruth:
         if isinstance(raw_item, dict):  # pragma: no cover - defensive
             attributes = raw_item["attributes"]
             unique_identifiers = raw_item["unique_identifiers"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from slam_eval.transport import is_overload_error
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Caps requests in flight with a limit adjusted by AIMD.
+
+    Every healthy response adds ``increase_step / limit`` to the limit, i.e.
+    about ``increase_step`` per full window of requests. Throttling, server
+    errors, timeouts and responses slower than ``latency_threshold`` seconds
+    cut the limit by ``decrease_factor``, at most once per window: requests
+    sent before the last cut do not cut it again.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_threshold: float | None = None,
+        latency_smoothing: float = 0.2,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit, "
+                f"got {min_limit}, {initial_limit}, {max_limit}"
+            )
+        if not 0.0 < decrease_factor < 1.0:
+            raise ValueError(
+                f"Decrease factor must be in (0, 1), got {decrease_factor}"
+            )
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.latency_smoothing = latency_smoothing
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]
+        ] = []
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._latency: float | None = None
+        self._num_overloads = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def latency(self) -> float | None:
+        """Exponentially smoothed latency of successful requests in seconds."""
+        return self._latency
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "latency": self._latency,
+                "num_overloads": self._num_overloads,
+            }
+
+    def acquire(self) -> float:
+        """Wait for a free slot and return the start time of the request."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    async def aacquire(self) -> float:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return time.monotonic()
+                waiter: asyncio.Future[None] = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, start_time: float, error: BaseException | None = None) -> None:
+        """Free the slot and adjust the limit to the outcome of the request.
+
+        Errors that are not overload signals, e.g. a malformed request, leave
+        the limit unchanged.
+        """
+        now = time.monotonic()
+        latency = now - start_time
+        with self._lock:
+            self._in_flight -= 1
+            if error is not None:
+                is_overloaded = is_overload_error(error)
+            else:
+                self._observe_latency(latency)
+                is_overloaded = (
+                    self.latency_threshold is not None
+                    and latency > self.latency_threshold
+                )
+
+            if is_overloaded:
+                self._num_overloads += 1
+                if start_time >= self._last_decrease:
+                    self._decrease(now)
+            elif error is None:
+                self._limit = min(
+                    float(self.max_limit),
+                    self._limit + self.increase_step / self._limit,
+                )
+            self._notify_waiters()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        start_time = self.acquire()
+        try:
+            yield
+        except BaseException as err:
+            self.release(start_time, err)
+            raise
+        self.release(start_time)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        start_time = await self.aacquire()
+        try:
+            yield
+        except BaseException as err:
+            self.release(start_time, err)
+            raise
+        self.release(start_time)
+
+    def _observe_latency(self, latency: float) -> None:
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self.latency_smoothing * (latency - self._latency)
+
+    def _decrease(self, now: float) -> None:
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_decrease = now
+        LOGGER.info(
+            "Endpoint overloaded, cut concurrency limit to %s", int(self._limit)
+        )
+
+    def _notify_waiters(self) -> None:
+        # Called with the lock held
+        self._condition.notify_all()
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(_wake_up, waiter)
+        self._async_waiters.clear()
+
+
+def _wake_up(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
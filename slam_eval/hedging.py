@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Awaitable, Callable, TypeVar
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """Sends a duplicate of a request that is slower than most requests.
+
+    A request that has not answered within the ``percentile`` of the latencies
+    of the last ``window_size`` successful requests gets one duplicate, and the
+    first successful response wins. Hedging starts after ``min_samples``
+    latencies are observed, and at most ``max_hedge_rate`` of the requests are
+    duplicated so that a slow endpoint does not get twice the load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_rate: float = 0.05,
+        min_samples: int = 20,
+        window_size: int = 1000,
+    ) -> None:
+        if not 0.0 < percentile < 100.0:
+            raise ValueError(f"Percentile must be in (0, 100), got {percentile}")
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._num_requests = 0
+        self._num_hedges = 0
+
+    @property
+    def num_hedges(self) -> int:
+        return self._num_hedges
+
+    def hedge_delay(self) -> float | None:
+        """Latency after which a request is hedged, None until enough samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        rank = math.ceil(self.percentile / 100.0 * len(latencies)) - 1
+        return latencies[max(rank, 0)]
+
+    def call(self, func: Callable[[], T], executor: Executor) -> T:
+        """Call ``func``, duplicating the call in ``executor`` if it is slow.
+
+        A losing call cannot be interrupted and finishes in the background,
+        so ``func`` must hold any shared resource, e.g. a concurrency slot,
+        itself rather than rely on the caller.
+        """
+        delay = self._start_request()
+        if delay is None:
+            return self._timed(func)
+
+        primary = executor.submit(self._timed, func)
+        if wait([primary], timeout=delay).done or not self._try_start_hedge():
+            return primary.result()
+
+        hedge = executor.submit(self._timed, func)
+        pending: set[Future[T]] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        # Both calls failed
+        return primary.result()
+
+    async def acall(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Await ``func``, duplicating the call if it is slow.
+
+        The losing call is cancelled.
+        """
+        delay = self._start_request()
+        if delay is None:
+            return await self._atimed(func)
+
+        primary = asyncio.create_task(self._atimed(func))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._try_start_hedge():
+            return await primary
+
+        hedge = asyncio.create_task(self._atimed(func))
+        pending: set[asyncio.Task[T]] = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Both calls failed
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _start_request(self) -> float | None:
+        with self._lock:
+            self._num_requests += 1
+        return self.hedge_delay()
+
+    def _try_start_hedge(self) -> bool:
+        with self._lock:
+            if self._num_hedges + 1 > self.max_hedge_rate * self._num_requests:
+                return False
+            self._num_hedges += 1
+        LOGGER.debug("Hedge a request slower than %s percentile", self.percentile)
+        return True
+
+    def _timed(self, func: Callable[[], T]) -> T:
+        start_time = time.monotonic()
+        result = func()
+        self._observe(time.monotonic() - start_time)
+        return result
+
+    async def _atimed(self, func: Callable[[], Awaitable[T]]) -> T:
+        start_time = time.monotonic()
+        result = await func()
+        self._observe(time.monotonic() - start_time)
+        return result
+
+    def _observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
@@ -1,35 +1,90 @@
 from __future__ import annotations
 
 import inspect
+import json
+import threading
+from dataclasses import dataclass
 from typing import Any, Dict, Iterable, Mapping
 
 from slam_eval.ifbench.checker_factory import IFBenchCheckerFactory
+from slam_eval.ifbench.third_party import instructions_util
 from slam_eval.scorer import Scorer
 
 
+@dataclass(frozen=True)
+class CheckerPlan:
+    """Checkers of a single case, built and configured once for all responses."""
+
+    instruction_ids: tuple[str, ...]
+    checkers: tuple[Any, ...]
+
+    def __call__(self, y_pred: str) -> float:
+        if not self.checkers:
+            return 0.0
+
+        with instructions_util.analysis_scope(y_pred):
+            results = [
+                bool(checker.check_following(y_pred)) for checker in self.checkers
+            ]
+        return sum(results) / len(results)
+
+
 class IFBenchScorer(Scorer):
     def __init__(self, name: str, checker_factory: IFBenchCheckerFactory) -> None:
         super().__init__(name)
         self._checker_factory = checker_factory
         self._build_signature_cache: dict[type[Any], tuple[set[str], bool]] = {}
+        self._plans: dict[str, CheckerPlan] = {}
+        self._plans_lock = threading.Lock()
 
     def __call__(self, y_true: Mapping[str, Any], y_pred: str) -> float:
+        return self.get_plan(y_true)(y_pred)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Plans are rebuilt on demand, so only the configuration is pickled
+        state = self.__dict__.copy()
+        state["_build_signature_cache"] = {}
+        state["_plans"] = {}
+        del state["_plans_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._plans_lock = threading.Lock()
+
+    def precompile(self, y_trues: Iterable[Mapping[str, Any]]) -> None:
+        """Build checker plans for the given cases ahead of scoring."""
+        for y_true in y_trues:
+            self.get_plan(y_true)
+
+    def get_plan(self, y_true: Mapping[str, Any]) -> CheckerPlan:
+        plan_key = json.dumps(y_true, sort_keys=True, default=str)
+        plan = self._plans.get(plan_key)
+        if plan is not None:
+            return plan
+
+        with self._plans_lock:
+            if plan_key not in self._plans:
+                self._plans[plan_key] = self.compile(y_true)
+            return self._plans[plan_key]
+
+    def compile(self, y_true: Mapping[str, Any]) -> CheckerPlan:
         instruction_ids: Iterable[str] = y_true["instruction_id_list"]
         kwargs_list: Iterable[Dict[str, Any]] = y_true["kwargs"]
 
-        results = []
+        checkers = []
         for instruction_id, raw_kwargs in zip(
             instruction_ids, kwargs_list, strict=True
         ):
             checker = self._checker_factory(instruction_id)
             build_kwargs = self._prepare_build_description_kwargs(checker, raw_kwargs)
             checker.build_description(**build_kwargs)
-            results.append(bool(checker.check_following(y_pred)))
+            checkers.append(checker)
 
-        if not results:
-            return 0.0
-
-        return sum(results) / len(results)
+        return CheckerPlan(
+            instruction_ids=tuple(y_true["instruction_id_list"]),
+            checkers=tuple(checkers),
+        )
 
     def _prepare_build_description_kwargs(
         self,
@@ -22,9 +22,9 @@ import string
 from pathlib import Path
 from typing import Dict, Optional, Sequence, Union
 
-# Set NLTK data path to local directory before importing nltk
+# Also look up NLTK data in a local directory, if one was set up next to the
+# package. Missing resources are downloaded on first use to the NLTK default
 _nltk_data_dir = Path(__file__).parent / ".nltk_data"
-_nltk_data_dir.mkdir(exist_ok=True)
 os.environ.setdefault("NLTK_DATA", str(_nltk_data_dir))
 
 import nltk
@@ -313,7 +313,7 @@ class ConjunctionCountChecker(Instruction):
     def check_following(self, value):
         """Checks if the response contains the expected number of different coordinating conjunctions."""
         # Split the text into words
-        words = value.split()
+        words = instructions_util.get_analysis(value).words
         # Count the number of coordinating conjunctions
         conjunctions = [
             word
@@ -552,7 +552,7 @@ class SingleVowelParagraphChecker(Instruction):
 
     def check_following(self, value):
         """Checks if no more than three types of vowels are used in the response and the response is only 1 paragraph."""
-        paragraphs = value.strip().split("\n")
+        paragraphs = instructions_util.get_analysis(value).paragraphs
         if len(paragraphs) != 1:
             return False
         paragraph = paragraphs[0].lower()
@@ -1048,7 +1048,7 @@ class NthWordJapaneseChecker(Instruction):
             japanese_pattern = re.compile(r"[\u3040-\u30ff\u4e00-\u9fff]")
             return bool(japanese_pattern.search(text))
 
-        words = value.split()
+        words = instructions_util.get_analysis(value).words
         for i, word in enumerate(words):
             word = word.strip("".join(string.punctuation) + " ")
             if (i + 1) % self._japanese_position == 0 and word and not word.isdigit():
@@ -1076,12 +1076,8 @@ class StartWithVerbChecker(Instruction):
 
     def check_following(self, value):
         """Checks if the response starts with a verb."""
-        text = nltk.word_tokenize(value)
-        return (
-            len(text) > 0
-            and len(nltk.pos_tag(text)) > 0
-            and "VB" in nltk.pos_tag(text)[0][1]
-        )
+        pos_tags = instructions_util.get_analysis(value).pos_tags
+        return len(pos_tags) > 0 and "VB" in pos_tags[0][1]
 
 
 class LimitedWordRepeatChecker(Instruction):
@@ -1248,6 +1244,7 @@ class PronounCountChecker(Instruction):
             "/", " "
         )  # to correctly count pronoun sets like she/her/hers, a common use case of pronouns
         # Use NLTK word_tokenize for better tokenization
+        instructions_util.ensure_nltk_resources("punkt", "punkt_tab")
         words = nltk.word_tokenize(value.lower())
         pronoun_count = sum(1 for word in words if word in pronouns)
         return pronoun_count >= self._num_pronouns
@@ -1330,7 +1327,7 @@ class ParagraphLastFirstWordMatchChecker(Instruction):
 
     def check_following(self, value):
         """Checks if each paragraph of the response ends with the same word it started with."""
-        paragraphs = value.split("\n")
+        paragraphs = instructions_util.get_analysis(value).lines
         for paragraph in paragraphs:
             paragraph = paragraph.strip().lower()
             if not paragraph:
@@ -1608,7 +1605,7 @@ class SomeBulletPointsChecker(Instruction):
     def check_following(self, value):
         """Checks if the response includes at least two sentences
         followed by at least two lines that start with *."""
-        lines = value.split("\n")
+        lines = instructions_util.get_analysis(value).lines
         sentences = True
         count_sentences = 0
         count_bullets = 0
@@ -2195,7 +2192,7 @@ class KeywordSpecificPositionChecker(Instruction):
         sentences = instructions_util.split_into_sentences(value)
         if len(sentences) < self._n:
             return False
-        words = instructions_util.nltk.word_tokenize(sentences[self._n - 1])
+        words = instructions_util.get_analysis(sentences[self._n - 1]).word_tokens
         if len(words) < self._m:
             return False
         if words[self._m - 1].lower() == self._keyword.lower():
@@ -2241,7 +2238,7 @@ class WordsPositionChecker(Instruction):
           True if the second word and the second to last word are the same;
           otherwise, False.
         """
-        words = instructions_util.nltk.word_tokenize(value)
+        words = instructions_util.get_analysis(value).word_tokens
         if len(words) < 2:
             return False
         if words[1].lower() == words[-2].lower() == self._keyword.lower():
@@ -2410,7 +2407,7 @@ class TitleCaseChecker(Instruction):
           True if the response is in title case;
           otherwise, False.
         """
-        words = instructions_util.nltk.word_tokenize(value)
+        words = instructions_util.get_analysis(value).word_tokens
         for word in words:
             if not word or not word[0].isalpha():
                 continue
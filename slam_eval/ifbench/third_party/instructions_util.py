@@ -14,9 +14,13 @@
 
 """Utility library of instructions."""
 
+import contextlib
+import contextvars
 import functools
+import os
 import random
 import re
+import threading
 
 import nltk
 
@@ -1549,27 +1553,132 @@ WORD_LIST = [
 ]  # pylint: disable=line-too-long
 
 
+# Set to 1 on machines without network access to fail fast on missing NLTK data
+NLTK_OFFLINE_ENV_VAR = "SLAM_EVAL_NLTK_OFFLINE"
+
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+    "averaged_perceptron_tagger_eng": "taggers/averaged_perceptron_tagger_eng",
+}
+
+_available_resources: set[str] = set()
+_resources_lock = threading.Lock()
+
+
+def is_nltk_offline():
+    return os.environ.get(NLTK_OFFLINE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def ensure_nltk_resources(*names):
+    """Make sure the NLTK resources are installed, downloading them if needed.
+
+    Each resource is looked up once per process. In offline mode, a missing
+    resource raises LookupError instead of being downloaded.
+    """
+    for name in names:
+        if name in _available_resources:
+            continue
+
+        with _resources_lock:
+            if name in _available_resources:
+                continue
+            try:
+                nltk.data.find(NLTK_RESOURCES[name])
+            except LookupError:
+                if is_nltk_offline():
+                    raise LookupError(
+                        f"NLTK resource '{name}' is not installed and "
+                        f"{NLTK_OFFLINE_ENV_VAR} is set. Install it in advance with "
+                        f"`python -m nltk.downloader {name}`"
+                    ) from None
+                if not nltk.download(name, quiet=True):
+                    raise LookupError(f"Failed to download NLTK resource '{name}'")
+            _available_resources.add(name)
+
+
 def download_nltk_resources():
-    """Download 'punkt' and 'stopwords' if not already installed"""
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt", quiet=True)
-    try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        nltk.download("punkt_tab", quiet=True)
-    try:
-        nltk.data.find("corpora/stopwords")
-    except LookupError:
-        nltk.download("stopwords", quiet=True)
+    """Download all NLTK resources used by the checkers if not already installed"""
+    ensure_nltk_resources(*NLTK_RESOURCES)
+
+
+_WORD_TOKENIZER = nltk.tokenize.RegexpTokenizer(r"\w+")
+
+
+@functools.lru_cache(maxsize=None)
+def get_stopwords():
+    """English stopwords as a set, loaded from the NLTK corpus once."""
+    ensure_nltk_resources("stopwords")
+    return frozenset(nltk.corpus.stopwords.words("english"))
+
+
+class ResponseAnalysis:
+    """Lazily computed tokenizations of a single response.
+
+    Each property runs its tokenizer on first access only, so checkers scoring
+    the same response share one NLTK pass instead of repeating it.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    @functools.cached_property
+    def words(self):
+        """Whitespace-separated words."""
+        return tuple(self.text.split())
+
+    @functools.cached_property
+    def regex_words(self):
+        """Alphanumeric word tokens, as counted by `count_words`."""
+        return tuple(_WORD_TOKENIZER.tokenize(self.text))
+
+    @functools.cached_property
+    def word_tokens(self):
+        """Tokens produced by `nltk.word_tokenize`."""
+        ensure_nltk_resources("punkt", "punkt_tab")
+        return tuple(nltk.word_tokenize(self.text))
+
+    @functools.cached_property
+    def sentences(self):
+        ensure_nltk_resources("punkt", "punkt_tab")
+        return tuple(nltk.sent_tokenize(self.text))
+
+    @functools.cached_property
+    def lines(self):
+        return tuple(self.text.split("\n"))
+
+    @functools.cached_property
+    def paragraphs(self):
+        """Lines of the stripped response; IFBench treats each line as a paragraph."""
+        return tuple(self.text.strip().split("\n"))
+
+    @functools.cached_property
+    def pos_tags(self):
+        ensure_nltk_resources("averaged_perceptron_tagger_eng")
+        return tuple(nltk.pos_tag(list(self.word_tokens)))
+
+
+_current_analysis = contextvars.ContextVar("_current_analysis", default=None)
+
+
+@contextlib.contextmanager
+def analysis_scope(text):
+    """Share one `ResponseAnalysis` of `text` among all checkers run in the scope."""
+    analysis = ResponseAnalysis(text)
+    token = _current_analysis.set(analysis)
     try:
-        nltk.data.find("taggers/averaged_perceptron_tagger_eng")
-    except LookupError:
-        nltk.download("averaged_perceptron_tagger_eng", quiet=True)
+        yield analysis
+    finally:
+        _current_analysis.reset(token)
 
 
-download_nltk_resources()
+def get_analysis(text):
+    """Return the analysis of the scoped response or a fresh one for other texts."""
+    analysis = _current_analysis.get()
+    if analysis is not None and (analysis.text is text or analysis.text == text):
+        return analysis
+    return ResponseAnalysis(text)
 
 
 def split_into_sentences(text):
@@ -1581,30 +1690,25 @@ def split_into_sentences(text):
     Returns:
       A list of strings where each string is a sentence.
     """
-    return nltk.sent_tokenize(text)
+    return list(get_analysis(text).sentences)
 
 
 def count_words(text):
     """Counts the number of words."""
-    tokenizer = nltk.tokenize.RegexpTokenizer(r"\w+")
-    tokens = tokenizer.tokenize(text)
-    num_words = len(tokens)
-    return num_words
+    return len(get_analysis(text).regex_words)
 
 
 @functools.lru_cache(maxsize=None)
 def _get_sentence_tokenizer():
+    ensure_nltk_resources("punkt")
     return nltk.data.load("nltk:tokenizers/punkt/english.pickle")
 
 
 def count_stopwords(text):
     """Counts the number of stopwords."""
-    """Counts the number of stopwords."""
-    stopwords = nltk.corpus.stopwords.words("english")
-    tokenizer = nltk.tokenize.RegexpTokenizer(r"\w+")
-    tokens = tokenizer.tokenize(text)
-    num_stopwords = len([t for t in tokens if t.lower() in stopwords])
-    return num_stopwords
+    stopwords = get_stopwords()
+    tokens = get_analysis(text).regex_words
+    return sum(1 for t in tokens if t.lower() in stopwords)
 
 
 def generate_keywords(num_keywords):
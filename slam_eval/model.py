@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Protocol, Sequence, runtime_checkable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    contextmanager,
+    nullcontext,
+)
+from typing import Any, Iterator, Protocol, Sequence, runtime_checkable
 
 from kygs.classifier import TextClassifier
 from rally.interaction import request_based_on_message_history
 from rally.llm import Llm
 
+from slam_eval.balancing import EndpointBalancer
 from slam_eval.collections.text_generation import TextGenerationInput
+from slam_eval.concurrency import AdaptiveConcurrencyLimiter
+from slam_eval.hedging import HedgingPolicy
+from slam_eval.rate_limit import RateLimiter
+from slam_eval.retry import CircuitBreaker, RetryPolicy
+from slam_eval.transport import HttpTransport
 
 
 class TextClassifierProtocol(Protocol):
@@ -26,16 +41,272 @@ class Model(ABC):
     def __init__(self, name: str) -> None:
         self.name = name
 
+    @property
+    def max_concurrent_requests(self) -> int:
+        return 1
+
+    def cache_params(self) -> dict[str, Any]:
+        """Parameters that, besides the name, identify the model's responses."""
+        return {}
+
+    def metrics(self) -> dict[str, Any]:
+        """State of the model's request handling, stored with every run."""
+        return {}
+
     @abstractmethod
     def predict(self, x: Any) -> Any: ...
 
+    def predict_batch(self, xs: Sequence[Any]) -> list[Any]:
+        # Models that cannot vectorize predictions handle inputs one by one
+        return [self.predict(x) for x in xs]
+
+    async def apredict(self, x: Any) -> Any:
+        # Models without a native async path are run in a worker thread
+        return await asyncio.to_thread(self.predict, x)
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
 
 class LlmViaOpenAiApi(Model):
-    def __init__(self, name: str, llm: Llm) -> None:
+    def __init__(
+        self,
+        name: str,
+        llm: Llm,
+        transport: HttpTransport | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedging_policy: HedgingPolicy | None = None,
+        endpoint_balancer: EndpointBalancer | None = None,
+    ) -> None:
         super().__init__(name)
         self.llm = llm
+        self.transport = transport
+        self.concurrency_limiter = concurrency_limiter
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.hedging_policy = hedging_policy
+        self.endpoint_balancer = endpoint_balancer
+        self._default_transport: HttpTransport | None = None
+        self._lock = threading.Lock()
+        self._hedging_executor: ThreadPoolExecutor | None = None
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        # Workers beyond the current adaptive limit wait in the limiter
+        if self.concurrency_limiter is not None:
+            return self.concurrency_limiter.max_limit
+        return self.llm.max_concurrent_requests
+
+    def cache_params(self) -> dict[str, Any]:
+        return {
+            "model": self.llm.model,
+            "max_output_tokens": self.llm.max_output_tokens,
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        if self.concurrency_limiter is None:
+            return {}
+        return {"concurrency_limiter": self.concurrency_limiter.metrics()}
 
     def predict(self, x: TextGenerationInput) -> str:
+        messages = self._build_messages(x)
+        if self.retry_policy is None:
+            return self._predict_once(messages)
+        return self.retry_policy.call(lambda: self._predict_once(messages))
+
+    async def apredict(self, x: TextGenerationInput) -> str:
+        messages = self._build_messages(x)
+        if self.retry_policy is None:
+            return await self._apredict_once(messages)
+        return await self.retry_policy.acall(lambda: self._apredict_once(messages))
+
+    def _predict_once(self, messages: list[dict[str, str]]) -> str:
+        is_probe = False
+        if self.circuit_breaker is not None:
+            is_probe = self.circuit_breaker.wait()
+        try:
+            content = self._send(messages)
+        except BaseException as err:
+            self._record_outcome(err, is_probe)
+            raise
+        self._record_outcome(None, is_probe)
+        return content
+
+    async def _apredict_once(self, messages: list[dict[str, str]]) -> str:
+        is_probe = False
+        if self.circuit_breaker is not None:
+            is_probe = await self.circuit_breaker.await_ready()
+        try:
+            content = await self._asend(messages)
+        except BaseException as err:
+            self._record_outcome(err, is_probe)
+            raise
+        self._record_outcome(None, is_probe)
+        return content
+
+    def _record_outcome(self, error: BaseException | None, is_probe: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+        if error is None or isinstance(error, Exception):
+            self.circuit_breaker.record(error, is_probe)
+        elif is_probe:
+            # A cancelled or interrupted probe tells nothing about the endpoint
+            self.circuit_breaker.release_probe()
+
+    def _send(self, messages: list[dict[str, str]]) -> str:
+        if self.hedging_policy is None:
+            return self._attempt(messages)
+        return self.hedging_policy.call(
+            lambda: self._attempt(messages), self._get_hedging_executor()
+        )
+
+    async def _asend(self, messages: list[dict[str, str]]) -> str:
+        if self.hedging_policy is None:
+            return await self._aattempt(messages)
+        return await self.hedging_policy.acall(lambda: self._aattempt(messages))
+
+    def _attempt(self, messages: list[dict[str, str]]) -> str:
+        # Every attempt, hedges included, waits for its own quota before
+        # taking a concurrency slot, and holds the slot until it finishes
+        estimated_tokens = 0
+        if self.rate_limiter is not None:
+            estimated_tokens = self._estimate_tokens(messages)
+            self.rate_limiter.acquire(estimated_tokens)
+        with self._slot():
+            content, used_tokens = self._request(messages)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimated_tokens, used_tokens)
+        return content
+
+    async def _aattempt(self, messages: list[dict[str, str]]) -> str:
+        estimated_tokens = 0
+        if self.rate_limiter is not None:
+            estimated_tokens = self._estimate_tokens(messages)
+            await self.rate_limiter.aacquire(estimated_tokens)
+        async with self._aslot():
+            content, used_tokens = await self._arequest(messages)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimated_tokens, used_tokens)
+        return content
+
+    def _request(self, messages: list[dict[str, str]]) -> tuple[str, int | None]:
+        with self._endpoint() as url:
+            if self.transport is not None:
+                response = self.transport.post(
+                    url,
+                    json=self._build_payload(messages),
+                    headers=self._build_headers(),
+                )
+                return self._parse_response(response)
+
+            resp_message = request_based_on_message_history(
+                llm_server_url=url,
+                message_history=messages,
+                authorization=self.llm.authorization,
+                model=self.llm.model,
+                max_output_tokens=self.llm.max_output_tokens,
+            )
+
+        return resp_message["content"], None
+
+    async def _arequest(self, messages: list[dict[str, str]]) -> tuple[str, int | None]:
+        with self._endpoint() as url:
+            response = await self._get_transport().apost(
+                url,
+                json=self._build_payload(messages),
+                headers=self._build_headers(),
+            )
+            return self._parse_response(response)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._hedging_executor is not None:
+                # Requests that lost to their hedges still use the transport
+                self._hedging_executor.shutdown(wait=True, cancel_futures=True)
+                self._hedging_executor = None
+        if self.transport is not None:
+            self.transport.close()
+
+    async def aclose(self) -> None:
+        await self._get_transport().aclose()
+
+    @contextmanager
+    def _endpoint(self) -> Iterator[str]:
+        # The replica is held while the response is parsed, so that error
+        # statuses count against it
+        if self.endpoint_balancer is None:
+            yield self.llm.url
+            return
+        with self.endpoint_balancer.endpoint() as url:
+            yield url
+
+    def _slot(self) -> AbstractContextManager[None]:
+        if self.concurrency_limiter is None:
+            return nullcontext()
+        return self.concurrency_limiter.slot()
+
+    def _aslot(self) -> AbstractAsyncContextManager[None]:
+        if self.concurrency_limiter is None:
+            return nullcontext()
+        return self.concurrency_limiter.aslot()
+
+    def _get_hedging_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedging_executor is None:
+                # Every worker may wait for a request and its hedge at once
+                self._hedging_executor = ThreadPoolExecutor(
+                    max_workers=2 * self.max_concurrent_requests,
+                    thread_name_prefix=f"{self.name}_hedging",
+                )
+            return self._hedging_executor
+
+    def _get_transport(self) -> HttpTransport:
+        if self.transport is not None:
+            return self.transport
+
+        # Without an explicit transport, the async path still shares one pool
+        # of keep-alive connections sized from max_concurrent_requests
+        if self._default_transport is None:
+            self._default_transport = HttpTransport(
+                max_connections=self.max_concurrent_requests,
+                max_keepalive_connections=self.max_concurrent_requests,
+            )
+        return self._default_transport
+
+    def _estimate_tokens(self, messages: list[dict[str, str]]) -> int:
+        assert self.rate_limiter is not None
+        return self.rate_limiter.estimate_tokens(messages, self.llm.max_output_tokens)
+
+    @staticmethod
+    def _parse_response(response: Any) -> tuple[str, int | None]:
+        """Return the answer and the total number of tokens, if reported."""
+        response.raise_for_status()
+        response_json = response.json()
+        used_tokens = (response_json.get("usage") or {}).get("total_tokens")
+        return response_json["choices"][0]["message"]["content"], used_tokens
+
+    def _build_payload(self, messages: list[dict[str, str]]) -> dict[str, Any]:
+        payload: dict[str, Any] = {"messages": messages}
+        if self.llm.model is not None:
+            payload["model"] = self.llm.model
+        if self.llm.max_output_tokens is not None:
+            payload["max_tokens"] = self.llm.max_output_tokens
+        return payload
+
+    def _build_headers(self) -> dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.llm.authorization is not None:
+            headers["Authorization"] = self.llm.authorization
+        return headers
+
+    def _build_messages(self, x: TextGenerationInput) -> list[dict[str, str]]:
         messages = []
 
         if x["system_prompt"] is not None:
@@ -53,15 +324,7 @@ class LlmViaOpenAiApi(Model):
             }
         )
 
-        resp_message = request_based_on_message_history(
-            llm_server_url=self.llm.url,
-            message_history=messages,
-            authorization=self.llm.authorization,
-            model=self.llm.model,
-            max_output_tokens=self.llm.max_output_tokens,
-        )
-
-        return resp_message["content"]
+        return messages
 
 
 class EmbeddingBasedTextClassifier(Model):
@@ -76,17 +339,34 @@ class EmbeddingBasedTextClassifier(Model):
         self.classifier: TextClassifierProtocol = classifier
         self.classifier_path = classifier.model_path
 
+    def cache_params(self) -> dict[str, Any]:
+        return {"classifier_path": self.classifier_path}
+
     def predict(self, x: str) -> str:
-        embeddings = self.embedding_model.predict([x])
+        return self.predict_batch([x])[0]
+
+    def predict_batch(self, xs: Sequence[str]) -> list[str]:
+        # The whole batch goes through the embedding model and the classifier
+        # in one vectorized call each
+        embeddings = self.embedding_model.predict(list(xs))
         predicted_indices = self.classifier.predict(embeddings)
 
         try:
-            predicted_index_raw = predicted_indices[0]
-        except (TypeError, IndexError) as err:  # pragma: no cover - defensive
+            num_predictions = len(predicted_indices)
+        except TypeError as err:
             raise TypeError(
                 "Classifier predict() must return an indexable sequence of predictions"
             ) from err
 
+        if num_predictions != len(xs):  # pragma: no cover - defensive
+            raise ValueError(
+                f"Classifier returned {num_predictions} predictions "
+                f"for {len(xs)} inputs"
+            )
+
+        return [self._to_label(predicted_indices[i]) for i in range(len(xs))]
+
+    def _to_label(self, predicted_index_raw: Any) -> str:
         try:
             predicted_index = int(predicted_index_raw)
         except (TypeError, ValueError) as err:  # pragma: no cover - defensive
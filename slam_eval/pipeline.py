@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable, Sequence
+
+from slam_eval.checkpoint import RunCheckpoint
+from slam_eval.collections.base import EvalCase, EvalCaseCollection
+from slam_eval.model import Model
+from slam_eval.runner import CaseResult, run
+from slam_eval.scorer import Scorer
+from slam_eval.storage_adapter import EvalStorageAdapter, RunWriter
+
+LOGGER = logging.getLogger(__name__)
+
+
+def default_run_id(group_id: str, model_name: str, collection_name: str) -> str:
+    return f"{group_id}_M_{model_name}_C_{collection_name}"
+
+
+def shard_run_id(run_id: str, shard_index: int, num_shards: int) -> str:
+    return f"{run_id}_shard_{shard_index}_of_{num_shards}"
+
+
+def _load_completed_cases(
+    checkpoint: RunCheckpoint, resume: bool
+) -> dict[int, CaseResult]:
+    if not resume:
+        checkpoint.reset()
+        return {}
+
+    completed_cases = checkpoint.load()
+    LOGGER.info(
+        "Resume run %s from %s completed test cases",
+        checkpoint.run_id,
+        len(completed_cases),
+    )
+    return completed_cases
+
+
+def _append_result(
+    run_writer: RunWriter,
+    result: CaseResult,
+    num_retries: dict[int, int | None],
+) -> None:
+    run_writer.append(
+        result.index, result.score, result.model_answer, result.scores_by_scorer
+    )
+    num_retries[result.index] = result.num_retries
+
+
+def _log_model_metrics(model: Model) -> dict[str, Any]:
+    model_metrics = model.metrics()
+    if model_metrics:
+        LOGGER.info("Model %s metrics: %s", model.name, model_metrics)
+    return model_metrics
+
+
+def _close_run(
+    run_writer: RunWriter,
+    num_retries: dict[int, int | None],
+    model_metrics: dict[str, Any] | list[dict[str, Any]] | None = None,
+) -> None:
+    other_results: dict[str, Any] = {}
+    # Retry counts are stored as a per-case vector for models that retry
+    if any(case_retries is not None for case_retries in num_retries.values()):
+        other_results["num_retries"] = [num_retries[i] for i in sorted(num_retries)]
+    if model_metrics:
+        other_results["model_metrics"] = model_metrics
+    run_writer.close(**other_results)
+
+
+def evaluate_and_store(
+    model: Model,
+    collection: EvalCaseCollection,
+    eval_cases: Iterable[EvalCase],
+    collection_length: int,
+    scorer: Scorer,
+    eval_storage_adapter: EvalStorageAdapter,
+    group_id: str,
+    checkpoint: RunCheckpoint,
+    resume: bool = False,
+    execution_mode: str = "sequential",
+    max_workers: int | None = None,
+    batch_size: int = 1,
+    extra_scorers: Sequence[Scorer] = (),
+) -> None:
+    """Evaluate the model on the cases, checkpointing and storing every result.
+
+    With ``resume``, cases found in the checkpoint are not evaluated again.
+    The checkpoint is removed once the run is stored.
+    """
+    completed_cases = _load_completed_cases(checkpoint, resume)
+    run_writer = eval_storage_adapter.open_run(
+        group_id=group_id,
+        model=model,
+        eval_case_collection=collection,
+    )
+    num_retries: dict[int, int | None] = {}
+    for result in completed_cases.values():
+        _append_result(run_writer, result, num_retries)
+
+    def _on_case_done(result: CaseResult) -> None:
+        checkpoint.append(result)
+        _append_result(run_writer, result, num_retries)
+
+    run(
+        model=model,
+        scorer=scorer,
+        eval_cases=eval_cases,
+        collection_length=collection_length,
+        execution_mode=execution_mode,
+        max_workers=max_workers,
+        batch_size=batch_size,
+        completed_cases=completed_cases,
+        on_case_done=_on_case_done,
+        extra_scorers=extra_scorers,
+    )
+
+    _close_run(run_writer, num_retries, _log_model_metrics(model))
+    checkpoint.remove()
+
+
+def evaluate_shard(
+    model: Model,
+    collection: EvalCaseCollection,
+    scorer: Scorer,
+    checkpoint_dir: str,
+    run_id: str,
+    shard_index: int,
+    num_shards: int,
+    resume: bool = False,
+    execution_mode: str = "sequential",
+    max_workers: int | None = None,
+    batch_size: int = 1,
+    extra_scorers: Sequence[Scorer] = (),
+) -> None:
+    """Evaluate the model on one shard of the loaded collection.
+
+    Results and the metrics of the model are kept in the shard's checkpoint
+    until ``merge_shards`` stores all shards of the run as one result.
+    """
+    checkpoint = RunCheckpoint(
+        checkpoint_dir, shard_run_id(run_id, shard_index, num_shards)
+    )
+    completed_cases = _load_completed_cases(checkpoint, resume)
+    shard_cases = collection.shard_range(shard_index, num_shards)
+    LOGGER.info(
+        "Run shard %s out of %s with test cases #%s-#%s",
+        shard_index + 1,
+        num_shards,
+        shard_cases.start + 1,
+        shard_cases.stop,
+    )
+    run(
+        model=model,
+        scorer=scorer,
+        eval_cases=collection.iter_range(shard_cases.start, shard_cases.stop),
+        collection_length=len(collection),
+        execution_mode=execution_mode,
+        max_workers=max_workers,
+        batch_size=batch_size,
+        completed_cases=completed_cases,
+        on_case_done=checkpoint.append,
+        extra_scorers=extra_scorers,
+        start_index=shard_cases.start,
+    )
+    model_metrics = _log_model_metrics(model)
+    if model_metrics:
+        checkpoint.append_model_metrics(model_metrics)
+
+
+def merge_shards(
+    model: Model,
+    collection: EvalCaseCollection,
+    eval_storage_adapter: EvalStorageAdapter,
+    group_id: str,
+    checkpoint_dir: str,
+    run_id: str,
+    num_shards: int,
+) -> None:
+    """Store the results of all shards of the run as a single run.
+
+    Raises ``ValueError`` if some test cases of the loaded collection are not
+    found in the shards; shard checkpoints are removed only once stored. The
+    model metrics of the shards are stored as a list in shard order.
+    """
+    checkpoints = [
+        RunCheckpoint(checkpoint_dir, shard_run_id(run_id, shard_index, num_shards))
+        for shard_index in range(num_shards)
+    ]
+    results: dict[int, CaseResult] = {}
+    for checkpoint in checkpoints:
+        results.update(checkpoint.load())
+
+    missing_indices = set(range(len(collection))) - results.keys()
+    if missing_indices:
+        raise ValueError(
+            f"Cannot merge run {run_id}: {len(missing_indices)} out of "
+            f"{len(collection)} test cases are missing, "
+            f"the first one is #{min(missing_indices) + 1}"
+        )
+
+    run_writer = eval_storage_adapter.open_run(
+        group_id=group_id,
+        model=model,
+        eval_case_collection=collection,
+    )
+    num_retries: dict[int, int | None] = {}
+    for i in range(len(collection)):
+        _append_result(run_writer, results[i], num_retries)
+    shard_model_metrics = [
+        checkpoint.load_model_metrics() for checkpoint in checkpoints
+    ]
+    _close_run(
+        run_writer,
+        num_retries,
+        shard_model_metrics if any(shard_model_metrics) else None,
+    )
+
+    for checkpoint in checkpoints:
+        checkpoint.remove()
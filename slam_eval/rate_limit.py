@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Sequence
+
+
+class TokenBucket:
+    """Bucket refilled at a steady rate, up to ``burst_seconds`` of quota.
+
+    Amounts are reserved immediately and the bucket may go into debt, so every
+    caller learns how long to wait right away and callers are served in the
+    order of their reservations, even if one amount exceeds the capacity.
+    Not thread-safe on its own.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 1.0) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError(f"Rate must be positive, got {rate_per_minute}")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = self.rate_per_second * burst_seconds
+        self._level = self.capacity
+        self._updated_at = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take the amount and return the delay in seconds until it is covered."""
+        self._refill(now)
+        self._level -= amount
+        return max(0.0, -self._level / self.rate_per_second)
+
+    def give_back(self, amount: float, now: float) -> None:
+        """Return an over-reserved amount, or take more if it is negative."""
+        self._refill(now)
+        self._level = min(self.capacity, self._level + amount)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._level = min(self.capacity, self._level + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+
+class RateLimiter:
+    """Client-side quota of requests and tokens per minute for one model.
+
+    Each request reserves one request and an estimate of its prompt and
+    completion tokens, then waits until both buckets cover the reservation.
+    The token estimate is corrected once the endpoint reports the usage.
+    One instance is shared by all workers of a process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        burst_seconds: float = 1.0,
+        chars_per_token: float = 4.0,
+        default_completion_tokens: int = 256,
+    ) -> None:
+        self.chars_per_token = chars_per_token
+        self.default_completion_tokens = default_completion_tokens
+        self._lock = threading.Lock()
+        self._request_bucket = (
+            TokenBucket(requests_per_minute, burst_seconds)
+            if requests_per_minute is not None
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute, burst_seconds)
+            if tokens_per_minute is not None
+            else None
+        )
+
+    def estimate_tokens(
+        self, messages: Sequence[dict[str, str]], max_output_tokens: int | None
+    ) -> int:
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        completion_tokens = (
+            max_output_tokens
+            if max_output_tokens is not None
+            else self.default_completion_tokens
+        )
+        return int(prompt_chars / self.chars_per_token) + completion_tokens
+
+    def acquire(self, num_tokens: int) -> None:
+        delay = self._reserve(num_tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, num_tokens: int) -> None:
+        delay = self._reserve(num_tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, used_tokens: int | None) -> None:
+        """Correct the reserved estimate by the tokens reported by the endpoint."""
+        if self._token_bucket is None or used_tokens is None:
+            return
+        with self._lock:
+            self._token_bucket.give_back(
+                estimated_tokens - used_tokens, time.monotonic()
+            )
+
+    def _reserve(self, num_tokens: int) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        with self._lock:
+            if self._request_bucket is not None:
+                delay = max(delay, self._request_bucket.reserve(1, now))
+            if self._token_bucket is not None:
+                delay = max(delay, self._token_bucket.reserve(num_tokens, now))
+        return delay
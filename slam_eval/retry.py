@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+from slam_eval.transport import is_retriable_error
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Retry counts of the requests made in the current case, see track_retries
+_retry_counts: ContextVar[list[int] | None] = ContextVar("retry_counts", default=None)
+
+
+@contextmanager
+def track_retries() -> Iterator[list[int]]:
+    """Collect the retry count of every request made within the block.
+
+    Counts are only collected for models with a retry policy. The context is
+    shared with coroutines awaited and threads started with
+    ``asyncio.to_thread`` within the block.
+    """
+    retry_counts: list[int] = []
+    token = _retry_counts.set(retry_counts)
+    try:
+        yield retry_counts
+    finally:
+        _retry_counts.reset(token)
+
+
+def _record_retries(num_retries: int) -> None:
+    retry_counts = _retry_counts.get()
+    if retry_counts is not None:
+        retry_counts.append(num_retries)
+
+
+class RetryPolicy:
+    """Retries retriable failures with jittered exponential backoff.
+
+    Before retry ``k`` (counted from 0), the caller sleeps for a random time
+    between 0 and ``min(max_backoff, initial_backoff * backoff_multiplier**k)``
+    seconds, so that cases failing together do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        backoff_multiplier: float = 2.0,
+        is_retriable: Callable[[BaseException], bool] = is_retriable_error,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"Max attempts must be positive, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_multiplier = backoff_multiplier
+        self.is_retriable = is_retriable
+
+    def backoff(self, retry_index: int) -> float:
+        max_delay = min(
+            self.max_backoff,
+            self.initial_backoff * self.backoff_multiplier**retry_index,
+        )
+        return random.uniform(0.0, max_delay)
+
+    def call(self, func: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            try:
+                result = func()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                time.sleep(self._on_failure(err, attempt))
+                attempt += 1
+                continue
+            _record_retries(attempt)
+            return result
+
+    async def acall(self, func: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            try:
+                result = await func()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                await asyncio.sleep(self._on_failure(err, attempt))
+                attempt += 1
+                continue
+            _record_retries(attempt)
+            return result
+
+    def _on_failure(self, err: Exception, attempt: int) -> float:
+        """Return the backoff before the next attempt or re-raise the error."""
+        if not self.is_retriable(err) or attempt + 1 >= self.max_attempts:
+            _record_retries(attempt)
+            raise err
+        delay = self.backoff(attempt)
+        LOGGER.warning(
+            "Retry %s out of %s in %.2f s after %r",
+            attempt + 1,
+            self.max_attempts - 1,
+            delay,
+            err,
+        )
+        return delay
+
+
+class CircuitBreaker:
+    """Pauses requests to an endpoint that keeps failing.
+
+    After ``failure_threshold`` consecutive retriable failures the circuit
+    opens and requests wait instead of being sent. After ``reset_timeout``
+    seconds a single probe request is let through: its failure opens the
+    circuit again, and any success closes it. Any response that is not a
+    retriable failure counts as a success. Failures of requests sent before
+    the circuit opened do not extend the pause.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # How often requests check whether the probe has finished
+    _PROBE_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Callable[[BaseException], bool] = is_retriable_error,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._num_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def wait(self) -> bool:
+        """Block until a request may be sent and return whether it is a probe."""
+        while True:
+            delay, is_probe = self._try_enter()
+            if delay == 0:
+                return is_probe
+            time.sleep(delay)
+
+    async def await_ready(self) -> bool:
+        while True:
+            delay, is_probe = self._try_enter()
+            if delay == 0:
+                return is_probe
+            await asyncio.sleep(delay)
+
+    def record(
+        self, error: BaseException | None = None, is_probe: bool = False
+    ) -> None:
+        """Record the outcome of a request let through by the circuit.
+
+        ``is_probe`` is what ``wait`` returned for the request; only the probe
+        lets the next probe through.
+        """
+        with self._lock:
+            if is_probe:
+                self._probe_in_flight = False
+            if error is None or not self.is_failure(error):
+                if self._state != self.CLOSED:
+                    LOGGER.info("Endpoint is back, close the circuit")
+                self._state = self.CLOSED
+                self._num_failures = 0
+                return
+
+            self._num_failures += 1
+            if self._state == self.CLOSED:
+                if self._num_failures < self.failure_threshold:
+                    return
+                LOGGER.warning(
+                    "Open the circuit after %s consecutive failures, pause "
+                    "requests for %.1f s",
+                    self._num_failures,
+                    self.reset_timeout,
+                )
+            elif not (self._state == self.HALF_OPEN and is_probe):
+                return
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Let the next probe through after the probe ended without an outcome,
+        e.g. because it was cancelled.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _try_enter(self) -> tuple[float, bool]:
+        """Return the time to wait, 0 if a request may be sent now, and whether
+        the request is the probe.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0.0, False
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    return remaining, False
+                self._state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return self._PROBE_POLL_INTERVAL, False
+            self._probe_in_flight = True
+            return 0.0, True
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+from slam_eval.collections.base import EvalCase
+from slam_eval.model import Model
+from slam_eval.retry import track_retries
+from slam_eval.scorer import Scorer
+from slam_eval.utils.typing import HasStr
+
+LOGGER = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("sequential", "concurrent", "async")
+
+
+@dataclass
+class CaseResult:
+    index: int
+    model_answer: HasStr
+    score: int | float
+    # Scores of all scorers by name, filled only when extra scorers are used
+    scores_by_scorer: dict[str, int | float] = field(default_factory=dict)
+    # Retries of the model's requests, filled only for models with a retry policy
+    num_retries: int | None = None
+
+
+CaseCallback = Callable[[CaseResult], None]
+IndexedCase = tuple[int, EvalCase]
+
+
+def score_cases(
+    scorer: Scorer,
+    batch: Sequence[IndexedCase],
+    y_preds: Sequence[HasStr],
+    extra_scorers: Sequence[Scorer] = (),
+    num_retries: Sequence[int | None] | None = None,
+) -> list[CaseResult]:
+    if num_retries is None:
+        num_retries = [None] * len(batch)
+    y_trues = [eval_case["y_true"] for _, eval_case in batch]
+    scores = scorer.score_batch(y_trues, y_preds)
+    extra_scores = {
+        extra_scorer.name: extra_scorer.score_batch(y_trues, y_preds)
+        for extra_scorer in extra_scorers
+    }
+
+    results = []
+    for k, ((i, _), y_pred, score, case_retries) in enumerate(
+        zip(batch, y_preds, scores, num_retries, strict=True)
+    ):
+        scores_by_scorer = {}
+        if extra_scores:
+            scores_by_scorer[scorer.name] = score
+            for name, case_scores in extra_scores.items():
+                scores_by_scorer[name] = case_scores[k]
+        results.append(
+            CaseResult(
+                index=i,
+                model_answer=y_pred,
+                score=score,
+                scores_by_scorer=scores_by_scorer,
+                num_retries=case_retries,
+            )
+        )
+    return results
+
+
+def _retries_per_case(retry_counts: Sequence[int], num_cases: int) -> list[int | None]:
+    """Assign the retry counts of the requests made for the cases to the cases.
+
+    Counts are only known if the model made one request per case, e.g. none are
+    known for a model without a retry policy or with answers from a cache.
+    """
+    if len(retry_counts) != num_cases:
+        return [None] * num_cases
+    return list(retry_counts)
+
+
+def evaluate_case(
+    model: Model,
+    scorer: Scorer,
+    index: int,
+    eval_case: EvalCase,
+    extra_scorers: Sequence[Scorer] = (),
+) -> CaseResult:
+    with track_retries() as retry_counts:
+        y_pred = model.predict(eval_case["x"])
+    (num_retries,) = _retries_per_case(retry_counts, 1)
+    if not extra_scorers:
+        score = scorer(eval_case["y_true"], y_pred)
+        return CaseResult(
+            index=index, model_answer=y_pred, score=score, num_retries=num_retries
+        )
+    return score_cases(
+        scorer, [(index, eval_case)], [y_pred], extra_scorers, [num_retries]
+    )[0]
+
+
+def evaluate_batch(
+    model: Model,
+    scorer: Scorer,
+    batch: Sequence[IndexedCase],
+    extra_scorers: Sequence[Scorer] = (),
+) -> list[CaseResult]:
+    if len(batch) == 1:
+        i, eval_case = batch[0]
+        return [evaluate_case(model, scorer, i, eval_case, extra_scorers)]
+
+    with track_retries() as retry_counts:
+        y_preds = model.predict_batch([eval_case["x"] for _, eval_case in batch])
+    return score_cases(
+        scorer,
+        batch,
+        y_preds,
+        extra_scorers,
+        _retries_per_case(retry_counts, len(batch)),
+    )
+
+
+def _log_progress(batch: Sequence[IndexedCase], collection_length: int) -> None:
+    if len(batch) == 1:
+        LOGGER.info("Run test case #%s out of %s", batch[0][0] + 1, collection_length)
+    else:
+        LOGGER.info(
+            "Run test cases #%s-#%s out of %s",
+            batch[0][0] + 1,
+            batch[-1][0] + 1,
+            collection_length,
+        )
+
+
+def run_sequential(
+    model: Model,
+    scorer: Scorer,
+    batches: Iterable[Sequence[IndexedCase]],
+    collection_length: int,
+    on_case_done: CaseCallback | None = None,
+    extra_scorers: Sequence[Scorer] = (),
+) -> list[CaseResult]:
+    results = []
+    for batch in batches:
+        _log_progress(batch, collection_length)
+        for result in evaluate_batch(model, scorer, batch, extra_scorers):
+            if on_case_done is not None:
+                on_case_done(result)
+            results.append(result)
+
+    return results
+
+
+def run_concurrent(
+    model: Model,
+    scorer: Scorer,
+    batches: Iterable[Sequence[IndexedCase]],
+    collection_length: int,
+    max_workers: int,
+    on_case_done: CaseCallback | None = None,
+    extra_scorers: Sequence[Scorer] = (),
+) -> list[CaseResult]:
+    def _evaluate(batch: Sequence[IndexedCase]) -> list[CaseResult]:
+        _log_progress(batch, collection_length)
+        batch_results = evaluate_batch(model, scorer, batch, extra_scorers)
+        if on_case_done is not None:
+            for result in batch_results:
+                on_case_done(result)
+        return batch_results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [
+            result
+            for batch_results in executor.map(_evaluate, batches)
+            for result in batch_results
+        ]
+
+
+async def run_async(
+    model: Model,
+    scorer: Scorer,
+    eval_cases: Iterable[IndexedCase],
+    collection_length: int,
+    max_concurrency: int,
+    on_case_done: CaseCallback | None = None,
+    extra_scorers: Sequence[Scorer] = (),
+) -> list[CaseResult]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _evaluate(i: int, eval_case: EvalCase) -> CaseResult:
+        async with semaphore:
+            LOGGER.info("Run test case #%s out of %s", i + 1, collection_length)
+            with track_retries() as retry_counts:
+                y_pred = await model.apredict(eval_case["x"])
+        # Scorers may block, e.g. on a process pool, so they run in a thread
+        # to keep the other requests going
+        results = await asyncio.to_thread(
+            score_cases,
+            scorer,
+            [(i, eval_case)],
+            [y_pred],
+            extra_scorers,
+            _retries_per_case(retry_counts, 1),
+        )
+        result = results[0]
+        if on_case_done is not None:
+            on_case_done(result)
+        return result
+
+    try:
+        return await asyncio.gather(
+            *(_evaluate(i, eval_case) for i, eval_case in eval_cases)
+        )
+    finally:
+        await model.aclose()
+
+
+def _skip_completed(
+    eval_cases: Iterable[EvalCase],
+    completed_cases: Mapping[int, CaseResult],
+    start_index: int = 0,
+) -> Iterator[IndexedCase]:
+    for i, eval_case in enumerate(eval_cases, start=start_index):
+        if i in completed_cases:
+            continue
+        yield i, eval_case
+
+
+def _batched(
+    indexed_cases: Iterable[IndexedCase], batch_size: int
+) -> Iterator[list[IndexedCase]]:
+    iterator = iter(indexed_cases)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def run(
+    model: Model,
+    scorer: Scorer,
+    eval_cases: Iterable[EvalCase],
+    collection_length: int,
+    execution_mode: str = "sequential",
+    max_workers: int | None = None,
+    batch_size: int = 1,
+    completed_cases: Mapping[int, CaseResult] | None = None,
+    on_case_done: CaseCallback | None = None,
+    extra_scorers: Sequence[Scorer] = (),
+    start_index: int = 0,
+) -> tuple[list[HasStr], list[int | float]]:
+    """Evaluate the model on every case and return answers and scores.
+
+    Cases whose indices are in ``completed_cases`` are not evaluated again and
+    their stored results are used instead. ``on_case_done`` is called once per
+    newly evaluated case, possibly from a worker thread. With ``batch_size`` > 1,
+    cases are sent to ``Model.predict_batch`` in micro-batches of that size.
+    Every answer is also scored by ``extra_scorers`` and the results carry the
+    scores of all scorers in ``scores_by_scorer``; returned scores are those of
+    ``scorer``. The first case gets index ``start_index``, e.g. when
+    ``eval_cases`` is a shard of a larger collection.
+    """
+    if execution_mode not in EXECUTION_MODES:
+        raise ValueError(
+            f"Unknown execution mode {execution_mode}. "
+            f"Available modes: {', '.join(EXECUTION_MODES)}"
+        )
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got {batch_size}")
+    if batch_size > 1 and execution_mode == "async":
+        raise ValueError("Batched evaluation is not supported in async mode")
+
+    if max_workers is None:
+        max_workers = model.max_concurrent_requests
+
+    if completed_cases is None:
+        completed_cases = {}
+    elif completed_cases:
+        LOGGER.info("Skip %s already completed test cases", len(completed_cases))
+
+    pending_cases = _skip_completed(eval_cases, completed_cases, start_index)
+    if execution_mode == "async":
+        LOGGER.info("Run up to %s requests in flight", max_workers)
+        new_results = asyncio.run(
+            run_async(
+                model,
+                scorer,
+                pending_cases,
+                collection_length,
+                max_concurrency=max_workers,
+                on_case_done=on_case_done,
+                extra_scorers=extra_scorers,
+            )
+        )
+    else:
+        try:
+            if execution_mode == "sequential":
+                new_results = run_sequential(
+                    model,
+                    scorer,
+                    _batched(pending_cases, batch_size),
+                    collection_length,
+                    on_case_done=on_case_done,
+                    extra_scorers=extra_scorers,
+                )
+            else:
+                LOGGER.info("Run %s concurrent workers", max_workers)
+                new_results = run_concurrent(
+                    model,
+                    scorer,
+                    _batched(pending_cases, batch_size),
+                    collection_length,
+                    max_workers=max_workers,
+                    on_case_done=on_case_done,
+                    extra_scorers=extra_scorers,
+                )
+        finally:
+            model.close()
+
+    # Results are keyed by case index, so answers and scores stay aligned with
+    # the collection regardless of completion order
+    results = {result.index: result for result in new_results}
+    results.update(completed_cases)
+    ordered_results = [results[i] for i in sorted(results)]
+    model_answers = [result.model_answer for result in ordered_results]
+    scores = [result.score for result in ordered_results]
+    return model_answers, scores
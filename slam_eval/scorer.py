@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 
 from slam_eval.utils.typing import HasStr
 
@@ -15,6 +15,17 @@ class Scorer(ABC):
     @abstractmethod
     def __call__(self, y_true: Any, y_pred: Any) -> int | float: ...
 
+    def score_batch(
+        self, y_trues: Sequence[Any], y_preds: Sequence[Any]
+    ) -> list[int | float]:
+        return [
+            self(y_true, y_pred)
+            for y_true, y_pred in zip(y_trues, y_preds, strict=True)
+        ]
+
+    def close(self) -> None:
+        pass
+
 
 class ExactMatch(Scorer):
     def __init__(
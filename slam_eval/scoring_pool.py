@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Sequence
+
+from slam_eval.scorer import Scorer
+
+# Scorer of the current worker process, set once by the pool initializer so
+# that tasks only carry the answers to score
+_WORKER_SCORER: Scorer | None = None
+
+
+def _init_worker(scorer: Scorer) -> None:
+    global _WORKER_SCORER  # pylint: disable=global-statement
+    _WORKER_SCORER = scorer
+
+
+def _score_chunk(pairs: Sequence[tuple[Any, Any]]) -> list[int | float]:
+    assert _WORKER_SCORER is not None
+    return [_WORKER_SCORER(y_true, y_pred) for y_true, y_pred in pairs]
+
+
+class ProcessPoolScorer(Scorer):
+    """Scores in a pool of worker processes, each holding a copy of the scorer.
+
+    Meant for CPU-bound scorers such as IFBench, which otherwise compete with
+    the evaluation loop for the GIL. The wrapped scorer must be picklable.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer,
+        max_workers: int | None = None,
+        chunk_size: int = 16,
+        start_method: str = "spawn",
+    ) -> None:
+        super().__init__(scorer.name)
+        self.scorer = scorer
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, y_true: Any, y_pred: Any) -> int | float:
+        future = self._get_executor().submit(_score_chunk, [(y_true, y_pred)])
+        return future.result()[0]
+
+    def score_batch(
+        self, y_trues: Sequence[Any], y_preds: Sequence[Any]
+    ) -> list[int | float]:
+        pairs = list(zip(y_trues, y_preds, strict=True))
+        chunks = [
+            pairs[i : i + self.chunk_size]
+            for i in range(0, len(pairs), self.chunk_size)
+        ]
+        return [
+            score
+            for chunk_scores in self._get_executor().map(_score_chunk, chunks)
+            for score in chunk_scores
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.scorer.close()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.scorer,),
+                )
+            return self._executor
@@ -4,6 +4,10 @@ import hydra
 from hydra.utils import instantiate
 from omegaconf import DictConfig
 
+from slam_eval.cache import CachedModel
+from slam_eval.checkpoint import RunCheckpoint
+from slam_eval.pipeline import default_run_id, evaluate_and_store, evaluate_shard
+from slam_eval.scoring_pool import ProcessPoolScorer
 from slam_eval.utils.common import get_config_path
 
 CONFIG_NAME = "config_main"
@@ -14,28 +18,61 @@ def main(cfg: DictConfig) -> None:
     model = instantiate(cfg.model)
     collection = instantiate(cfg.collection)
     scorer = instantiate(cfg.scorer)
+    extra_scorers = [
+        instantiate(scorer_cfg) for scorer_cfg in cfg.extra_scorers.values()
+    ]
     eval_storage_adapter = instantiate(cfg.storage_adapter)
+    if cfg.get("cache") is not None:
+        model = CachedModel(model, instantiate(cfg.cache))
+    if cfg.score_workers is not None:
+        scorer = ProcessPoolScorer(scorer, max_workers=cfg.score_workers)
+        extra_scorers = [
+            ProcessPoolScorer(extra_scorer, max_workers=cfg.score_workers)
+            for extra_scorer in extra_scorers
+        ]
+
+    run_id = cfg.run_id
+    if run_id is None:
+        run_id = default_run_id(cfg.group_id, model.name, collection.name)
 
     collection.load()
-    model_answers = []
-    scores = []
-
-    collection_length = len(collection)
-    for i, eval_case in enumerate(collection):
-        LOGGER.info("Run test case #%s out of %s", i + 1, collection_length)
-        y_pred = model.predict(eval_case["x"])
-        score = scorer(eval_case["y_true"], y_pred)
-
-        model_answers.append(y_pred)
-        scores.append(score)
-
-    eval_storage_adapter.save(
-        group_id=cfg.group_id,
-        model=model,
-        eval_case_collection=collection,
-        scores=scores,
-        model_answers=model_answers,
-    )
+    try:
+        if cfg.num_shards > 1:
+            # Results stay in the shard checkpoint until merge_shards.py
+            evaluate_shard(
+                model=model,
+                collection=collection,
+                scorer=scorer,
+                checkpoint_dir=cfg.checkpoint_dir,
+                run_id=run_id,
+                shard_index=cfg.shard_index,
+                num_shards=cfg.num_shards,
+                resume=cfg.resume,
+                execution_mode=cfg.execution_mode,
+                max_workers=cfg.max_workers,
+                batch_size=cfg.batch_size,
+                extra_scorers=extra_scorers,
+            )
+            return
+
+        evaluate_and_store(
+            model=model,
+            collection=collection,
+            eval_cases=collection,
+            collection_length=len(collection),
+            scorer=scorer,
+            eval_storage_adapter=eval_storage_adapter,
+            group_id=cfg.group_id,
+            checkpoint=RunCheckpoint(cfg.checkpoint_dir, run_id),
+            resume=cfg.resume,
+            execution_mode=cfg.execution_mode,
+            max_workers=cfg.max_workers,
+            batch_size=cfg.batch_size,
+            extra_scorers=extra_scorers,
+        )
+    finally:
+        for scorer_to_close in (scorer, *extra_scorers):
+            scorer_to_close.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+import logging
+
+import hydra
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from slam_eval.pipeline import default_run_id, merge_shards
+from slam_eval.utils.common import get_config_path
+
+# Shards are merged with the same configuration they were run with
+CONFIG_NAME = "config_main"
+LOGGER = logging.getLogger(__name__)
+
+
+def main(cfg: DictConfig) -> None:
+    model = instantiate(cfg.model)
+    collection = instantiate(cfg.collection)
+    eval_storage_adapter = instantiate(cfg.storage_adapter)
+
+    run_id = cfg.run_id
+    if run_id is None:
+        run_id = default_run_id(cfg.group_id, model.name, collection.name)
+
+    collection.load()
+    merge_shards(
+        model=model,
+        collection=collection,
+        eval_storage_adapter=eval_storage_adapter,
+        group_id=cfg.group_id,
+        checkpoint_dir=cfg.checkpoint_dir,
+        run_id=run_id,
+        num_shards=cfg.num_shards,
+    )
+    LOGGER.info("Merged %s shards of run %s", cfg.num_shards, run_id)
+
+
+if __name__ == "__main__":
+    hydra.main(
+        config_path=str(get_config_path()),
+        config_name=CONFIG_NAME,
+        version_base="1.3",
+    )(main)()
@@ -0,0 +1,98 @@
+import logging
+import re
+from typing import Any, Sequence
+
+import hydra
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from slam_eval.scorer import Scorer
+from slam_eval.scoring_pool import ProcessPoolScorer
+from slam_eval.storage_adapter import EvalStorageAdapter
+from slam_eval.utils.common import get_config_path
+
+CONFIG_NAME = "config_rescore"
+LOGGER = logging.getLogger(__name__)
+
+
+def rescore(
+    eval_storage_adapter: EvalStorageAdapter,
+    id_regex: str,
+    collection_name: str,
+    y_trues: Sequence[Any],
+    scorers: Sequence[Scorer],
+) -> int:
+    """Score stored answers of the collection's results and add the scores.
+
+    ``id_regex`` must match the id in front of its collection suffix. Returns
+    the number of rescored results.
+    """
+    # Ids end with the collection name, so the adapter skips the results of
+    # other collections without decoding them
+    collection_id_regex = f"(?:{id_regex}).*_C_{re.escape(collection_name)}$"
+    num_rescored = 0
+    for result_dict in eval_storage_adapter.iter_load(collection_id_regex):
+        if result_dict.get("eval_case_collection") != collection_name:
+            continue
+
+        model_answers = result_dict["model_answers"]
+        if len(model_answers) != len(y_trues):
+            LOGGER.warning(
+                "Skip %s: %s stored answers for %s test cases",
+                result_dict["id"],
+                len(model_answers),
+                len(y_trues),
+            )
+            continue
+
+        scores_by_scorer = {
+            scorer.name: scorer.score_batch(y_trues, model_answers)
+            for scorer in scorers
+        }
+        eval_storage_adapter.add_scores(result_dict["id"], scores_by_scorer)
+        for scorer_name, scores in scores_by_scorer.items():
+            LOGGER.info(
+                "Rescored %s with %s: mean score %.4f",
+                result_dict["id"],
+                scorer_name,
+                sum(scores) / len(scores) if scores else 0.0,
+            )
+        num_rescored += 1
+
+    return num_rescored
+
+
+def main(cfg: DictConfig) -> None:
+    collection = instantiate(cfg.collection)
+    eval_storage_adapter = instantiate(cfg.storage_adapter)
+    scorers = [instantiate(scorer_cfg) for scorer_cfg in cfg.scorers.values()]
+    if cfg.score_workers is not None:
+        scorers = [
+            ProcessPoolScorer(scorer, max_workers=cfg.score_workers)
+            for scorer in scorers
+        ]
+
+    collection.load()
+    y_trues = [eval_case["y_true"] for eval_case in collection]
+
+    try:
+        num_rescored = rescore(
+            eval_storage_adapter,
+            id_regex=cfg.id_regex,
+            collection_name=collection.name,
+            y_trues=y_trues,
+            scorers=scorers,
+        )
+    finally:
+        for scorer in scorers:
+            scorer.close()
+
+    LOGGER.info("Rescored %s results", num_rescored)
+
+
+if __name__ == "__main__":
+    hydra.main(
+        config_path=str(get_config_path()),
+        config_name=CONFIG_NAME,
+        version_base="1.3",
+    )(main)()
@@ -0,0 +1,126 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import hydra
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from slam_eval.cache import CachedModel
+from slam_eval.checkpoint import RunCheckpoint
+from slam_eval.collections.base import EvalCase, EvalCaseCollection
+from slam_eval.model import Model
+from slam_eval.pipeline import default_run_id, evaluate_and_store
+from slam_eval.scorer import Scorer
+from slam_eval.scoring_pool import ProcessPoolScorer
+from slam_eval.storage_adapter import EvalStorageAdapter
+from slam_eval.utils.common import get_config_path
+
+CONFIG_NAME = "config_sweep"
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepCollection:
+    """Collection loaded once, with its cases rendered for all models."""
+
+    collection: EvalCaseCollection
+    scorer: Scorer
+    eval_cases: list[EvalCase]
+
+
+def load_sweep_collection(
+    collection: EvalCaseCollection, scorer: Scorer
+) -> SweepCollection:
+    collection.load()
+    return SweepCollection(
+        collection=collection, scorer=scorer, eval_cases=list(collection)
+    )
+
+
+def run_sweep(
+    models: Sequence[Model],
+    sweep_collections: Sequence[SweepCollection],
+    eval_storage_adapter: EvalStorageAdapter,
+    group_id: str,
+    checkpoint_dir: str,
+    **run_kwargs: Any,
+) -> None:
+    """Evaluate every model on every collection.
+
+    Models are evaluated concurrently, each going through the collections one
+    by one, so a slow model only delays its own runs. ``run_kwargs`` are
+    passed to ``evaluate_and_store``; without ``max_workers``, each model is
+    capped at its own ``max_concurrent_requests``.
+    """
+    failed_runs = []
+
+    def _evaluate_model(model: Model) -> None:
+        for sweep_collection in sweep_collections:
+            collection = sweep_collection.collection
+            run_id = default_run_id(group_id, model.name, collection.name)
+            LOGGER.info("Start run %s", run_id)
+            try:
+                evaluate_and_store(
+                    model=model,
+                    collection=collection,
+                    eval_cases=sweep_collection.eval_cases,
+                    collection_length=len(sweep_collection.eval_cases),
+                    scorer=sweep_collection.scorer,
+                    eval_storage_adapter=eval_storage_adapter,
+                    group_id=group_id,
+                    checkpoint=RunCheckpoint(checkpoint_dir, run_id),
+                    **run_kwargs,
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Other runs of the grid go on; this one can be resumed later
+                LOGGER.exception("Run %s failed", run_id)
+                failed_runs.append(run_id)
+
+    with ThreadPoolExecutor(max_workers=max(len(models), 1)) as executor:
+        list(executor.map(_evaluate_model, models))
+
+    if failed_runs:
+        raise RuntimeError(f"Failed runs: {', '.join(sorted(failed_runs))}")
+
+
+def main(cfg: DictConfig) -> None:
+    eval_storage_adapter = instantiate(cfg.storage_adapter)
+    models = [instantiate(model_cfg) for model_cfg in cfg.models.values()]
+    if cfg.get("cache") is not None:
+        cache = instantiate(cfg.cache)
+        models = [CachedModel(model, cache) for model in models]
+
+    sweep_collections = []
+    for collection_cfg in cfg.collections.values():
+        scorer = instantiate(collection_cfg.scorer)
+        if cfg.score_workers is not None:
+            scorer = ProcessPoolScorer(scorer, max_workers=cfg.score_workers)
+        sweep_collections.append(
+            load_sweep_collection(instantiate(collection_cfg.collection), scorer)
+        )
+
+    try:
+        run_sweep(
+            models,
+            sweep_collections,
+            eval_storage_adapter,
+            group_id=cfg.group_id,
+            checkpoint_dir=cfg.checkpoint_dir,
+            resume=cfg.resume,
+            execution_mode=cfg.execution_mode,
+            max_workers=cfg.max_workers,
+            batch_size=cfg.batch_size,
+        )
+    finally:
+        for sweep_collection in sweep_collections:
+            sweep_collection.scorer.close()
+
+
+if __name__ == "__main__":
+    hydra.main(
+        config_path=str(get_config_path()),
+        config_name=CONFIG_NAME,
+        version_base="1.3",
+    )(main)()
@@ -1,13 +1,119 @@
+# pylint: disable=too-many-lines
 import json
+import logging
+import os
 import re
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import IO, Any, Iterator, NamedTuple, Sequence
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
 
 from slam_eval.collections.base import EvalCaseCollection
 from slam_eval.model import Model
 from slam_eval.utils.typing import HasStr
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RunWriter(ABC):
+    """Receives the results of a single evaluation run case by case."""
+
+    def __init__(self, result_id: str, header: dict[str, Any]) -> None:
+        self.result_id = result_id
+        self.header = header
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def append(
+        self,
+        index: int,
+        score: int | float,
+        model_answer: HasStr,
+        scores_by_scorer: dict[str, int | float] | None = None,
+    ) -> None:
+        """Store the result of the case with the given index. Thread-safe.
+
+        ``scores_by_scorer`` holds the scores of all scorers when a run uses
+        several of them; they are loaded back as one vector per scorer name.
+        """
+
+    @abstractmethod
+    def close(self, **other_results) -> None:
+        """Finalize the run. No cases can be appended afterwards."""
+
+
+class BufferedRunWriter(RunWriter):
+    """Collects all cases in memory and saves them as one result dict on close."""
+
+    def __init__(
+        self,
+        adapter: "EvalStorageAdapter",
+        result_id: str,
+        header: dict[str, Any],
+    ) -> None:
+        super().__init__(result_id, header)
+        self.adapter = adapter
+        self._cases: dict[
+            int, tuple[int | float, HasStr, dict[str, int | float] | None]
+        ] = {}
+
+    def append(
+        self,
+        index: int,
+        score: int | float,
+        model_answer: HasStr,
+        scores_by_scorer: dict[str, int | float] | None = None,
+    ) -> None:
+        with self._lock:
+            self._cases[index] = (score, model_answer, scores_by_scorer)
+
+    def close(self, **other_results) -> None:
+        with self._lock:
+            ordered_cases = [self._cases[i] for i in sorted(self._cases)]
+            result_dict = {
+                **self.header,
+                "scores": [score for score, _, _ in ordered_cases],
+                "model_answers": [answer for _, answer, _ in ordered_cases],
+            }
+            scores_by_scorer = _collect_scores_by_scorer(
+                [case_scores for _, _, case_scores in ordered_cases]
+            )
+            if scores_by_scorer:
+                result_dict["scores_by_scorer"] = scores_by_scorer
+
+            for k, v in other_results.items():
+                result_dict[k] = v
+
+            # Writers are part of their adapter's storage implementation
+            self.adapter._save_result_dict(  # pylint: disable=protected-access
+                self.result_id, result_dict
+            )
+
+
+def _collect_scores_by_scorer(
+    case_scores: list[dict[str, int | float] | None],
+) -> dict[str, list[int | float | None]]:
+    """Turn per-case scores of several scorers into one vector per scorer."""
+    names = dict.fromkeys(name for scores in case_scores if scores for name in scores)
+    return {
+        name: [scores.get(name) if scores else None for scores in case_scores]
+        for name in names
+    }
+
 
 class EvalStorageAdapter(ABC):
     def __init__(self) -> None:
@@ -22,67 +128,1016 @@ class EvalStorageAdapter(ABC):
         model_answers: list[HasStr],
         **other_results,
     ) -> None:
-        datetime_now = datetime.now()
-        result_id = (
-            f"eval:{group_id}:{datetime_now.isoformat('_')}_M_"
-            f"{model.name}_C_{eval_case_collection.name}"
+        result_id, result_dict = self._make_header(
+            group_id, model, eval_case_collection
         )
-        result_dict = {
-            "group_id": group_id,
-            "timestamp": datetime_now.timestamp(),
-            "model": model.name,
-            "eval_case_collection": eval_case_collection.name,
-            "scores": scores,
-            "model_answers": model_answers,
-        }
+        result_dict["scores"] = scores
+        result_dict["model_answers"] = model_answers
 
         for k, v in other_results.items():
             result_dict[k] = v
 
         self._save_result_dict(result_id, result_dict)
 
+    def open_run(
+        self,
+        group_id: str,
+        model: Model,
+        eval_case_collection: EvalCaseCollection,
+    ) -> RunWriter:
+        """Start a run whose cases are stored one by one as they finish."""
+        result_id, header = self._make_header(group_id, model, eval_case_collection)
+        return self._open_run_writer(result_id, header)
+
     @abstractmethod
     def load(self, id_regex: str) -> list[dict[str, Any]]:
         """Load evaluation results filtered by regex pattern on id field."""
 
+    def iter_load(self, id_regex: str) -> Iterator[dict[str, Any]]:
+        """Yield evaluation results filtered by regex pattern on id field.
+
+        Adapters that can read results one by one override this to avoid
+        holding all of them in memory.
+        """
+        yield from self.load(id_regex)
+
+    def add_scores(
+        self, result_id: str, scores_by_scorer: dict[str, list[int | float]]
+    ) -> None:
+        """Attach per-case score vectors of extra scorers to a stored result.
+
+        They are loaded under ``scores_by_scorer``, keyed by scorer name. Adding
+        scores of a scorer the result already has replaces them.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support adding scores"
+        )
+
     @abstractmethod
     def _save_result_dict(
         self, result_id: str, result_dict: dict[str, Any]
     ) -> None: ...
 
+    def _open_run_writer(self, result_id: str, header: dict[str, Any]) -> RunWriter:
+        # Adapters without native streaming support save the run at the end
+        return BufferedRunWriter(self, result_id, header)
+
+    @staticmethod
+    def _make_header(
+        group_id: str,
+        model: Model,
+        eval_case_collection: EvalCaseCollection,
+    ) -> tuple[str, dict[str, Any]]:
+        datetime_now = datetime.now()
+        result_id = (
+            f"eval:{group_id}:{datetime_now.isoformat('_')}_M_"
+            f"{model.name}_C_{eval_case_collection.name}"
+        )
+        header = {
+            "group_id": group_id,
+            "timestamp": datetime_now.timestamp(),
+            "model": model.name,
+            "eval_case_collection": eval_case_collection.name,
+        }
+        return result_id, header
+
+
+class _JsonlRunWriter(RunWriter):
+    def __init__(
+        self,
+        adapter: "LocalJsonlAdapter",
+        result_id: str,
+        header: dict[str, Any],
+    ) -> None:
+        super().__init__(result_id, header)
+        self.adapter = adapter
+        self._num_cases = 0
+        self.adapter.append_record(
+            {"id": result_id, "record": LocalJsonlAdapter.HEADER_RECORD, **header}
+        )
+
+    def append(
+        self,
+        index: int,
+        score: int | float,
+        model_answer: HasStr,
+        scores_by_scorer: dict[str, int | float] | None = None,
+    ) -> None:
+        record = {
+            "id": self.result_id,
+            "record": LocalJsonlAdapter.CASE_RECORD,
+            "index": index,
+            "score": score,
+            "model_answer": model_answer,
+        }
+        if scores_by_scorer:
+            record["scores_by_scorer"] = scores_by_scorer
+        with self._lock:
+            self.adapter.append_record(record)
+            self._num_cases += 1
+
+    def close(self, **other_results) -> None:
+        with self._lock:
+            self.adapter.append_record(
+                {
+                    "id": self.result_id,
+                    "record": LocalJsonlAdapter.FOOTER_RECORD,
+                    "num_cases": self._num_cases,
+                    **other_results,
+                }
+            )
+
+
+class _IndexEntry(NamedTuple):
+    offset: int
+    length: int
+    id: str
+
 
 class LocalJsonlAdapter(EvalStorageAdapter):
+    """Stores results in a JSONL file.
+
+    Results passed to ``save`` take one line each. Streamed runs take a header
+    line, one line per case and a footer line; ``load`` reassembles them into
+    the same result dict as ``save`` would produce. Streamed runs without a
+    footer are incomplete and are not loaded. Scores added later with
+    ``add_scores`` take one line per call and are merged into their result.
+
+    A sidecar index next to the JSONL file maps every record id to the byte
+    offset and length of its line, so ``load`` matches ids against the index
+    and only decodes the matching lines. Lines appended without going through
+    the adapter are indexed on the next read or write. An index that no longer
+    matches the file, e.g. after the file was rewritten, is rebuilt. Appends
+    and index updates hold an exclusive ``flock`` on the JSONL file, so several
+    processes may write to one file.
+    """
+
+    HEADER_RECORD = "header"
+    CASE_RECORD = "case"
+    FOOTER_RECORD = "footer"
+    SCORES_RECORD = "scores"
+
     def __init__(self, path_to_jsonl: str) -> None:
         super().__init__()
         self.path_to_jsonl = path_to_jsonl
+        self._write_lock = threading.Lock()
+        # Position up to which the JSONL file is known to be indexed
+        self._indexed_end: int | None = None
+
+    @property
+    def path_to_index(self) -> str:
+        return f"{self.path_to_jsonl}.idx"
 
     def load(self, id_regex: str) -> list[dict[str, Any]]:
-        """Load evaluation results filtered by regex pattern on id field."""
+        """Load evaluation results filtered by regex pattern on id field.
+
+        Results are ordered by the position of their first line in the file.
+        """
+        return [
+            result_dict
+            for _, result_dict in sorted(
+                self._iter_results(id_regex), key=lambda item: item[0]
+            )
+        ]
+
+    def iter_load(self, id_regex: str) -> Iterator[dict[str, Any]]:
+        """Yield evaluation results as soon as their last record is read.
+
+        The index tells which line is the last one of every id, so a result is
+        only held back until the scores added to it with ``add_scores`` are
+        read, and other results are not kept in memory. Results with added
+        scores may therefore come later than in the file.
+        """
+        for _, result_dict in self._iter_results(id_regex):
+            yield result_dict
+
+    def _iter_results(self, id_regex: str) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield results with the offsets of their first lines."""
         pattern = re.compile(id_regex)
-        results = []
+        # Complete results waiting for their added scores, with their offsets
+        results: dict[str, tuple[int, dict[str, Any]]] = {}
+        # Streamed runs being reassembled: id -> (header, {index: case record})
+        open_runs: dict[str, tuple[dict[str, Any], dict[int, dict[str, Any]]]] = {}
+        run_offsets: dict[str, int] = {}
+
+        for record, offset, is_last in self._iter_records(pattern):
+            result_id = record["id"]
+            record_type = record.pop("record", None)
+            if record_type is None:
+                results[result_id] = (offset, record)
+            elif record_type == self.SCORES_RECORD:
+                if result_id in results:
+                    results[result_id][1].setdefault("scores_by_scorer", {}).update(
+                        record["scores_by_scorer"]
+                    )
+            elif record_type == self.HEADER_RECORD:
+                open_runs[result_id] = (record, {})
+                run_offsets[result_id] = offset
+            elif result_id not in open_runs:
+                # Cases or footer of a run whose header is missing
+                continue
+            elif record_type == self.CASE_RECORD:
+                open_runs[result_id][1][record["index"]] = record
+            elif record_type == self.FOOTER_RECORD:
+                header, cases = open_runs.pop(result_id)
+                results[result_id] = (
+                    run_offsets.pop(result_id),
+                    self._assemble_run(header, cases, record),
+                )
+
+            if is_last and result_id in results:
+                yield results.pop(result_id)
+
+        # Results whose last line could not be read
+        yield from results.values()
+
+    def add_scores(
+        self, result_id: str, scores_by_scorer: dict[str, list[int | float]]
+    ) -> None:
+        self.append_record(
+            {
+                "id": result_id,
+                "record": self.SCORES_RECORD,
+                "scores_by_scorer": scores_by_scorer,
+            }
+        )
+
+    def _iter_records(
+        self, pattern: re.Pattern[str]
+    ) -> Iterator[tuple[dict[str, Any], int, bool]]:
+        """Yield matching records with their offsets.
+
+        Every record comes with whether it is the last line of its id.
+        """
+        if not os.path.exists(self.path_to_jsonl):
+            return
+
+        with open(self.path_to_jsonl, "rb") as f:
+            with self._write_lock, _locked(f):
+                entries = self._update_index()
+            is_rebuilt = False
+            # End of the last record yielded, records are yielded in file order
+            position = 0
+            while True:
+                is_stale = False
+                for record, entry, is_last in self._read_matching(
+                    f, entries, pattern, position
+                ):
+                    if record is not None and record.get("id") == entry.id:
+                        position = entry.offset + entry.length
+                        yield record, entry.offset, is_last
+                    elif not is_rebuilt:
+                        is_stale = True
+                        break
+                if not is_stale:
+                    return
+
+                LOGGER.warning(
+                    "Index %s does not match the results file, rebuild it",
+                    self.path_to_index,
+                )
+                with self._write_lock, _locked(f):
+                    entries = self._rebuild_index()
+                is_rebuilt = True
 
+    @staticmethod
+    def _read_matching(
+        f: IO[bytes],
+        entries: list[_IndexEntry],
+        pattern: re.Pattern[str],
+        position: int,
+    ) -> Iterator[tuple[dict[str, Any] | None, _IndexEntry, bool]]:
+        """Decode the lines of the entries after ``position`` with matching ids.
+
+        Lines that are no longer valid JSON objects are returned as None. Every
+        line comes with whether it is the last line of its id.
+        """
+        is_matching: dict[str, bool] = {}
+        last_offsets: dict[str, int] = {}
+        for entry in entries:
+            if entry.id not in is_matching:
+                is_matching[entry.id] = pattern.search(entry.id) is not None
+            if is_matching[entry.id]:
+                last_offsets[entry.id] = entry.offset
+
+        for entry in entries:
+            if entry.offset < position or entry.id not in last_offsets:
+                continue
+            f.seek(entry.offset)
+            try:
+                record = json.loads(f.read(entry.length))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                record = None
+            is_last = entry.offset == last_offsets[entry.id]
+            yield (record if isinstance(record, dict) else None), entry, is_last
+
+    def _update_index(self) -> list[_IndexEntry]:
+        """Read the index and extend it with lines it does not cover yet."""
+        entries_by_offset = {entry.offset: entry for entry in self._read_index()}
+        indexed_end = max(
+            (entry.offset + entry.length for entry in entries_by_offset.values()),
+            default=0,
+        )
+        if self._file_size() < indexed_end:
+            # The file was truncated or replaced by a shorter one
+            return self._rebuild_index()
+
+        new_entries, self._indexed_end = self._scan(indexed_end)
+        self._write_index_entries(new_entries)
+        for entry in new_entries:
+            entries_by_offset[entry.offset] = entry
+
+        return [entries_by_offset[offset] for offset in sorted(entries_by_offset)]
+
+    def _rebuild_index(self) -> list[_IndexEntry]:
+        entries, self._indexed_end = self._scan(0)
+        self._write_index_entries(entries, mode="w")
+        return entries
+
+    def _file_size(self) -> int:
+        try:
+            return os.path.getsize(self.path_to_jsonl)
+        except FileNotFoundError:
+            return 0
+
+    def _read_index(self) -> list[_IndexEntry]:
+        entries = []
         try:
-            with open(self.path_to_jsonl, "r", encoding="utf-8") as f:
+            with open(self.path_to_index, "r", encoding="utf-8") as f:
                 for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            result_dict = json.loads(line)
-                            if "id" in result_dict and pattern.search(
-                                result_dict["id"]
-                            ):
-                                results.append(result_dict)
-                        except json.JSONDecodeError:
-                            # Skip malformed JSON lines
-                            continue
+                    try:
+                        offset, length, raw_id = line.rstrip("\n").split("\t", 2)
+                        entries.append(
+                            _IndexEntry(int(offset), int(length), json.loads(raw_id))
+                        )
+                    except ValueError:
+                        # Skip truncated index lines, they are rebuilt by _scan
+                        continue
         except FileNotFoundError:
-            # Return empty list if file doesn't exist
             pass
 
-        return results
+        return entries
+
+    def _scan(self, start: int) -> tuple[list[_IndexEntry], int]:
+        """Index JSONL lines starting at byte offset ``start``."""
+        entries = []
+        try:
+            with open(self.path_to_jsonl, "rb") as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    entry = self._make_index_entry(offset, line)
+                    if entry is not None:
+                        entries.append(entry)
+                    offset += len(line)
+        except FileNotFoundError:
+            return [], 0
+
+        return entries, offset
+
+    @staticmethod
+    def _make_index_entry(offset: int, line: bytes) -> _IndexEntry | None:
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # Skip malformed JSON lines
+            return None
+        if not isinstance(record, dict) or not isinstance(record.get("id"), str):
+            return None
+        return _IndexEntry(offset, len(line.rstrip(b"\n")), record["id"])
+
+    def _write_index_entries(self, entries: list[_IndexEntry], mode: str = "a") -> None:
+        if not entries and mode == "a":
+            return
+        with open(self.path_to_index, mode, encoding="utf-8") as f:
+            for entry in entries:
+                f.write(f"{entry.offset}\t{entry.length}\t{json.dumps(entry.id)}\n")
+
+    @staticmethod
+    def _assemble_run(
+        header: dict[str, Any],
+        cases: dict[int, dict[str, Any]],
+        footer: dict[str, Any],
+    ) -> dict[str, Any]:
+        ordered_cases = [cases[i] for i in sorted(cases)]
+        result_dict = {
+            **header,
+            "scores": [case["score"] for case in ordered_cases],
+            "model_answers": [case["model_answer"] for case in ordered_cases],
+        }
+        scores_by_scorer = _collect_scores_by_scorer(
+            [case.get("scores_by_scorer") for case in ordered_cases]
+        )
+        if scores_by_scorer:
+            result_dict["scores_by_scorer"] = scores_by_scorer
+        for k, v in footer.items():
+            if k not in ("id", "num_cases"):
+                result_dict[k] = v
+        return result_dict
+
+    def _open_run_writer(self, result_id: str, header: dict[str, Any]) -> RunWriter:
+        return _JsonlRunWriter(self, result_id, header)
 
     def _save_result_dict(self, result_id: str, result_dict: dict[str, Any]) -> None:
         # Add the ID back to the dict for JSONL format
         result_dict_with_id = {"id": result_id, **result_dict}
-        with open(self.path_to_jsonl, "a", encoding="utf-8") as f:
-            f.write(json.dumps(result_dict_with_id) + "\n")
+        self.append_record(result_dict_with_id)
+
+    def append_record(self, record: dict[str, Any]) -> None:
+        """Append one line to the file; used by the adapter's run writers."""
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        # Other processes appending to the file wait for the line and its index
+        # entry, so the offset taken here is where the line is written
+        with self._write_lock, open(self.path_to_jsonl, "ab") as f, _locked(f):
+            offset = f.seek(0, os.SEEK_END)
+            if offset != self._indexed_end:
+                # The file has been changed elsewhere or is not indexed yet
+                self._update_index()
+            f.write(line)
+            f.flush()
+
+            self._write_index_entries(
+                [_IndexEntry(offset, len(line) - 1, record["id"])]
+            )
+            self._indexed_end = offset + len(line)
+
+
+@contextmanager
+def _locked(f: IO[bytes]) -> Iterator[None]:
+    """Hold an exclusive advisory lock on the open file, where supported."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _SqliteRunWriter(RunWriter):
+    def __init__(
+        self,
+        adapter: "SqliteAdapter",
+        result_id: str,
+        header: dict[str, Any],
+    ) -> None:
+        super().__init__(result_id, header)
+        self.adapter = adapter
+        self.adapter.insert_run(result_id, header, complete=False)
+
+    def append(
+        self,
+        index: int,
+        score: int | float,
+        model_answer: HasStr,
+        scores_by_scorer: dict[str, int | float] | None = None,
+    ) -> None:
+        self.adapter.insert_cases(
+            self.result_id, [(index, score, model_answer)], scores_by_scorer
+        )
+
+    def close(self, **other_results) -> None:
+        self.adapter.complete_run(self.result_id, other_results)
+
+
+class SqliteAdapter(EvalStorageAdapter):
+    """Stores runs and their cases as rows of an SQLite database.
+
+    Runs are indexed by group id, model, collection and timestamp, so aggregate
+    queries such as ``mean_scores`` do not scan unrelated runs. Scores added
+    with ``add_scores`` are kept in a separate table, one row per case and
+    scorer. The database is opened in WAL mode, which lets parallel runs on one
+    machine write to it concurrently. Scores are stored as reals next to a flag
+    marking integer scores, so that they load with the type they were saved
+    with.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS runs ("
+        "id TEXT PRIMARY KEY, "
+        "group_id TEXT NOT NULL, "
+        "timestamp REAL NOT NULL, "
+        "model TEXT NOT NULL, "
+        "eval_case_collection TEXT NOT NULL, "
+        "other_results TEXT NOT NULL DEFAULT '{}', "
+        "complete INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS cases ("
+        "run_id TEXT NOT NULL REFERENCES runs (id), "
+        "case_index INTEGER NOT NULL, "
+        "score REAL, "
+        "score_is_integer INTEGER NOT NULL DEFAULT 0, "
+        "model_answer TEXT, "
+        "PRIMARY KEY (run_id, case_index))",
+        "CREATE TABLE IF NOT EXISTS case_scores ("
+        "run_id TEXT NOT NULL REFERENCES runs (id), "
+        "scorer TEXT NOT NULL, "
+        "case_index INTEGER NOT NULL, "
+        "score REAL, "
+        "score_is_integer INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (run_id, scorer, case_index))",
+        "CREATE INDEX IF NOT EXISTS runs_group_id ON runs (group_id)",
+        "CREATE INDEX IF NOT EXISTS runs_model ON runs (model)",
+        "CREATE INDEX IF NOT EXISTS runs_eval_case_collection "
+        "ON runs (eval_case_collection, timestamp)",
+        "CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp)",
+    )
+
+    def __init__(self, path_to_db: str, busy_timeout: float = 30.0) -> None:
+        super().__init__()
+        self.path_to_db = path_to_db
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def load(self, id_regex: str) -> list[dict[str, Any]]:
+        """Load evaluation results filtered by regex pattern on id field."""
+        with self._lock:
+            connection = self._get_connection()
+            runs = connection.execute(
+                "SELECT id, group_id, timestamp, model, eval_case_collection, "
+                "other_results FROM runs WHERE complete = 1 AND id REGEXP ? "
+                "ORDER BY timestamp, id",
+                (id_regex,),
+            ).fetchall()
+
+            results = []
+            for run_id, group_id, timestamp, model, collection, other_results in runs:
+                cases = connection.execute(
+                    "SELECT case_index, score, score_is_integer, model_answer "
+                    "FROM cases WHERE run_id = ? ORDER BY case_index",
+                    (run_id,),
+                ).fetchall()
+                result_dict = {
+                    "id": run_id,
+                    "group_id": group_id,
+                    "timestamp": timestamp,
+                    "model": model,
+                    "eval_case_collection": collection,
+                    "scores": [
+                        self._restore_score(score, is_integer)
+                        for _, score, is_integer, _ in cases
+                    ],
+                    "model_answers": [json.loads(case[-1]) for case in cases],
+                }
+                result_dict.update(json.loads(other_results))
+                # Cases may lack scores of some scorers, e.g. cases resumed from
+                # a checkpoint written before the scorers were added
+                positions = {case[0]: k for k, case in enumerate(cases)}
+                scores_by_scorer: dict[str, list[int | float | None]] = {}
+                for scorer, case_index, score, is_integer in connection.execute(
+                    "SELECT scorer, case_index, score, score_is_integer "
+                    "FROM case_scores WHERE run_id = ? ORDER BY scorer, case_index",
+                    (run_id,),
+                ):
+                    if case_index not in positions:
+                        continue
+                    scorer_scores = scores_by_scorer.setdefault(
+                        scorer, [None] * len(cases)
+                    )
+                    scorer_scores[positions[case_index]] = self._restore_score(
+                        score, is_integer
+                    )
+                if scores_by_scorer:
+                    result_dict["scores_by_scorer"] = scores_by_scorer
+                results.append(result_dict)
+
+        return results
+
+    def mean_scores(
+        self,
+        eval_case_collection: str,
+        since_timestamp: float | None = None,
+    ) -> dict[str, float]:
+        """Mean score per model over all cases of the collection's runs."""
+        query = (
+            "SELECT runs.model, AVG(cases.score) FROM runs "
+            "JOIN cases ON cases.run_id = runs.id "
+            "WHERE runs.complete = 1 AND runs.eval_case_collection = ?"
+        )
+        params: list[Any] = [eval_case_collection]
+        if since_timestamp is not None:
+            query += " AND runs.timestamp >= ?"
+            params.append(since_timestamp)
+        query += " GROUP BY runs.model"
+
+        with self._lock:
+            rows = self._get_connection().execute(query, params).fetchall()
+        return dict(rows)
+
+    def add_scores(
+        self, result_id: str, scores_by_scorer: dict[str, list[int | float]]
+    ) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "DELETE FROM case_scores WHERE run_id = ? AND scorer IN "
+                    f"({', '.join('?' * len(scores_by_scorer))})",
+                    (result_id, *scores_by_scorer),
+                )
+                self._execute_insert_case_scores(
+                    connection, result_id, scores_by_scorer
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _open_run_writer(self, result_id: str, header: dict[str, Any]) -> RunWriter:
+        return _SqliteRunWriter(self, result_id, header)
+
+    def _save_result_dict(self, result_id: str, result_dict: dict[str, Any]) -> None:
+        header = {
+            k: result_dict[k]
+            for k in ("group_id", "timestamp", "model", "eval_case_collection")
+        }
+        other_results = {
+            k: v
+            for k, v in result_dict.items()
+            if k not in header
+            and k not in ("scores", "model_answers", "scores_by_scorer")
+        }
+        cases = list(
+            zip(
+                range(len(result_dict["scores"])),
+                result_dict["scores"],
+                result_dict["model_answers"],
+                strict=True,
+            )
+        )
+
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                self._execute_insert_run(connection, result_id, header, True)
+                self._execute_insert_cases(connection, result_id, cases)
+                self._execute_insert_case_scores(
+                    connection, result_id, result_dict.get("scores_by_scorer", {})
+                )
+                self._execute_complete_run(connection, result_id, other_results)
+
+    def insert_run(
+        self, result_id: str, header: dict[str, Any], complete: bool
+    ) -> None:
+        """Insert the row of a run; used by the adapter's run writers."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                self._execute_insert_run(connection, result_id, header, complete)
+
+    def insert_cases(
+        self,
+        result_id: str,
+        cases: list[tuple[int, int | float, HasStr]],
+        scores_by_scorer: dict[str, int | float] | None = None,
+    ) -> None:
+        """Insert rows of cases of a run; used by the adapter's run writers."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                self._execute_insert_cases(connection, result_id, cases)
+                if scores_by_scorer:
+                    # Scores of a single streamed case
+                    case_index = cases[0][0]
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO case_scores (run_id, scorer, "
+                        "case_index, score, score_is_integer) VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                result_id,
+                                scorer,
+                                case_index,
+                                score,
+                                isinstance(score, int),
+                            )
+                            for scorer, score in scores_by_scorer.items()
+                        ],
+                    )
+
+    def complete_run(self, result_id: str, other_results: dict[str, Any]) -> None:
+        """Mark a run as complete; used by the adapter's run writers."""
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                self._execute_complete_run(connection, result_id, other_results)
+
+    @staticmethod
+    def _execute_insert_run(
+        connection: sqlite3.Connection,
+        result_id: str,
+        header: dict[str, Any],
+        complete: bool,
+    ) -> None:
+        connection.execute(
+            "INSERT INTO runs (id, group_id, timestamp, model, eval_case_collection, "
+            "complete) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                result_id,
+                header["group_id"],
+                header["timestamp"],
+                header["model"],
+                header["eval_case_collection"],
+                int(complete),
+            ),
+        )
+
+    @staticmethod
+    def _execute_insert_cases(
+        connection: sqlite3.Connection,
+        result_id: str,
+        cases: list[tuple[int, int | float, HasStr]],
+    ) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO cases (run_id, case_index, score, "
+            "score_is_integer, model_answer) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    result_id,
+                    index,
+                    score,
+                    isinstance(score, int),
+                    json.dumps(model_answer),
+                )
+                for index, score, model_answer in cases
+            ],
+        )
+
+    @staticmethod
+    def _execute_insert_case_scores(
+        connection: sqlite3.Connection,
+        result_id: str,
+        scores_by_scorer: dict[str, list[int | float]],
+    ) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO case_scores (run_id, scorer, case_index, score, "
+            "score_is_integer) VALUES (?, ?, ?, ?, ?)",
+            [
+                (result_id, scorer, index, score, isinstance(score, int))
+                for scorer, scores in scores_by_scorer.items()
+                for index, score in enumerate(scores)
+            ],
+        )
+
+    @staticmethod
+    def _execute_complete_run(
+        connection: sqlite3.Connection,
+        result_id: str,
+        other_results: dict[str, Any],
+    ) -> None:
+        connection.execute(
+            "UPDATE runs SET complete = 1, other_results = ? WHERE id = ?",
+            (json.dumps(other_results), result_id),
+        )
+
+    @staticmethod
+    def _restore_score(score: float | None, is_integer: int) -> int | float | None:
+        if score is not None and is_integer:
+            return int(score)
+        return score
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path_to_db,
+                timeout=self.busy_timeout,
+                check_same_thread=False,
+            )
+            connection.create_function("REGEXP", 2, _sqlite_regexp, deterministic=True)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                for statement in self._SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+
+def _sqlite_regexp(pattern: str, value: str) -> bool:
+    # SQLite evaluates "X REGEXP Y" as regexp(Y, X)
+    return re.search(pattern, value) is not None
+
+
+class ParquetAdapter(EvalStorageAdapter):
+    """Stores runs as a Parquet dataset with one row per case.
+
+    Files are partitioned as
+    ``group_id=<...>/model=<...>/eval_case_collection=<...>`` so that queries
+    restricted to some groups, models or collections skip the other
+    directories, and score-only aggregations never read the answer column.
+    The id regex is evaluated by Arrow (RE2 syntax) as a pushed-down filter.
+    Scores added with ``add_scores`` are written under ``_scores/<id>/``, which
+    Arrow skips when discovering the case files.
+
+    Scores are stored as doubles next to a flag marking integer scores, and
+    answers are stored JSON-encoded, so that ``load`` returns the same types
+    as the other adapters. Lazily loaded datasets expose the raw columns.
+    """
+
+    SCORES_DIR = "_scores"
+
+    PARTITIONING_SCHEMA = pa.schema(
+        [
+            ("group_id", pa.string()),
+            ("model", pa.string()),
+            ("eval_case_collection", pa.string()),
+        ]
+    )
+    FILE_SCHEMA = pa.schema(
+        [
+            ("id", pa.string()),
+            ("timestamp", pa.float64()),
+            ("case_index", pa.int64()),
+            ("score", pa.float64()),
+            ("score_is_integer", pa.bool_()),
+            ("model_answer", pa.string()),
+            ("other_results", pa.string()),
+        ]
+    )
+    SCORES_SCHEMA = pa.schema(
+        [
+            ("id", pa.string()),
+            ("scorer", pa.string()),
+            ("case_index", pa.int64()),
+            ("score", pa.float64()),
+            ("score_is_integer", pa.bool_()),
+        ]
+    )
+
+    def __init__(self, root_dir: str) -> None:
+        super().__init__()
+        self.root_dir = Path(root_dir).expanduser()
+
+    def load(
+        self,
+        id_regex: str,
+        lazy: bool = False,
+        columns: list[str] | None = None,
+    ) -> Any:
+        """Load evaluation results filtered by regex pattern on id field.
+
+        With ``lazy=True``, a filtered ``pyarrow.dataset.Dataset`` with one row
+        per case is returned instead of a list of result dicts; nothing is read
+        until it is scanned, e.g. with ``to_table(columns=["model", "score"])``.
+        """
+        id_filter = pc.match_substring_regex(  # pylint: disable=no-member
+            pads.field("id"), pattern=id_regex
+        )
+        if not self.root_dir.exists():
+            return self._empty_dataset().filter(id_filter) if lazy else []
+
+        dataset = pads.dataset(
+            self.root_dir,
+            schema=pa.unify_schemas([self.FILE_SCHEMA, self.PARTITIONING_SCHEMA]),
+            format="parquet",
+            partitioning=pads.partitioning(self.PARTITIONING_SCHEMA, flavor="hive"),
+        ).filter(id_filter)
+        if lazy:
+            return dataset
+
+        if columns is not None:
+            # Cases are grouped into runs by id and ordered by case index
+            columns = list(dict.fromkeys(["id", "case_index", *columns]))
+            if "score" in columns:
+                columns.append("score_is_integer")
+        table = dataset.to_table(columns=columns)
+        results = self._table_to_result_dicts(table)
+        if columns is None or "score" in columns:
+            self._attach_added_scores(results, id_filter)
+        return results
+
+    def add_scores(
+        self, result_id: str, scores_by_scorer: dict[str, list[int | float]]
+    ) -> None:
+        scores_dir = self.root_dir / self.SCORES_DIR / quote(result_id, safe="")
+        scores_dir.mkdir(parents=True, exist_ok=True)
+        for scorer, scores in scores_by_scorer.items():
+            table = pa.table(
+                {
+                    "id": [result_id] * len(scores),
+                    "scorer": [scorer] * len(scores),
+                    "case_index": list(range(len(scores))),
+                    "score": scores,
+                    "score_is_integer": self._is_integer(scores),
+                },
+                schema=self.SCORES_SCHEMA,
+            )
+            pq.write_table(table, scores_dir / f"{quote(scorer, safe='')}.parquet")
+
+    def _attach_added_scores(
+        self, results: list[dict[str, Any]], id_filter: pc.Expression
+    ) -> None:
+        scores_root = self.root_dir / self.SCORES_DIR
+        if not results or not scores_root.exists():
+            return
+
+        table = (
+            pads.dataset(scores_root, format="parquet", schema=self.SCORES_SCHEMA)
+            .filter(id_filter)
+            .to_table()
+            .sort_by([(key, "ascending") for key in ("id", "scorer", "case_index")])
+        )
+        results_by_id = {result_dict["id"]: result_dict for result_dict in results}
+        for row in table.to_pylist():
+            result_dict = results_by_id.get(row["id"])
+            if result_dict is None:
+                continue
+            scores_by_scorer = result_dict.setdefault("scores_by_scorer", {})
+            scores_by_scorer.setdefault(row["scorer"], []).append(
+                self._restore_score(row)
+            )
+
+    def _save_result_dict(self, result_id: str, result_dict: dict[str, Any]) -> None:
+        partition_keys = self.PARTITIONING_SCHEMA.names
+        other_results = {
+            k: v
+            for k, v in result_dict.items()
+            if k not in partition_keys
+            and k not in ("timestamp", "scores", "model_answers", "scores_by_scorer")
+        }
+        num_cases = len(result_dict["scores"])
+        table = pa.table(
+            {
+                "id": [result_id] * num_cases,
+                "timestamp": [result_dict["timestamp"]] * num_cases,
+                "case_index": list(range(num_cases)),
+                "score": result_dict["scores"],
+                "score_is_integer": self._is_integer(result_dict["scores"]),
+                "model_answer": [
+                    json.dumps(answer) for answer in result_dict["model_answers"]
+                ],
+                "other_results": [json.dumps(other_results)] * num_cases,
+            },
+            schema=self.FILE_SCHEMA,
+        )
+
+        partition_dir = self.root_dir.joinpath(
+            *(
+                f"{key}={quote(str(result_dict[key]), safe='')}"
+                for key in partition_keys
+            )
+        )
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, partition_dir / f"{quote(result_id, safe='')}.parquet")
+        if result_dict.get("scores_by_scorer"):
+            self.add_scores(result_id, result_dict["scores_by_scorer"])
+
+    @staticmethod
+    def _is_integer(scores: Sequence[int | float | None]) -> list[bool]:
+        return [isinstance(score, int) for score in scores]
+
+    @staticmethod
+    def _restore_score(row: dict[str, Any]) -> int | float | None:
+        score = row["score"]
+        if score is not None and row.get("score_is_integer"):
+            return int(score)
+        return score
+
+    def _empty_dataset(self) -> pads.Dataset:
+        schema = pa.unify_schemas([self.FILE_SCHEMA, self.PARTITIONING_SCHEMA])
+        return pads.dataset(schema.empty_table())
+
+    @classmethod
+    def _table_to_result_dicts(cls, table: pa.Table) -> list[dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        case_indices: dict[str, list[int]] = {}
+        for row in table.to_pylist():
+            result_id = row["id"]
+            if result_id not in results:
+                result_dict = {"id": result_id}
+                for k in ("group_id", "timestamp", "model", "eval_case_collection"):
+                    if k in row:
+                        result_dict[k] = row[k]
+                if "score" in row:
+                    result_dict["scores"] = []
+                if "model_answer" in row:
+                    result_dict["model_answers"] = []
+                if row.get("other_results") is not None:
+                    result_dict.update(json.loads(row["other_results"]))
+                results[result_id] = result_dict
+                case_indices[result_id] = []
+
+            case_indices[result_id].append(row.get("case_index", 0))
+            if "score" in row:
+                results[result_id]["scores"].append(cls._restore_score(row))
+            if "model_answer" in row:
+                results[result_id]["model_answers"].append(
+                    json.loads(row["model_answer"])
+                )
+
+        # Fragments may be scanned in parallel, so cases are not guaranteed to
+        # come back in order
+        for result_id, result_dict in results.items():
+            order = sorted(
+                range(len(case_indices[result_id])),
+                key=case_indices[result_id].__getitem__,
+            )
+            for k in ("scores", "model_answers"):
+                if k in result_dict:
+                    result_dict[k] = [result_dict[k][i] for i in order]
+
+        return sorted(results.values(), key=lambda r: (r.get("timestamp", 0), r["id"]))
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+
+def is_overload_error(err: BaseException) -> bool:
+    """Whether the error means the endpoint cannot keep up with the load.
+
+    Throttling (429), server errors (5xx) and timeouts are overload signals.
+    Errors of httpx, used by HttpTransport, and of requests, used by rally
+    when a model has no transport, are recognized.
+    """
+    if isinstance(err, (httpx.HTTPStatusError, requests.HTTPError)):
+        if err.response is None:
+            return False
+        status_code = err.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(err, (httpx.TimeoutException, requests.Timeout))
+
+
+def is_retriable_error(err: BaseException) -> bool:
+    """Whether the request may succeed if sent again.
+
+    Besides overload signals, dropped and reset connections are retriable.
+    """
+    return is_overload_error(err) or isinstance(
+        err,
+        (
+            httpx.NetworkError,
+            httpx.RemoteProtocolError,
+            requests.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
+class HttpTransport:
+    """Owns pooled keep-alive HTTP clients shared by all requests of a model.
+
+    The sync and async clients are created lazily so that a transport used only
+    from threads never opens an event-loop-bound client and vice versa.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        max_connections_per_host: int | None = None,
+        timeout: float = 600.0,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._async_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def post(self, url: str, json: Any, headers: dict[str, str]) -> httpx.Response:
+        client = self._get_client()
+        semaphore = self._get_host_semaphore(url)
+        if semaphore is None:
+            return client.post(url, json=json, headers=headers)
+
+        with semaphore:
+            return client.post(url, json=json, headers=headers)
+
+    async def apost(
+        self, url: str, json: Any, headers: dict[str, str]
+    ) -> httpx.Response:
+        client = self._get_async_client()
+        semaphore = self._get_async_host_semaphore(url)
+        if semaphore is None:
+            return await client.post(url, json=json, headers=headers)
+
+        async with semaphore:
+            return await client.post(url, json=json, headers=headers)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            # Semaphores are bound to the event loop that created them
+            self._async_host_semaphores.clear()
+
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout, limits=self.limits)
+            return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits
+            )
+        return self._async_client
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore | None:
+        if self.max_connections_per_host is None:
+            return None
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(
+                    self.max_connections_per_host
+                )
+            return self._host_semaphores[host]
+
+    def _get_async_host_semaphore(self, url: str) -> asyncio.Semaphore | None:
+        if self.max_connections_per_host is None:
+            return None
+
+        host = urlsplit(url).netloc
+        if host not in self._async_host_semaphores:
+            self._async_host_semaphores[host] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+        return self._async_host_semaphores[host]
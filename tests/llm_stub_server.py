@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from unittest.mock import Mock
+
+from rally.llm import Llm
+
+from slam_eval.collections.text_generation import TextGenerationInput
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.transport import HttpTransport
+
+# Maps a parsed request payload to (status code, response payload)
+Responder = Callable[[dict[str, Any]], tuple[int, dict[str, Any]]]
+
+
+def echo_responder(payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    content = payload["messages"][-1]["content"]
+    return 200, {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+def make_mock_llm(url: str, max_concurrent_requests: int = 4) -> Mock:
+    mock_llm = Mock(spec=Llm)
+    mock_llm.url = url
+    mock_llm.authorization = "Bearer test-token"
+    mock_llm.model = "test-model"
+    mock_llm.max_output_tokens = 1000
+    mock_llm.max_concurrent_requests = max_concurrent_requests
+    return mock_llm
+
+
+def make_model(
+    url: str, transport: HttpTransport | None = None, **kwargs: Any
+) -> LlmViaOpenAiApi:
+    return LlmViaOpenAiApi(
+        "test_model",
+        make_mock_llm(url),
+        transport=transport if transport is not None else HttpTransport(),
+        **kwargs,
+    )
+
+
+def predict(model: LlmViaOpenAiApi, prompt: str) -> str:
+    return model.predict(TextGenerationInput(system_prompt=None, user_prompt=prompt))
+
+
+async def apredict(model: LlmViaOpenAiApi, prompt: str) -> str:
+    return await model.apredict(
+        TextGenerationInput(system_prompt=None, user_prompt=prompt)
+    )
+
+
+class _StubHttpServer(ThreadingHTTPServer):
+    # Many clients may connect at once, more than the default backlog of 5
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients may drop a request before it is answered, e.g. a hedged one
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubLlmServer:
+    """OpenAI-compatible chat completions server running in a background thread."""
+
+    def __init__(self, responder: Responder = echo_responder) -> None:
+        self.responder = responder
+        self.requests: list[dict[str, Any]] = []
+        self.client_addresses: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        self._server = _StubHttpServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def __enter__(self) -> StubLlmServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                length = int(self.headers["Content-Length"])
+                payload = json.loads(self.rfile.read(length))
+                with stub._lock:
+                    stub.requests.append(
+                        {"payload": payload, "headers": dict(self.headers)}
+                    )
+                    stub.client_addresses.add(self.client_address)
+
+                status, body = stub.responder(payload)
+                raw_body = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw_body)))
+                self.end_headers()
+                self.wfile.write(raw_body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return _Handler
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from slam_eval.balancing import EndpointBalancer
+from slam_eval.hedging import HedgingPolicy
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.retry import RetryPolicy
+from tests.llm_stub_server import (
+    StubLlmServer,
+    apredict,
+    echo_responder,
+    make_model,
+    predict,
+)
+
+
+def failing_responder(payload):
+    return 502, {"error": {"message": "Bad gateway"}}
+
+
+class SlowResponder:
+    """Answers after a delay and tracks the requests in flight."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return echo_responder(payload)
+
+
+class TestEndpointBalancer:
+    def test_requests_are_spread_over_replicas(self):
+        with StubLlmServer() as first, StubLlmServer() as second:
+            balancer = EndpointBalancer([first.url, second.url])
+            model = make_model("unused", endpoint_balancer=balancer)
+            try:
+                results = [predict(model, f"q{i}") for i in range(10)]
+            finally:
+                model.close()
+
+        assert results == [f"q{i}" for i in range(10)]
+        assert len(first.requests) == 5
+        assert len(second.requests) == 5
+
+    def test_slow_replica_gets_fewer_requests(self):
+        slow_responder = SlowResponder(delay=0.2)
+        with StubLlmServer(slow_responder) as slow, StubLlmServer() as fast:
+            balancer = EndpointBalancer([slow.url, fast.url])
+            model = make_model("unused", endpoint_balancer=balancer)
+            try:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    results = list(
+                        executor.map(lambda i: predict(model, f"q{i}"), range(40))
+                    )
+            finally:
+                model.close()
+
+        assert results == [f"q{i}" for i in range(40)]
+        assert len(slow.requests) < len(fast.requests)
+        assert all(m["outstanding"] == 0 for m in balancer.metrics().values())
+
+    def test_failing_replica_is_ejected(self):
+        with StubLlmServer(failing_responder) as broken, StubLlmServer() as healthy:
+            balancer = EndpointBalancer(
+                [broken.url, healthy.url], failure_threshold=2, ejection_time=60.0
+            )
+            model = make_model(
+                "unused",
+                endpoint_balancer=balancer,
+                retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0.0),
+            )
+            try:
+                results = [predict(model, f"q{i}") for i in range(10)]
+            finally:
+                model.close()
+
+        assert results == [f"q{i}" for i in range(10)]
+        assert len(broken.requests) == 2
+        assert balancer.healthy_urls() == [healthy.url]
+        assert balancer.metrics()[broken.url]["num_ejections"] == 1
+
+    def test_ejected_replica_comes_back(self):
+        balancer = EndpointBalancer(
+            ["http://first", "http://second"], failure_threshold=1, ejection_time=0.05
+        )
+        error = httpx.ConnectError("Connection refused")
+
+        with pytest.raises(httpx.ConnectError):
+            with balancer.endpoint() as url:
+                raise error
+        assert balancer.healthy_urls() == ["http://second"]
+
+        time.sleep(0.1)
+        assert balancer.healthy_urls() == ["http://first", "http://second"]
+
+    def test_cancelled_hedge_losers_do_not_reset_failures(self):
+        balancer = EndpointBalancer(
+            ["http://broken", "http://healthy"], failure_threshold=2
+        )
+        policy = HedgingPolicy(percentile=50.0, max_hedge_rate=1.0, min_samples=1)
+        policy._observe(0.01)
+        num_broken_requests = 0
+
+        async def _request() -> str:
+            nonlocal num_broken_requests
+            with balancer.endpoint() as url:
+                if url == "http://broken":
+                    num_broken_requests += 1
+                    # Every second request to the broken replica is slow, so
+                    # the hedge sent to the healthy one wins and it is cancelled
+                    if num_broken_requests % 2 == 0:
+                        await asyncio.sleep(1.0)
+                    raise httpx.ConnectError("Connection refused")
+                return url
+
+        async def _request_all() -> None:
+            for _ in range(4):
+                try:
+                    await policy.acall(_request)
+                except httpx.ConnectError:
+                    pass
+
+        asyncio.run(_request_all())
+
+        assert num_broken_requests == 3
+        assert balancer.healthy_urls() == ["http://healthy"]
+
+    def test_all_ejected_replicas_still_get_requests(self):
+        balancer = EndpointBalancer(["http://only"], failure_threshold=1)
+
+        with pytest.raises(httpx.ConnectError):
+            with balancer.endpoint():
+                raise httpx.ConnectError("Connection refused")
+
+        assert balancer.healthy_urls() == []
+        with balancer.endpoint() as url:
+            assert url == "http://only"
+
+    def test_async_requests_are_spread_over_replicas(self):
+        first_responder = SlowResponder(delay=0.05)
+        second_responder = SlowResponder(delay=0.05)
+
+        async def _predict_all(model: LlmViaOpenAiApi) -> list[str]:
+            try:
+                return await asyncio.gather(
+                    *(apredict(model, f"q{i}") for i in range(8))
+                )
+            finally:
+                await model.aclose()
+
+        with (
+            StubLlmServer(first_responder) as first,
+            StubLlmServer(second_responder) as second,
+        ):
+            model = make_model(
+                "unused", endpoint_balancer=EndpointBalancer([first.url, second.url])
+            )
+            results = asyncio.run(_predict_all(model))
+
+        assert results == [f"q{i}" for i in range(8)]
+        assert len(first.requests) == 4
+        assert len(second.requests) == 4
+
+    def test_no_urls_raise(self):
+        with pytest.raises(ValueError, match="At least one endpoint URL"):
+            EndpointBalancer([])
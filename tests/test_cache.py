@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import threading
+from typing import Any
+
+from slam_eval.cache import CachedModel, SqliteResponseCache, make_cache_key
+from slam_eval.collections.text_generation import TextGenerationInput
+from slam_eval.model import Model
+
+
+class CountingModel(Model):
+    def __init__(self, name: str, max_output_tokens: int = 16) -> None:
+        super().__init__(name)
+        self.max_output_tokens = max_output_tokens
+        self.calls = 0
+
+    def cache_params(self) -> dict[str, Any]:
+        return {"model": "counting", "max_output_tokens": self.max_output_tokens}
+
+    def predict(self, x: TextGenerationInput) -> str:
+        self.calls += 1
+        return f"answer to {x['user_prompt']}"
+
+
+class ThreadRecordingCache(SqliteResponseCache):
+    """Records the threads the cache is accessed from."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.thread_ids: list[int] = []
+
+    def get(self, key: str) -> Any | None:
+        self.thread_ids.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.thread_ids.append(threading.get_ident())
+        super().set(key, value)
+
+
+def make_input(user_prompt: str) -> TextGenerationInput:
+    return TextGenerationInput(system_prompt=None, user_prompt=user_prompt)
+
+
+class TestSqliteResponseCache:
+    def test_get_returns_none_on_miss(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = SqliteResponseCache(os.path.join(temp_dir, "cache.sqlite"))
+            assert cache.get("missing") is None
+            cache.close()
+
+    def test_set_and_get_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.sqlite")
+            cache = SqliteResponseCache(path)
+            cache.set("key", "value")
+            cache.close()
+
+            reopened_cache = SqliteResponseCache(path)
+            assert reopened_cache.get("key") == "value"
+            reopened_cache.close()
+
+    def test_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Each value takes 12 bytes once serialized as JSON
+            cache = SqliteResponseCache(
+                os.path.join(temp_dir, "cache.sqlite"), max_size_bytes=30
+            )
+            cache.set("a", "0123456789")
+            cache.set("b", "0123456789")
+            cache.get("a")
+            cache.set("c", "0123456789")
+
+            assert cache.get("a") == "0123456789"
+            assert cache.get("b") is None
+            assert cache.get("c") == "0123456789"
+            cache.close()
+
+    def test_access_times_are_kept_across_instances(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.sqlite")
+            cache = SqliteResponseCache(path, max_size_bytes=30)
+            cache.set("a", "0123456789")
+            cache.set("b", "0123456789")
+            cache.get("a")
+            cache.close()
+
+            reopened_cache = SqliteResponseCache(path, max_size_bytes=30)
+            reopened_cache.set("c", "0123456789")
+
+            assert reopened_cache.get("a") == "0123456789"
+            assert reopened_cache.get("b") is None
+            reopened_cache.close()
+
+
+class TestCachedModel:
+    def test_second_predict_is_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inner_model = CountingModel("counting_model")
+            model = CachedModel(
+                inner_model, SqliteResponseCache(os.path.join(temp_dir, "c.sqlite"))
+            )
+
+            first = model.predict(make_input("question"))
+            second = model.predict(make_input("question"))
+            model.close()
+
+        assert first == second == "answer to question"
+        assert inner_model.calls == 1
+        assert model.name == "counting_model"
+
+    def test_async_predict_accesses_the_cache_off_the_event_loop(self):
+        async def _predict_twice(model: CachedModel) -> tuple[list[str], int]:
+            try:
+                answers = [
+                    await model.apredict(make_input("question")) for _ in range(2)
+                ]
+                return answers, threading.get_ident()
+            finally:
+                await model.aclose()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inner_model = CountingModel("counting_model")
+            cache = ThreadRecordingCache(os.path.join(temp_dir, "c.sqlite"))
+            model = CachedModel(inner_model, cache)
+
+            answers, loop_thread_id = asyncio.run(_predict_twice(model))
+
+        assert answers == ["answer to question"] * 2
+        assert inner_model.calls == 1
+        # A miss, its insert and a hit
+        assert len(cache.thread_ids) == 3
+        assert loop_thread_id not in cache.thread_ids
+
+    def test_cache_key_depends_on_model_params_and_input(self):
+        short_model = CountingModel("counting_model", max_output_tokens=16)
+        long_model = CountingModel("counting_model", max_output_tokens=1024)
+
+        key = make_cache_key(short_model, make_input("question"))
+
+        assert key == make_cache_key(short_model, make_input("question"))
+        assert key != make_cache_key(long_model, make_input("question"))
+        assert key != make_cache_key(short_model, make_input("other question"))
+        assert key != make_cache_key(
+            short_model,
+            TextGenerationInput(system_prompt="system", user_prompt="question"),
+        )
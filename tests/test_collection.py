@@ -1,7 +1,10 @@
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 
 from slam_eval.collections.base import CollectionNotLoadedError
+from slam_eval.collections.ifbench import IFBench
 from slam_eval.collections.text_generation import BigBenchHard
 
 
@@ -243,3 +246,80 @@ class TestBigBenchHard:
         
         assert result["x"]["user_prompt"] == "Please answer: solve this problem\nAnswer:"
         assert result["y_true"] == "solution"
+
+    @patch('slam_eval.collections.text_generation.datasets.load_dataset')
+    def test_getitem_and_slicing(self, mock_load_dataset):
+        mock_items = [
+            {"input": f"question {i}", "target": f"answer {i}"} for i in range(5)
+        ]
+        mock_dataset = Mock()
+        mock_dataset.__iter__ = Mock(return_value=iter(mock_items))
+        mock_dataset.__getitem__ = Mock(side_effect=lambda i: mock_items[i])
+        mock_dataset.num_rows = 5
+        mock_load_dataset.return_value = mock_dataset
+
+        collection = BigBenchHard(
+            name="test_collection",
+            dataset_name="test_dataset",
+            split="train",
+            subset="subset1",
+            user_prompt_template="Q: {original_input}"
+        )
+        collection.load()
+
+        assert collection[1]["y_true"] == "answer 1"
+        assert collection[-1]["y_true"] == "answer 4"
+        assert [case["y_true"] for case in collection[1:4]] == [
+            "answer 1", "answer 2", "answer 3"
+        ]
+        assert [case["y_true"] for case in collection[::2]] == [
+            "answer 0", "answer 2", "answer 4"
+        ]
+        assert [case["x"]["user_prompt"] for case in collection.iter_range(3, 10)] == [
+            "Q: question 3", "Q: question 4"
+        ]
+        with pytest.raises(IndexError):
+            collection[5]
+
+        # Random access does not consume the iterator
+        assert next(collection)["y_true"] == "answer 0"
+
+    def test_getitem_raises_error_when_not_loaded(self):
+        collection = BigBenchHard(
+            name="test_collection",
+            dataset_name="test_dataset",
+            split="train",
+            subset="subset1",
+            user_prompt_template="Question: {original_input}"
+        )
+
+        with pytest.raises(CollectionNotLoadedError, match="Collection test_collection not loaded"):
+            collection[0]
+
+
+class TestIFBench:
+    def test_getitem_matches_iteration(self, tmp_path):
+        jsonl_path = tmp_path / "ifbench.jsonl"
+        jsonl_path.write_text(
+            "\n".join(
+                json.dumps(
+                    {
+                        "prompt": f"prompt {i}",
+                        "instruction_id_list": [f"instruction:{i}"],
+                        "kwargs": [{}],
+                    }
+                )
+                for i in range(3)
+            )
+            + "\n\n",
+            encoding="utf-8",
+        )
+        collection = IFBench(
+            name="ifbench", jsonl_path=str(jsonl_path), download_url="unused"
+        )
+        collection.load()
+
+        assert len(collection) == 3
+        assert collection[0:3] == list(collection)
+        assert collection[2]["x"]["user_prompt"] == "prompt 2"
+        assert collection[2]["y_true"]["instruction_id_list"] == ["instruction:2"]
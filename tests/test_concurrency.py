@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from slam_eval.concurrency import AdaptiveConcurrencyLimiter
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.transport import HttpTransport
+from tests.llm_stub_server import StubLlmServer, echo_responder, make_model, predict
+
+
+class OverloadedResponder:
+    """Throttles requests beyond the capacity of the simulated server."""
+
+    def __init__(self, capacity: int, delay: float) -> None:
+        self.capacity = capacity
+        self.delay = delay
+        self.in_flight = 0
+        self.num_throttled = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.num_throttled += 1
+                return 429, {"error": {"message": "Too many requests"}}
+            self.in_flight += 1
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return echo_responder(payload)
+
+
+def make_limited_model(
+    url: str, limiter: AdaptiveConcurrencyLimiter
+) -> LlmViaOpenAiApi:
+    return make_model(
+        url,
+        transport=HttpTransport(max_connections=32, max_keepalive_connections=32),
+        concurrency_limiter=limiter,
+    )
+
+
+def predict_ignoring_errors(model: LlmViaOpenAiApi, i: int) -> str | None:
+    try:
+        return predict(model, f"q{i}")
+    except httpx.HTTPError:
+        return None
+
+
+def predict_concurrently(model: LlmViaOpenAiApi, n: int) -> list[str | None]:
+    with ThreadPoolExecutor(max_workers=model.max_concurrent_requests) as executor:
+        return list(executor.map(lambda i: predict_ignoring_errors(model, i), range(n)))
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_limit_grows_while_healthy(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=32)
+        with StubLlmServer() as server:
+            model = make_limited_model(server.url, limiter)
+            try:
+                results = predict_concurrently(model, 100)
+            finally:
+                model.close()
+
+        assert results == [f"q{i}" for i in range(100)]
+        assert limiter.limit > 2
+        assert limiter.latency is not None
+        assert limiter.metrics()["num_overloads"] == 0
+        assert limiter.in_flight == 0
+
+    def test_limit_is_cut_when_server_throttles(self):
+        responder = OverloadedResponder(capacity=3, delay=0.01)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, max_limit=32)
+        with StubLlmServer(responder) as server:
+            model = make_limited_model(server.url, limiter)
+            try:
+                predict_concurrently(model, 200)
+            finally:
+                model.close()
+
+        assert responder.num_throttled > 0
+        assert limiter.metrics()["num_overloads"] > 0
+        # The limit saws around the capacity instead of staying at 16
+        assert limiter.limit < 16
+
+    def test_other_errors_keep_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        with pytest.raises(KeyError):
+            with limiter.slot():
+                raise KeyError("malformed response")
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    def test_slow_responses_cut_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_threshold=0.01)
+
+        with limiter.slot():
+            time.sleep(0.02)
+
+        assert limiter.limit == 4
+
+    def test_async_slots_wait_for_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        max_in_flight = 0
+
+        async def _request() -> None:
+            nonlocal max_in_flight
+            async with limiter.aslot():
+                max_in_flight = max(max_in_flight, limiter.in_flight)
+                await asyncio.sleep(0.001)
+
+        async def _run() -> None:
+            await asyncio.gather(*(_request() for _ in range(20)))
+
+        asyncio.run(_run())
+
+        assert max_in_flight == 2
+        assert limiter.in_flight == 0
+
+    def test_invalid_limits_raise(self):
+        with pytest.raises(ValueError, match="Limits must satisfy"):
+            AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=4)
@@ -65,3 +65,27 @@ class TestEmbeddingBasedTextClassifier:
 
         with pytest.raises(TypeError):
             classifier.predict("sample")
+
+    def test_predict_batch_runs_one_vectorized_call(self):
+        fake_embeddings = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])
+        labels = ["class_a", "class_b", "class_c"]
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.predict.return_value = fake_embeddings
+
+        mock_classifier = Mock()
+        mock_classifier.labels = labels
+        mock_classifier.model_path = "dummy_path"
+        mock_classifier.predict.return_value = np.array([2, 0, 1])
+
+        classifier = EmbeddingBasedTextClassifier(
+            name="test_classifier",
+            embedding_model=mock_embedding_model,
+            classifier=mock_classifier,
+        )
+
+        predicted_labels = classifier.predict_batch(["s1", "s2", "s3"])
+
+        assert predicted_labels == ["class_c", "class_a", "class_b"]
+        mock_embedding_model.predict.assert_called_once_with(["s1", "s2", "s3"])
+        mock_classifier.predict.assert_called_once_with(fake_embeddings)
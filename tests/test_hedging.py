@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slam_eval.concurrency import AdaptiveConcurrencyLimiter
+from slam_eval.hedging import HedgingPolicy
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.rate_limit import RateLimiter
+from tests.llm_stub_server import (
+    StubLlmServer,
+    apredict,
+    echo_responder,
+    make_model,
+    predict,
+)
+
+
+class StragglerResponder:
+    """Answers the first request of the straggler prompt after a long delay."""
+
+    def __init__(self, straggler_prompt: str, delay: float) -> None:
+        self.straggler_prompt = straggler_prompt
+        self.delay = delay
+        self._stalled = False
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self._lock:
+            stall = (
+                payload["messages"][-1]["content"] == self.straggler_prompt
+                and not self._stalled
+            )
+            self._stalled = self._stalled or stall
+        if stall:
+            time.sleep(self.delay)
+        return echo_responder(payload)
+
+
+class CountingRateLimiter(RateLimiter):
+    def __init__(self) -> None:
+        super().__init__(requests_per_minute=6000)
+        self.num_acquires = 0
+
+    def acquire(self, num_tokens: int) -> None:
+        self.num_acquires += 1
+        super().acquire(num_tokens)
+
+
+class TestHedgingPolicy:
+    def test_slow_request_is_hedged(self):
+        policy = HedgingPolicy(percentile=90.0, max_hedge_rate=0.5, min_samples=5)
+        responder = StragglerResponder("straggler", delay=2.0)
+        with StubLlmServer(responder) as server:
+            model = make_model(server.url, hedging_policy=policy)
+            try:
+                for i in range(10):
+                    predict(model, f"q{i}")
+                start_time = time.monotonic()
+                result = predict(model, "straggler")
+                elapsed = time.monotonic() - start_time
+            finally:
+                model.close()
+
+        assert result == "straggler"
+        assert elapsed < 1.0
+        # Jitter may get a fast request hedged too
+        assert policy.num_hedges >= 1
+
+    def test_async_slow_request_is_hedged(self):
+        policy = HedgingPolicy(percentile=90.0, max_hedge_rate=0.5, min_samples=5)
+        responder = StragglerResponder("straggler", delay=2.0)
+
+        async def _predict_all(model: LlmViaOpenAiApi) -> tuple[str, float]:
+            try:
+                for i in range(10):
+                    await apredict(model, f"q{i}")
+                start_time = time.monotonic()
+                result = await apredict(model, "straggler")
+                return result, time.monotonic() - start_time
+            finally:
+                await model.aclose()
+
+        with StubLlmServer(responder) as server:
+            model = make_model(server.url, hedging_policy=policy)
+            result, elapsed = asyncio.run(_predict_all(model))
+
+        assert result == "straggler"
+        assert elapsed < 1.0
+        assert policy.num_hedges >= 1
+
+    def test_hedges_take_quota_and_a_slot(self):
+        policy = HedgingPolicy(percentile=90.0, max_hedge_rate=0.5, min_samples=5)
+        rate_limiter = CountingRateLimiter()
+        concurrency_limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        responder = StragglerResponder("straggler", delay=1.0)
+        with StubLlmServer(responder) as server:
+            model = make_model(
+                server.url,
+                hedging_policy=policy,
+                rate_limiter=rate_limiter,
+                concurrency_limiter=concurrency_limiter,
+            )
+            try:
+                for i in range(10):
+                    predict(model, f"q{i}")
+                predict(model, "straggler")
+                # The losing request keeps its slot until it is answered
+                assert concurrency_limiter.in_flight == 1
+                time.sleep(1.5)
+                assert concurrency_limiter.in_flight == 0
+            finally:
+                model.close()
+
+        assert policy.num_hedges >= 1
+        assert rate_limiter.num_acquires == 11 + policy.num_hedges
+
+    def test_hedge_rate_is_capped(self):
+        policy = HedgingPolicy(percentile=50.0, max_hedge_rate=0.1, min_samples=1)
+        policy._observe(0.0)
+
+        def _slow_call() -> str:
+            time.sleep(0.01)
+            return "answer"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(30):
+                assert policy.call(_slow_call, executor) == "answer"
+
+        assert policy.num_hedges <= 3
+
+    def test_no_hedging_before_min_samples(self):
+        policy = HedgingPolicy(min_samples=3)
+        policy._observe(0.1)
+        policy._observe(0.2)
+
+        assert policy.hedge_delay() is None
+        policy._observe(0.3)
+        assert policy.hedge_delay() == pytest.approx(0.3)
+
+    def test_invalid_percentile_raises(self):
+        with pytest.raises(ValueError, match="Percentile must be in"):
+            HedgingPolicy(percentile=100.0)
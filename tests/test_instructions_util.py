@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import nltk
+import pytest
+
+from slam_eval.ifbench.third_party import instructions_util
+
+STOPWORDS = ["a", "the", "is", "of", "and"]
+TEXTS = [
+    "",
+    "The cat is on the mat.",
+    "Tokens_with_underscores and 42 numbers, of course!",
+    "THE end Of A story\nand the next line",
+]
+
+
+@pytest.fixture
+def english_stopwords(monkeypatch):
+    corpus = SimpleNamespace(stopwords=SimpleNamespace(words=lambda lang: STOPWORDS))
+    monkeypatch.setattr(instructions_util.nltk, "corpus", corpus)
+    monkeypatch.setattr(
+        instructions_util, "_available_resources", set(instructions_util.NLTK_RESOURCES)
+    )
+    instructions_util.get_stopwords.cache_clear()
+    yield
+    instructions_util.get_stopwords.cache_clear()
+
+
+class TestWordCounting:
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_count_words_matches_regexp_tokenizer(self, text):
+        tokens = nltk.tokenize.RegexpTokenizer(r"\w+").tokenize(text)
+
+        assert instructions_util.count_words(text) == len(tokens)
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_count_stopwords_matches_list_lookup(self, text, english_stopwords):
+        tokens = nltk.tokenize.RegexpTokenizer(r"\w+").tokenize(text)
+        expected = len([t for t in tokens if t.lower() in STOPWORDS])
+
+        assert instructions_util.count_stopwords(text) == expected
+
+    def test_stopwords_are_loaded_once(self, english_stopwords):
+        assert instructions_util.get_stopwords() is instructions_util.get_stopwords()
+        assert instructions_util.get_stopwords() == frozenset(STOPWORDS)
+
+
+@pytest.fixture
+def missing_nltk_data(monkeypatch):
+    def _find(resource_name):
+        raise LookupError(resource_name)
+
+    downloads = []
+
+    def _download(name, quiet=False):
+        downloads.append(name)
+        return True
+
+    monkeypatch.setattr(instructions_util, "_available_resources", set())
+    monkeypatch.setattr(instructions_util.nltk.data, "find", _find)
+    monkeypatch.setattr(instructions_util.nltk, "download", _download)
+    return downloads
+
+
+class TestNltkResources:
+    def test_missing_resource_is_downloaded_once(self, missing_nltk_data, monkeypatch):
+        monkeypatch.delenv(instructions_util.NLTK_OFFLINE_ENV_VAR, raising=False)
+
+        instructions_util.ensure_nltk_resources("stopwords")
+        instructions_util.ensure_nltk_resources("stopwords")
+
+        assert missing_nltk_data == ["stopwords"]
+
+    def test_offline_mode_fails_fast(self, missing_nltk_data, monkeypatch):
+        monkeypatch.setenv(instructions_util.NLTK_OFFLINE_ENV_VAR, "1")
+
+        with pytest.raises(LookupError, match="punkt"):
+            instructions_util.split_into_sentences("One. Two.")
+        assert missing_nltk_data == []
+
+    def test_regex_word_counting_needs_no_resources(self, missing_nltk_data):
+        assert instructions_util.count_words("no data needed") == 3
+        assert missing_nltk_data == []
@@ -7,6 +7,8 @@ import hydra
 from freezegun import freeze_time
 
 from slam_eval.scripts.main import main
+from slam_eval.checkpoint import RunCheckpoint
+from slam_eval.runner import CaseResult
 from slam_eval.model import Model
 from slam_eval.collections.base import EvalCaseCollection, EvalCase, CollectionInfo
 from slam_eval.collections.text_generation import TextGenerationInput
@@ -38,8 +40,11 @@ class SimpleEvalCaseCollection(EvalCaseCollection):
         if self.i >= len(self.collection_data):
             raise StopIteration
         
-        res = self.collection_data[self.i]
         self.i += 1
+        return self._get_case(self.i - 1)
+
+    def _get_case(self, index: int) -> EvalCase:
+        res = self.collection_data[index]
         return {
             "x": TextGenerationInput(
                 system_prompt=None,
@@ -112,7 +117,8 @@ def test_main(
     cfg: DictConfig,
     eval_case_collection_cfg,
     storage_adapter_cfg,
-    monkeypatch
+    monkeypatch,
+    tmp_path
 ):
     # Mock requests to LLMs
     monkeypatch.setattr(
@@ -123,12 +129,18 @@ def test_main(
         }
     )
 
+    # Route requests through the mocked function instead of the pooled transport
+    cfg.model.transport = None
+
     # Mock eval case collection
     cfg.collection = eval_case_collection_cfg
 
     # Mock storage adapter
     cfg.storage_adapter = storage_adapter_cfg
 
+    # Keep checkpoints out of the configured hydra root
+    cfg.checkpoint_dir = str(tmp_path)
+
     # Run the function being tested
     main(cfg)   
 
@@ -149,6 +161,112 @@ def test_main(
             "model": cfg.model.name,
             "eval_case_collection": cfg.collection.name,
             "scores": [1, 0, 0],
-            "model_answers": ["Test answer 1"] * 3
+            "model_answers": ["Test answer 1"] * 3,
+            "num_retries": [0, 0, 0],
+            "model_metrics": {
+                "concurrency_limiter": {
+                    "concurrency_limit": 16,
+                    "in_flight": 0,
+                    "latency": 0.0,
+                    "num_overloads": 0,
+                }
+            }
         }
     ]
+
+
+@freeze_time("2000-01-01")
+def test_main_resume_skips_checkpointed_cases(
+    cfg: DictConfig,
+    eval_case_collection_cfg,
+    storage_adapter_cfg,
+    monkeypatch,
+    tmp_path
+):
+    requested_prompts = []
+
+    def _request(*args, **kwargs):
+        requested_prompts.append(kwargs["message_history"][-1]["content"])
+        return {"role": "assistant", "content": "Test answer 1"}
+
+    monkeypatch.setattr("slam_eval.model.request_based_on_message_history", _request)
+    cfg.model.transport = None
+    cfg.collection = eval_case_collection_cfg
+    cfg.storage_adapter = storage_adapter_cfg
+    cfg.checkpoint_dir = str(tmp_path)
+    cfg.run_id = "interrupted_run"
+    cfg.resume = True
+
+    # Simulate a run that crashed after finishing the second test case
+    checkpoint = RunCheckpoint(tmp_path, "interrupted_run")
+    checkpoint.append(CaseResult(index=1, model_answer="Test answer 2", score=1))
+
+    main(cfg)
+
+    global DICT_STORAGE
+    assert requested_prompts == ["Test question 1", "Test question 3"]
+    assert DICT_STORAGE[0]["scores"] == [1, 1, 0]
+    assert DICT_STORAGE[0]["model_answers"] == [
+        "Test answer 1", "Test answer 2", "Test answer 1"
+    ]
+    assert not checkpoint.path.exists()
+
+
+@freeze_time("2000-01-01")
+def test_main_resume_into_missing_checkpoint_dir(
+    cfg: DictConfig,
+    eval_case_collection_cfg,
+    storage_adapter_cfg,
+    monkeypatch,
+    tmp_path
+):
+    monkeypatch.setattr(
+        "slam_eval.model.request_based_on_message_history",
+        lambda *args, **kwargs: {"role": "assistant", "content": "Test answer 1"}
+    )
+    cfg.model.transport = None
+    cfg.collection = eval_case_collection_cfg
+    cfg.storage_adapter = storage_adapter_cfg
+    cfg.checkpoint_dir = str(tmp_path / "not" / "created" / "yet")
+    cfg.run_id = "first_run"
+    cfg.resume = True
+
+    main(cfg)
+
+    global DICT_STORAGE
+    assert DICT_STORAGE[0]["scores"] == [1, 0, 0]
+    assert not (tmp_path / "not" / "created" / "yet" / "first_run.jsonl").exists()
+
+
+@freeze_time("2000-01-01")
+def test_main_with_extra_scorers(
+    cfg: DictConfig,
+    eval_case_collection_cfg,
+    storage_adapter_cfg,
+    monkeypatch,
+    tmp_path
+):
+    monkeypatch.setattr(
+        "slam_eval.model.request_based_on_message_history",
+        lambda *args, **kwargs: {"role": "assistant", "content": "Test answer  1"}
+    )
+    cfg.model.transport = None
+    cfg.collection = eval_case_collection_cfg
+    cfg.storage_adapter = storage_adapter_cfg
+    cfg.checkpoint_dir = str(tmp_path)
+    cfg.scorer = {"_target_": "slam_eval.scorer.ExactMatch", "name": "exact_match"}
+    cfg.extra_scorers = {
+        "ignore_all_whitespaces": {
+            "_target_": "slam_eval.scorer.IgnoreAllWhitespaces",
+            "name": "ignore_all_whitespaces",
+        }
+    }
+
+    main(cfg)
+
+    global DICT_STORAGE
+    assert DICT_STORAGE[0]["scores"] == [0, 0, 0]
+    assert DICT_STORAGE[0]["scores_by_scorer"] == {
+        "exact_match": [0, 0, 0],
+        "ignore_all_whitespaces": [1, 0, 0],
+    }
@@ -0,0 +1,79 @@
+import hydra
+import pytest
+from freezegun import freeze_time
+
+from slam_eval.scripts import main as main_script
+from slam_eval.scripts import merge_shards as merge_shards_script
+from tests.test_main import DICT_STORAGE
+
+
+@pytest.fixture
+def cfg(tmp_path, monkeypatch):
+    def _request(*args, **kwargs):
+        question = kwargs["message_history"][-1]["content"]
+        answer = "Wrong answer" if question.endswith("2") else question.replace(
+            "question", "answer"
+        )
+        return {"role": "assistant", "content": answer}
+
+    monkeypatch.setattr("slam_eval.model.request_based_on_message_history", _request)
+
+    with hydra.initialize(
+        version_base="1.3",
+        config_path="../config",
+        job_name="test_app"
+    ):
+        default_cfg = hydra.compose(config_name="config_main")
+
+    default_cfg.model.transport = None
+    default_cfg.collection = {
+        "_target_": "tests.test_main.SimpleEvalCaseCollection",
+        "name": "simple_eval_case_collection",
+    }
+    default_cfg.storage_adapter = {"_target_": "tests.test_main.SimpleEvalStorageAdapter"}
+    default_cfg.checkpoint_dir = str(tmp_path)
+    return default_cfg
+
+
+@pytest.fixture(autouse=True)
+def reset_dict_storage():
+    DICT_STORAGE.clear()
+    yield
+    DICT_STORAGE.clear()
+
+
+@freeze_time("2000-01-01")
+def test_merged_shards_match_single_process_run(cfg, tmp_path):
+    main_script.main(cfg)
+    single_process_results = list(DICT_STORAGE)
+    DICT_STORAGE.clear()
+
+    cfg.num_shards = 2
+    for shard_index in range(cfg.num_shards):
+        cfg.shard_index = shard_index
+        main_script.main(cfg)
+    # Shards only write partial results until they are merged
+    assert DICT_STORAGE == []
+    assert len(list(tmp_path.glob("*_shard_*_of_2.jsonl"))) == 2
+
+    merge_shards_script.main(cfg)
+
+    assert single_process_results[0]["scores"] == [1, 0, 1]
+    # Every shard process has a model of its own
+    model_metrics = single_process_results[0].pop("model_metrics")
+    assert "concurrency_limiter" in model_metrics
+    assert DICT_STORAGE[0].pop("model_metrics") == [model_metrics] * 2
+    assert DICT_STORAGE == single_process_results
+    assert list(tmp_path.glob("*.jsonl")) == []
+
+
+def test_merge_fails_when_a_shard_is_missing(cfg, tmp_path):
+    cfg.num_shards = 2
+    cfg.shard_index = 1
+    main_script.main(cfg)
+
+    with pytest.raises(ValueError, match="1 out of 3 test cases are missing"):
+        merge_shards_script.main(cfg)
+
+    assert DICT_STORAGE == []
+    assert len(list(tmp_path.glob("*_shard_1_of_2.jsonl"))) == 1
@@ -1,9 +1,13 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch
 
 from rally.llm import Llm
 from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.transport import HttpTransport
 from slam_eval.collections.text_generation import TextGenerationInput
+from tests.llm_stub_server import StubLlmServer, make_mock_llm
 
 
 class TestLlmViaOpenAiApi:
@@ -156,3 +160,82 @@ class TestLlmViaOpenAiApi:
         assert len(message_history) == 1
         assert message_history[0]["role"] == "user"
         assert message_history[0]["content"] == "Hello, world!"
+
+
+class TestLlmViaOpenAiApiAsync:
+    def test_apredict_returns_content(self):
+        with StubLlmServer() as server:
+            model = LlmViaOpenAiApi("test_model", make_mock_llm(server.url))
+
+            async def _predict() -> str:
+                try:
+                    return await model.apredict(
+                        TextGenerationInput(
+                            system_prompt="You are a helpful assistant",
+                            user_prompt="What is 2+2?",
+                        )
+                    )
+                finally:
+                    await model.aclose()
+
+            result = asyncio.run(_predict())
+
+        assert result == "What is 2+2?"
+        request = server.requests[0]
+        assert request["payload"] == {
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant"},
+                {"role": "user", "content": "What is 2+2?"},
+            ],
+            "model": "test-model",
+            "max_tokens": 1000,
+        }
+        assert request["headers"]["Authorization"] == "Bearer test-token"
+
+    def test_apredict_reuses_pooled_connections(self):
+        with StubLlmServer() as server:
+            model = LlmViaOpenAiApi(
+                "test_model", make_mock_llm(server.url, max_concurrent_requests=4)
+            )
+
+            async def _predict_many() -> list[str]:
+                try:
+                    return await asyncio.gather(
+                        *(
+                            model.apredict(
+                                TextGenerationInput(
+                                    system_prompt=None, user_prompt=f"prompt {i}"
+                                )
+                            )
+                            for i in range(40)
+                        )
+                    )
+                finally:
+                    await model.aclose()
+
+            results = asyncio.run(_predict_many())
+
+        assert results == [f"prompt {i}" for i in range(40)]
+        assert len(server.requests) == 40
+        assert len(server.client_addresses) <= 4
+
+
+class TestLlmViaOpenAiApiWithTransport:
+    def test_predict_uses_transport(self):
+        with StubLlmServer() as server:
+            transport = HttpTransport(max_connections=1, max_keepalive_connections=1)
+            model = LlmViaOpenAiApi(
+                "test_model", make_mock_llm(server.url), transport=transport
+            )
+            try:
+                results = [
+                    model.predict(
+                        TextGenerationInput(system_prompt=None, user_prompt=f"q{i}")
+                    )
+                    for i in range(5)
+                ]
+            finally:
+                model.close()
+
+        assert results == [f"q{i}" for i in range(5)]
+        assert len(server.client_addresses) == 1
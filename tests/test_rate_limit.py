@@ -0,0 +1,120 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.rate_limit import RateLimiter, TokenBucket
+from tests.llm_stub_server import (
+    StubLlmServer,
+    apredict,
+    echo_responder,
+    make_mock_llm,
+    make_model,
+    predict,
+)
+
+
+def responder_with_usage(payload):
+    status, body = echo_responder(payload)
+    return status, {**body, "usage": {"total_tokens": 10}}
+
+
+class TestTokenBucket:
+    def test_reservations_beyond_capacity_are_delayed(self):
+        bucket = TokenBucket(rate_per_minute=600, burst_seconds=1.0)
+
+        assert bucket.reserve(10, now=bucket._updated_at) == 0.0
+        assert bucket.reserve(5, now=bucket._updated_at) == pytest.approx(0.5)
+        # Refilled by 10 per second
+        assert bucket.reserve(0, now=bucket._updated_at + 1.0) == 0.0
+
+    def test_give_back_returns_over_reserved_amount(self):
+        bucket = TokenBucket(rate_per_minute=600, burst_seconds=1.0)
+        now = bucket._updated_at
+
+        assert bucket.reserve(10, now=now) == 0.0
+        bucket.give_back(4, now=now)
+        assert bucket.reserve(4, now=now) == 0.0
+        assert bucket.reserve(1, now=now) == pytest.approx(0.1)
+        # Taking more than reserved is a negative give-back
+        bucket.give_back(-1, now=now)
+        assert bucket.reserve(0, now=now) == pytest.approx(0.2)
+
+    def test_invalid_rate_raises(self):
+        with pytest.raises(ValueError, match="Rate must be positive"):
+            TokenBucket(rate_per_minute=0)
+
+
+class TestRateLimiter:
+    def test_requests_are_paced_by_requests_per_minute(self):
+        rate_limiter = RateLimiter(requests_per_minute=1200, burst_seconds=0.1)
+        with StubLlmServer() as server:
+            model = make_model(server.url, rate_limiter=rate_limiter)
+            start_time = time.monotonic()
+            try:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    results = list(
+                        executor.map(lambda i: predict(model, f"q{i}"), range(12))
+                    )
+            finally:
+                model.close()
+            elapsed = time.monotonic() - start_time
+
+        assert results == [f"q{i}" for i in range(12)]
+        # 2 requests fit the burst, the other 10 go at 20 requests per second
+        assert elapsed >= 0.45
+
+    def test_async_requests_are_paced_by_tokens_per_minute(self):
+        rate_limiter = RateLimiter(
+            tokens_per_minute=60_000, burst_seconds=0.1, chars_per_token=1.0
+        )
+        llm = make_mock_llm("unused")
+        llm.max_output_tokens = 98
+
+        async def _predict_all(model: LlmViaOpenAiApi) -> list[str]:
+            try:
+                return await asyncio.gather(
+                    *(apredict(model, f"q{i}") for i in range(6))
+                )
+            finally:
+                await model.aclose()
+
+        with StubLlmServer() as server:
+            llm.url = server.url
+            model = LlmViaOpenAiApi("test_model", llm, rate_limiter=rate_limiter)
+            start_time = time.monotonic()
+            results = asyncio.run(_predict_all(model))
+            elapsed = time.monotonic() - start_time
+
+        assert results == [f"q{i}" for i in range(6)]
+        # Every request is estimated at 100 tokens, 1000 tokens per second
+        assert elapsed >= 0.45
+
+    def test_reported_usage_corrects_the_estimate(self, monkeypatch):
+        # 1000 tokens of capacity refilled by 0.1 token per second, so that the
+        # refill during the request does not blur the correction
+        rate_limiter = RateLimiter(tokens_per_minute=6, burst_seconds=10_000.0)
+        with StubLlmServer(responder_with_usage) as server:
+            model = make_model(server.url, rate_limiter=rate_limiter)
+            try:
+                predict(model, "q")
+            finally:
+                model.close()
+        delays: list[float] = []
+        monkeypatch.setattr("slam_eval.rate_limit.time.sleep", delays.append)
+
+        # The estimate of 1000 completion tokens is given back but for 10 tokens
+        rate_limiter.acquire(989)
+        assert delays == []
+        rate_limiter.acquire(2)
+        assert len(delays) == 1
+        assert 5.0 < delays[0] <= 10.0
+
+    def test_estimate_tokens(self):
+        rate_limiter = RateLimiter(chars_per_token=4.0, default_completion_tokens=50)
+        messages = [{"role": "user", "content": "x" * 40}]
+
+        assert rate_limiter.estimate_tokens(messages, max_output_tokens=None) == 60
+        assert rate_limiter.estimate_tokens(messages, max_output_tokens=10) == 20
@@ -0,0 +1,65 @@
+import os
+from unittest.mock import Mock
+
+import hydra
+import pytest
+
+from slam_eval.model import Model
+from slam_eval.scripts.rescore import main
+from slam_eval.storage_adapter import LocalJsonlAdapter
+
+
+@pytest.fixture
+def cfg():
+    with hydra.initialize(
+        version_base="1.3",
+        config_path="../config",
+        job_name="test_app"
+    ):
+        default_cfg = hydra.compose(config_name="config_rescore")
+
+    return default_cfg
+
+
+def _save_run(adapter, collection_name, model_answers):
+    mock_model = Mock(spec=Model)
+    mock_model.name = "test_model"
+    mock_collection = Mock()
+    mock_collection.name = collection_name
+    adapter.save(
+        group_id="test_group",
+        model=mock_model,
+        eval_case_collection=mock_collection,
+        scores=[0] * len(model_answers),
+        model_answers=model_answers,
+    )
+
+
+def test_rescore_adds_scores_of_every_scorer(cfg, tmp_path):
+    path_to_jsonl = os.path.join(tmp_path, "results.jsonl")
+    adapter = LocalJsonlAdapter(path_to_jsonl)
+    _save_run(
+        adapter,
+        "simple_eval_case_collection",
+        ["Test answer 1", "Test  answer  2", "wrong"],
+    )
+    _save_run(adapter, "other_collection", ["Test answer 1"])
+
+    cfg.collection = {
+        "_target_": "tests.test_main.SimpleEvalCaseCollection",
+        "name": "simple_eval_case_collection",
+    }
+    cfg.storage_adapter = {
+        "_target_": "slam_eval.storage_adapter.LocalJsonlAdapter",
+        "path_to_jsonl": path_to_jsonl,
+    }
+
+    main(cfg)
+
+    results = adapter.load(r".*")
+    assert results[0]["scores"] == [0, 0, 0]
+    assert results[0]["scores_by_scorer"] == {
+        "exact_match": [1, 0, 0],
+        "ignore_all_whitespaces": [1, 1, 0],
+    }
+    assert "scores_by_scorer" not in results[1]
@@ -0,0 +1,269 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from slam_eval.checkpoint import RunCheckpoint
+from slam_eval.collections.text_generation import TextGenerationInput
+from slam_eval.model import LlmViaOpenAiApi
+from slam_eval.retry import CircuitBreaker, RetryPolicy, track_retries
+from slam_eval.runner import CaseResult, run
+from slam_eval.scorer import ExactMatch
+from slam_eval.transport import is_overload_error, is_retriable_error
+from tests.llm_stub_server import (
+    StubLlmServer,
+    apredict,
+    echo_responder,
+    make_mock_llm,
+    make_model,
+    predict,
+)
+
+
+class FlakyResponder:
+    """Fails the first attempts of every prompt with the given status."""
+
+    def __init__(self, num_failures: int, status: int = 502) -> None:
+        self.num_failures = num_failures
+        self.status = status
+        self.attempts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        prompt = payload["messages"][-1]["content"]
+        with self._lock:
+            self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+            if self.attempts[prompt] <= self.num_failures:
+                return self.status, {"error": {"message": "Bad gateway"}}
+        return echo_responder(payload)
+
+
+def fast_retry_policy(max_attempts: int = 5) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max_attempts, initial_backoff=0.001)
+
+
+class TestRetryPolicy:
+    def test_transient_errors_are_retried(self):
+        with StubLlmServer(FlakyResponder(num_failures=2)) as server:
+            model = make_model(server.url, retry_policy=fast_retry_policy())
+            try:
+                with track_retries() as retry_counts:
+                    result = predict(model, "q")
+            finally:
+                model.close()
+
+        assert result == "q"
+        assert retry_counts == [2]
+
+    def test_error_is_raised_once_attempts_are_exhausted(self):
+        with StubLlmServer(FlakyResponder(num_failures=10)) as server:
+            model = make_model(server.url, retry_policy=fast_retry_policy(3))
+            try:
+                with pytest.raises(httpx.HTTPStatusError):
+                    predict(model, "q")
+            finally:
+                model.close()
+
+        assert len(server.requests) == 3
+
+    def test_client_errors_are_not_retried(self):
+        with StubLlmServer(FlakyResponder(num_failures=1, status=400)) as server:
+            model = make_model(server.url, retry_policy=fast_retry_policy())
+            try:
+                with pytest.raises(httpx.HTTPStatusError):
+                    predict(model, "q")
+            finally:
+                model.close()
+
+        assert len(server.requests) == 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(initial_backoff=1.0, max_backoff=5.0)
+
+        delays = [policy.backoff(10) for _ in range(100)]
+
+        assert all(0.0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_async_retries_are_counted(self):
+        with StubLlmServer(FlakyResponder(num_failures=1)) as server:
+            model = make_model(server.url, retry_policy=fast_retry_policy())
+
+            async def _predict() -> tuple[str, list[int]]:
+                try:
+                    with track_retries() as retry_counts:
+                        result = await apredict(model, "q")
+                    return result, retry_counts
+                finally:
+                    await model.aclose()
+
+            result, retry_counts = asyncio.run(_predict())
+
+        assert result == "q"
+        assert retry_counts == [1]
+
+
+class TestCircuitBreaker:
+    def test_circuit_opens_and_pauses_requests(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+        error = httpx.ConnectError("connection refused")
+
+        breaker.record(error)
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record(error)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        start_time = time.monotonic()
+        breaker.wait()
+        assert time.monotonic() - start_time >= 0.15
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        breaker.record()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_opens_the_circuit_again(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record(httpx.ConnectError("connection refused"))
+        is_probe = breaker.wait()
+
+        breaker.record(httpx.ConnectError("connection refused"), is_probe)
+
+        assert is_probe
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_only_the_probe_lets_the_next_probe_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        error = httpx.ConnectError("connection refused")
+        breaker.record(error)
+        time.sleep(0.02)
+        assert breaker.wait()
+
+        # A request sent before the circuit opened fails while the probe is out
+        breaker.record(error)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker._try_enter() == (CircuitBreaker._PROBE_POLL_INTERVAL, False)
+        breaker.record(is_probe=True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_cancelled_probe_lets_the_next_probe_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record(httpx.ConnectError("connection refused"))
+        time.sleep(0.02)
+        num_requests = 0
+
+        def _respond(payload):
+            nonlocal num_requests
+            num_requests += 1
+            if num_requests == 1:
+                time.sleep(1.0)
+            return echo_responder(payload)
+
+        async def _predict_after_cancelled_probe(model: LlmViaOpenAiApi) -> str:
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(apredict(model, "probe"), timeout=0.1)
+                return await asyncio.wait_for(apredict(model, "q"), timeout=0.5)
+            finally:
+                await model.aclose()
+
+        with StubLlmServer(_respond) as server:
+            model = make_model(server.url, circuit_breaker=breaker)
+            result = asyncio.run(_predict_after_cancelled_probe(model))
+
+        assert result == "q"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_non_retriable_errors_do_not_open_the_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+
+        breaker.record(KeyError("choices"))
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestErrorsOfRequests:
+    """Models without a transport send requests with rally, i.e. requests."""
+
+    @staticmethod
+    def _http_error(status_code: int) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status_code
+        return requests.HTTPError(f"{status_code} error", response=response)
+
+    def test_errors_are_classified(self):
+        assert is_retriable_error(self._http_error(502))
+        assert is_overload_error(self._http_error(429))
+        assert not is_retriable_error(self._http_error(400))
+        assert is_overload_error(requests.ReadTimeout("read timed out"))
+        assert is_retriable_error(requests.ConnectionError("connection reset"))
+        assert not is_overload_error(requests.ConnectionError("connection reset"))
+
+    def test_rally_requests_are_retried(self, monkeypatch):
+        attempts = []
+
+        def _request(**kwargs):
+            attempts.append(kwargs["message_history"])
+            if len(attempts) == 1:
+                raise self._http_error(502)
+            return {"role": "assistant", "content": "answer"}
+
+        monkeypatch.setattr(
+            "slam_eval.model.request_based_on_message_history", _request
+        )
+        model = LlmViaOpenAiApi(
+            "test_model",
+            make_mock_llm("unused"),
+            retry_policy=fast_retry_policy(),
+            circuit_breaker=CircuitBreaker(failure_threshold=1),
+        )
+
+        with track_retries() as retry_counts:
+            result = predict(model, "q")
+
+        assert result == "answer"
+        assert retry_counts == [1]
+        assert len(attempts) == 2
+
+
+class TestRetryCountsInResults:
+    @pytest.mark.parametrize("execution_mode", ["sequential", "concurrent", "async"])
+    def test_run_records_retries_per_case(self, execution_mode, tmp_path):
+        cases = [
+            {
+                "x": TextGenerationInput(system_prompt=None, user_prompt=f"q{i}"),
+                "y_true": f"q{i}",
+            }
+            for i in range(4)
+        ]
+        checkpoint = RunCheckpoint(tmp_path, "run")
+        results = []
+
+        def _on_case_done(result: CaseResult) -> None:
+            results.append(result)
+            checkpoint.append(result)
+
+        with StubLlmServer(FlakyResponder(num_failures=1)) as server:
+            model = make_model(
+                server.url,
+                retry_policy=fast_retry_policy(),
+                circuit_breaker=CircuitBreaker(failure_threshold=100),
+            )
+            _, scores = run(
+                model=model,
+                scorer=ExactMatch("exact_match"),
+                eval_cases=iter(cases),
+                collection_length=len(cases),
+                execution_mode=execution_mode,
+                max_workers=2,
+                on_case_done=_on_case_done,
+            )
+
+        assert scores == [1, 1, 1, 1]
+        assert [result.num_retries for result in results] == [1, 1, 1, 1]
+        assert {
+            result.index: result.num_retries for result in checkpoint.load().values()
+        } == {i: 1 for i in range(4)}
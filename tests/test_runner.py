@@ -0,0 +1,178 @@
+import random
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from slam_eval.model import Model
+from slam_eval.runner import CaseResult, run
+from slam_eval.scorer import ExactMatch, IgnoreAllWhitespaces
+
+
+class SlowEchoModel(Model):
+    def __init__(self, name: str, max_concurrent_requests: int) -> None:
+        super().__init__(name)
+        self._max_concurrent_requests = max_concurrent_requests
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return self._max_concurrent_requests
+
+    def predict(self, x: str) -> str:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(random.uniform(0.0, 0.01))
+        with self._lock:
+            self.in_flight -= 1
+        return x
+
+
+class SlowExactMatch(ExactMatch):
+    """Blocks the calling thread while scoring, like a CPU-heavy scorer."""
+
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__(name)
+        self.delay = delay
+
+    def __call__(self, y_true: str, y_pred: str) -> int:
+        time.sleep(self.delay)
+        return super().__call__(y_true, y_pred)
+
+
+def make_cases(n: int) -> list[dict[str, str]]:
+    return [{"x": f"answer {i}", "y_true": f"answer {i}" if i % 2 else "other"}
+            for i in range(n)]
+
+
+class TestRun:
+    @pytest.mark.parametrize("execution_mode", ["sequential", "concurrent", "async"])
+    def test_results_keep_collection_order(self, execution_mode):
+        cases = make_cases(20)
+        model = SlowEchoModel("echo", max_concurrent_requests=4)
+        scorer = ExactMatch("exact_match")
+
+        model_answers, scores = run(
+            model=model,
+            scorer=scorer,
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode=execution_mode,
+        )
+
+        assert model_answers == [case["x"] for case in cases]
+        assert scores == [i % 2 for i in range(len(cases))]
+
+    def test_concurrent_respects_model_max_concurrent_requests(self):
+        cases = make_cases(30)
+        model = SlowEchoModel("echo", max_concurrent_requests=3)
+
+        run(
+            model=model,
+            scorer=ExactMatch("exact_match"),
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode="concurrent",
+        )
+
+        assert 1 <= model.max_in_flight <= 3
+
+    @pytest.mark.parametrize("execution_mode", ["sequential", "concurrent", "async"])
+    def test_completed_cases_are_skipped(self, execution_mode):
+        cases = make_cases(5)
+        model = SlowEchoModel("echo", max_concurrent_requests=2)
+        done = []
+
+        model_answers, scores = run(
+            model=model,
+            scorer=ExactMatch("exact_match"),
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode=execution_mode,
+            completed_cases={
+                2: CaseResult(index=2, model_answer="restored", score=1),
+            },
+            on_case_done=done.append,
+        )
+
+        assert model_answers == ["answer 0", "answer 1", "restored", "answer 3", "answer 4"]
+        assert scores == [0, 1, 1, 1, 0]
+        assert sorted(result.index for result in done) == [0, 1, 3, 4]
+
+    @pytest.mark.parametrize("execution_mode", ["sequential", "concurrent"])
+    def test_batches_go_through_predict_batch(self, execution_mode):
+        cases = make_cases(7)
+        model = SlowEchoModel("echo", max_concurrent_requests=2)
+        model.predict_batch = Mock(side_effect=lambda xs: list(xs))
+
+        model_answers, scores = run(
+            model=model,
+            scorer=ExactMatch("exact_match"),
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode=execution_mode,
+            batch_size=3,
+        )
+
+        assert model_answers == [case["x"] for case in cases]
+        assert scores == [i % 2 for i in range(len(cases))]
+        batch_sizes = sorted(len(c.args[0]) for c in model.predict_batch.call_args_list)
+        # The trailing single case goes through predict()
+        assert batch_sizes == [3, 3]
+
+    @pytest.mark.parametrize(
+        "execution_mode, batch_size",
+        [("sequential", 1), ("sequential", 2), ("concurrent", 2), ("async", 1)],
+    )
+    def test_extra_scorers_score_every_answer(self, execution_mode, batch_size):
+        cases = make_cases(5)
+        done = []
+
+        _, scores = run(
+            model=SlowEchoModel("echo", max_concurrent_requests=2),
+            scorer=ExactMatch("exact_match"),
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode=execution_mode,
+            batch_size=batch_size,
+            on_case_done=done.append,
+            extra_scorers=[IgnoreAllWhitespaces("ignore_all_whitespaces")],
+        )
+
+        assert scores == [i % 2 for i in range(len(cases))]
+        for result in done:
+            assert result.scores_by_scorer == {
+                "exact_match": result.index % 2,
+                "ignore_all_whitespaces": result.index % 2,
+            }
+        assert len(done) == len(cases)
+
+    def test_async_scoring_does_not_block_other_cases(self):
+        cases = make_cases(4)
+        start_time = time.monotonic()
+
+        _, scores = run(
+            model=SlowEchoModel("echo", max_concurrent_requests=4),
+            scorer=SlowExactMatch("exact_match", delay=0.2),
+            eval_cases=iter(cases),
+            collection_length=len(cases),
+            execution_mode="async",
+        )
+
+        assert scores == [i % 2 for i in range(len(cases))]
+        # Scored one after another in the event loop, this would take 0.8 s
+        assert time.monotonic() - start_time < 0.6
+
+    def test_unknown_execution_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown execution mode"):
+            run(
+                model=SlowEchoModel("echo", max_concurrent_requests=1),
+                scorer=ExactMatch("exact_match"),
+                eval_cases=iter([]),
+                collection_length=0,
+                execution_mode="magic",
+            )
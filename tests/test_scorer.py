@@ -6,6 +6,8 @@ import pytest
 from slam_eval.scorer import ExactMatch, IgnoreAllWhitespaces, json_string_to_dict
 from slam_eval.ifbench.scorer import IFBenchScorer
 from slam_eval.ifbench.checker_factory import IFBenchCheckerFactory
+from slam_eval.ifbench import build_checker_factory
+from slam_eval.ifbench.third_party import instructions_util
 
 
 class TestExactMatch:
@@ -163,3 +165,77 @@ class TestIFBenchScorer:
         checker_two.build_description.assert_called_once()
         checker_one.check_following.assert_called_once_with("response")
         checker_two.check_following.assert_called_once_with("response")
+
+    def test_plan_is_built_once_per_case(self):
+        factory = IFBenchCheckerFactory()
+        created_checkers = []
+
+        def _make_checker(instruction_id=0):
+            checker = Mock()
+            checker.build_description = Mock()
+            checker.check_following = Mock(side_effect=lambda value: "ok" in value)
+            created_checkers.append(checker)
+            return checker
+
+        factory.register("checker_one", _make_checker)
+
+        scorer = IFBenchScorer(name="ifbench", checker_factory=factory)
+        y_true = {"instruction_id_list": ["checker_one"], "kwargs": [{}]}
+        scorer.precompile([y_true, dict(y_true)])
+
+        assert scorer(y_true, "ok response") == 1.0
+        assert scorer(y_true, "bad response") == 0.0
+        assert len(created_checkers) == 1
+        created_checkers[0].build_description.assert_called_once()
+
+    def test_real_checkers_through_plan(self):
+        scorer = IFBenchScorer(name="ifbench", checker_factory=build_checker_factory())
+        y_true = {
+            "instruction_id_list": ["count:word_count_range"],
+            "kwargs": [{"min_words": 2, "max_words": 4}],
+        }
+
+        plan = scorer.get_plan(y_true)
+
+        assert plan.instruction_ids == ("count:word_count_range",)
+        assert scorer(y_true, "three short words") == 1.0
+        assert scorer(y_true, "one") == 0.0
+
+
+class TestResponseAnalysis:
+    def test_sentences_are_tokenized_once_per_response(self, monkeypatch):
+        calls = []
+
+        def _sent_tokenize(text):
+            calls.append(text)
+            return [sentence.strip() + "." for sentence in text.split(".") if sentence]
+
+        monkeypatch.setattr(instructions_util.nltk, "sent_tokenize", _sent_tokenize)
+        monkeypatch.setattr(
+            instructions_util,
+            "_available_resources",
+            set(instructions_util.NLTK_RESOURCES),
+        )
+        scorer = IFBenchScorer(name="ifbench", checker_factory=build_checker_factory())
+        y_true = {
+            "instruction_id_list": [
+                "ratio:sentence_balance",
+                "ratio:sentence_type",
+                "count:word_count_range",
+            ],
+            "kwargs": [{}, {}, {"min_words": 1, "max_words": 10}],
+        }
+
+        scorer(y_true, "One. Two")
+        scorer(y_true, "Three")
+
+        assert calls == ["One. Two", "Three"]
+
+    def test_analysis_outside_scope_is_not_shared(self):
+        with instructions_util.analysis_scope("a b") as analysis:
+            assert instructions_util.get_analysis("a b") is analysis
+            assert instructions_util.get_analysis("c d") is not analysis
+
+        assert instructions_util.get_analysis("a b") is not analysis
+        assert analysis.words == ("a", "b")
+        assert analysis.regex_words == ("a", "b")
@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+
+from slam_eval.ifbench import IFBenchScorer, build_checker_factory
+from slam_eval.scorer import ExactMatch, IgnoreAllWhitespaces
+from slam_eval.scoring_pool import ProcessPoolScorer
+
+WORD_COUNT_Y_TRUE = {
+    "instruction_id_list": ["count:word_count_range"],
+    "kwargs": [{"min_words": 2, "max_words": 4}],
+}
+
+
+@pytest.fixture
+def ifbench_scorer():
+    return IFBenchScorer(name="ifbench", checker_factory=build_checker_factory())
+
+
+class TestPicklableScorers:
+    def test_ifbench_scorer_survives_pickling(self, ifbench_scorer):
+        assert ifbench_scorer(WORD_COUNT_Y_TRUE, "three short words") == 1.0
+
+        restored = pickle.loads(pickle.dumps(ifbench_scorer))
+
+        assert restored.name == "ifbench"
+        assert restored(WORD_COUNT_Y_TRUE, "three short words") == 1.0
+        assert restored(WORD_COUNT_Y_TRUE, "one") == 0.0
+
+
+class TestProcessPoolScorer:
+    def test_scores_match_inline_scoring(self):
+        scorer = IgnoreAllWhitespaces(name="ignore_all_whitespaces")
+        y_trues = [f"answer {i}" for i in range(10)]
+        y_preds = [f"answer{i}" if i % 3 else "wrong" for i in range(10)]
+        pool_scorer = ProcessPoolScorer(scorer, max_workers=2, chunk_size=3)
+
+        try:
+            assert pool_scorer.score_batch(y_trues, y_preds) == scorer.score_batch(
+                y_trues, y_preds
+            )
+            assert pool_scorer("a b", "ab") == 1
+            assert pool_scorer.name == scorer.name
+        finally:
+            pool_scorer.close()
+
+    def test_ifbench_scoring_in_worker_processes(self, ifbench_scorer):
+        pool_scorer = ProcessPoolScorer(ifbench_scorer, max_workers=2, chunk_size=2)
+
+        try:
+            scores = pool_scorer.score_batch(
+                [WORD_COUNT_Y_TRUE] * 3, ["one", "two words", "three short words"]
+            )
+        finally:
+            pool_scorer.close()
+
+        assert scores == [0.0, 1.0, 1.0]
+
+    def test_close_without_use_is_noop(self):
+        ProcessPoolScorer(ExactMatch(name="exact_match")).close()
@@ -1,11 +1,16 @@
 import json
 import tempfile
 import os
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import Mock
 
 import pytest
 
-from slam_eval.storage_adapter import LocalJsonlAdapter
+from slam_eval.storage_adapter import (
+    LocalJsonlAdapter,
+    ParquetAdapter,
+    SqliteAdapter,
+)
 from slam_eval.model import Model
 from slam_eval.collections.base import EvalCaseCollection
 
@@ -239,3 +244,533 @@ class TestLocalJsonlAdapter:
             assert len(results) == 2
             assert results[0]["id"] == "eval:test:1"
             assert results[1]["id"] == "eval:test:2"
+
+
+class TestLocalJsonlAdapterStreaming:
+    @staticmethod
+    def _make_model_and_collection():
+        mock_model = Mock(spec=Model)
+        mock_model.name = "test_model"
+        mock_collection = Mock(spec=EvalCaseCollection)
+        mock_collection.name = "test_collection"
+        return mock_model, mock_collection
+
+    def test_streamed_run_is_written_record_by_record(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            adapter = LocalJsonlAdapter(jsonl_path)
+            mock_model, mock_collection = self._make_model_and_collection()
+
+            writer = adapter.open_run(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+            )
+            writer.append(1, 0, "answer2")
+            writer.append(0, 1, "answer1")
+
+            with open(jsonl_path, "r") as f:
+                records = [json.loads(line) for line in f]
+            assert [record["record"] for record in records] == [
+                "header", "case", "case"
+            ]
+
+            writer.close(custom_field="custom_value")
+
+            with open(jsonl_path, "r") as f:
+                records = [json.loads(line) for line in f]
+            assert records[-1]["record"] == "footer"
+            assert records[-1]["num_cases"] == 2
+
+    def test_load_reassembles_streamed_run_like_save(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = LocalJsonlAdapter(os.path.join(temp_dir, "test_results.jsonl"))
+            mock_model, mock_collection = self._make_model_and_collection()
+
+            writer = adapter.open_run(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+            )
+            writer.append(2, 1, "answer3")
+            writer.append(0, 1, "answer1")
+            writer.append(1, 0, "answer2")
+            writer.close(custom_field="custom_value")
+
+            results = adapter.load(r"eval:test_group:.*")
+
+            assert len(results) == 1
+            result_dict = results[0]
+            assert result_dict["id"] == writer.result_id
+            assert result_dict["model"] == "test_model"
+            assert result_dict["eval_case_collection"] == "test_collection"
+            assert result_dict["group_id"] == "test_group"
+            assert result_dict["scores"] == [1, 0, 1]
+            assert result_dict["model_answers"] == ["answer1", "answer2", "answer3"]
+            assert result_dict["custom_field"] == "custom_value"
+            assert "timestamp" in result_dict
+            assert "record" not in result_dict
+            assert "num_cases" not in result_dict
+
+    def test_load_skips_incomplete_streamed_runs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = LocalJsonlAdapter(os.path.join(temp_dir, "test_results.jsonl"))
+            mock_model, mock_collection = self._make_model_and_collection()
+
+            adapter._save_result_dict("eval:test_group:legacy", {"scores": [1]})
+            writer = adapter.open_run(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+            )
+            writer.append(0, 1, "answer1")
+
+            results = adapter.load(r"eval:test_group:.*")
+
+            assert [result["id"] for result in results] == ["eval:test_group:legacy"]
+
+
+class TestLocalJsonlAdapterIndex:
+    def test_save_maintains_sidecar_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            adapter = LocalJsonlAdapter(jsonl_path)
+
+            adapter._save_result_dict("eval:group1:test_1", {"scores": [1]})
+            adapter._save_result_dict("eval:group2:test_2", {"scores": [2]})
+
+            with open(adapter.path_to_index, "r") as f:
+                index_lines = f.read().strip().split("\n")
+            assert len(index_lines) == 2
+
+            with open(jsonl_path, "rb") as f:
+                for index_line in index_lines:
+                    offset, length, raw_id = index_line.split("\t", 2)
+                    f.seek(int(offset))
+                    record = json.loads(f.read(int(length)))
+                    assert record["id"] == json.loads(raw_id)
+
+    def test_load_decodes_only_matching_records(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            adapter = LocalJsonlAdapter(jsonl_path)
+
+            adapter._save_result_dict("eval:group1:test_1", {"scores": [1]})
+            adapter._save_result_dict("eval:group2:test_2", {"scores": [2]})
+            adapter._save_result_dict("eval:group1:test_3", {"scores": [3]})
+
+            # Corrupt the non-matching record in place, keeping its length
+            with open(jsonl_path, "r+b") as f:
+                lines = f.read().split(b"\n")
+                f.seek(len(lines[0]) + 1)
+                f.write(b"{" + b"x" * (len(lines[1]) - 2) + b"}")
+
+            results = adapter.load(r"eval:group1:.*")
+
+            assert [result["scores"] for result in results] == [[1], [3]]
+
+    def test_load_indexes_lines_appended_externally(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            adapter = LocalJsonlAdapter(jsonl_path)
+
+            adapter._save_result_dict("eval:test:1", {"model": "model1"})
+            with open(jsonl_path, "a") as f:
+                f.write('{"id": "eval:test:2", "model": "model2"}\n')
+            adapter._save_result_dict("eval:test:3", {"model": "model3"})
+
+            results = LocalJsonlAdapter(jsonl_path).load(r"eval:test:.*")
+
+            assert [result["model"] for result in results] == [
+                "model1", "model2", "model3"
+            ]
+
+    def test_iter_load_yields_results_as_they_complete(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = LocalJsonlAdapter(os.path.join(temp_dir, "test_results.jsonl"))
+            adapter._save_result_dict("eval:g:1", {"scores": [1]})
+            adapter._save_result_dict("eval:g:2", {"scores": [2]})
+            adapter._save_result_dict("eval:g:3", {"scores": [3]})
+            adapter.add_scores("eval:g:1", {"exact_match": [0]})
+
+            results = adapter.iter_load(r"eval:g:.*")
+            # The second result is yielded before the rest of the file is read
+            assert next(results)["id"] == "eval:g:2"
+            remaining_results = list(results)
+            loaded_results = adapter.load(r"eval:g:.*")
+
+        assert [result["id"] for result in remaining_results] == [
+            "eval:g:3", "eval:g:1"
+        ]
+        assert remaining_results[1]["scores_by_scorer"] == {"exact_match": [0]}
+        assert [result["id"] for result in loaded_results] == [
+            "eval:g:1", "eval:g:2", "eval:g:3"
+        ]
+
+    @pytest.mark.parametrize("padding", ["", "x" * 100])
+    def test_load_rebuilds_index_of_rewritten_file(self, padding):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            adapter = LocalJsonlAdapter(jsonl_path)
+            adapter._save_result_dict("eval:g:1", {"model": "model1"})
+            adapter._save_result_dict("eval:g:2", {"model": "model2"})
+
+            # Rewrite the file, shorter or longer, and keep the stale index
+            os.remove(jsonl_path)
+            with open(jsonl_path, "w") as f:
+                f.write(json.dumps({"id": "eval:g:3", "model": padding}) + "\n")
+
+            results = LocalJsonlAdapter(jsonl_path).load(r"eval:g:.*")
+            adapter._save_result_dict("eval:g:4", {"model": "model4"})
+            reloaded_results = LocalJsonlAdapter(jsonl_path).load(r"eval:g:.*")
+
+        assert [result["id"] for result in results] == ["eval:g:3"]
+        assert [result["id"] for result in reloaded_results] == [
+            "eval:g:3", "eval:g:4"
+        ]
+
+    def test_parallel_processes_keep_index_consistent(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "test_results.jsonl")
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                list(
+                    executor.map(
+                        _save_results, [jsonl_path] * 4, range(4), [25] * 4
+                    )
+                )
+
+            adapter = LocalJsonlAdapter(jsonl_path)
+            entries = adapter._read_index()
+            results = adapter.load(r"eval:.*")
+
+        assert len(entries) == 100
+        assert len({entry.offset for entry in entries}) == 100
+        assert len(results) == 100
+
+
+def _save_results(jsonl_path: str, worker_index: int, num_results: int) -> None:
+    adapter = LocalJsonlAdapter(jsonl_path)
+    for i in range(num_results):
+        adapter._save_result_dict(f"eval:w{worker_index}:{i}", {"scores": [i]})
+
+
+class TestSqliteAdapter:
+    @staticmethod
+    def _make_model_and_collection(model_name="test_model"):
+        mock_model = Mock(spec=Model)
+        mock_model.name = model_name
+        mock_collection = Mock(spec=EvalCaseCollection)
+        mock_collection.name = "test_collection"
+        return mock_model, mock_collection
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = SqliteAdapter(os.path.join(temp_dir, "results.sqlite"))
+            mock_model, mock_collection = self._make_model_and_collection()
+
+            adapter.save(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+                scores=[1, 0, 0.5],
+                model_answers=["answer1", "answer2", {"key": "answer3"}],
+                custom_field="custom_value",
+            )
+            results = adapter.load(r"eval:test_group:.*")
+            adapter.close()
+
+            assert len(results) == 1
+            result_dict = results[0]
+            assert result_dict["id"].startswith("eval:test_group:")
+            assert result_dict["model"] == "test_model"
+            assert result_dict["eval_case_collection"] == "test_collection"
+            assert result_dict["group_id"] == "test_group"
+            assert result_dict["scores"] == [1, 0, 0.5]
+            assert result_dict["model_answers"] == [
+                "answer1", "answer2", {"key": "answer3"}
+            ]
+            assert result_dict["custom_field"] == "custom_value"
+            assert "timestamp" in result_dict
+
+    def test_streamed_run_is_loaded_only_once_complete(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = SqliteAdapter(os.path.join(temp_dir, "results.sqlite"))
+            mock_model, mock_collection = self._make_model_and_collection()
+
+            writer = adapter.open_run(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+            )
+            writer.append(1, 0, "answer2")
+            writer.append(0, 1, "answer1")
+            assert adapter.load(r".*") == []
+
+            writer.close(custom_field="custom_value")
+            results = adapter.load(r".*")
+            adapter.close()
+
+            assert results[0]["scores"] == [1, 0]
+            assert results[0]["model_answers"] == ["answer1", "answer2"]
+            assert results[0]["custom_field"] == "custom_value"
+
+    def test_mean_scores_per_model(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_to_db = os.path.join(temp_dir, "results.sqlite")
+            adapter = SqliteAdapter(path_to_db)
+            for model_name, scores in [
+                ("model_a", [1, 1, 0, 0]),
+                ("model_a", [1, 1]),
+                ("model_b", [0, 0, 1]),
+            ]:
+                mock_model, mock_collection = self._make_model_and_collection(
+                    model_name
+                )
+                adapter.save(
+                    group_id="test_group",
+                    model=mock_model,
+                    eval_case_collection=mock_collection,
+                    scores=scores,
+                    model_answers=[""] * len(scores),
+                )
+            adapter.close()
+
+            # A second connection sees the rows written by the first one
+            mean_scores = SqliteAdapter(path_to_db).mean_scores("test_collection")
+
+            assert mean_scores == pytest.approx({"model_a": 4 / 6, "model_b": 1 / 3})
+            assert SqliteAdapter(path_to_db).mean_scores(
+                "test_collection", since_timestamp=4102444800.0  # 2100-01-01
+            ) == {}
+
+
+class TestParquetAdapter:
+    @staticmethod
+    def _save(adapter, group_id, model_name, scores, model_answers, **other_results):
+        mock_model = Mock(spec=Model)
+        mock_model.name = model_name
+        mock_collection = Mock(spec=EvalCaseCollection)
+        mock_collection.name = "test_collection"
+        adapter.save(
+            group_id=group_id,
+            model=mock_model,
+            eval_case_collection=mock_collection,
+            scores=scores,
+            model_answers=model_answers,
+            **other_results,
+        )
+
+    def test_load_returns_empty_list_when_nothing_saved(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = ParquetAdapter(os.path.join(temp_dir, "results"))
+            assert adapter.load(".*") == []
+            assert adapter.load(".*", lazy=True).count_rows() == 0
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = ParquetAdapter(os.path.join(temp_dir, "results"))
+            self._save(
+                adapter,
+                "test_group",
+                "org/test_model",
+                [1, 0, 1],
+                ["answer1", "answer2", "answer3"],
+                custom_field="custom_value",
+            )
+
+            results = adapter.load(r"eval:test_group:.*")
+
+            assert len(results) == 1
+            result_dict = results[0]
+            assert result_dict["id"].startswith("eval:test_group:")
+            assert result_dict["group_id"] == "test_group"
+            assert result_dict["model"] == "org/test_model"
+            assert result_dict["eval_case_collection"] == "test_collection"
+            assert result_dict["scores"] == [1, 0, 1]
+            assert result_dict["model_answers"] == ["answer1", "answer2", "answer3"]
+            assert result_dict["custom_field"] == "custom_value"
+            assert "timestamp" in result_dict
+
+    def test_writes_hive_partitions(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root_dir = os.path.join(temp_dir, "results")
+            adapter = ParquetAdapter(root_dir)
+            self._save(adapter, "test_group", "test_model", [1], ["answer"])
+
+            partition_dir = os.path.join(
+                root_dir,
+                "group_id=test_group",
+                "model=test_model",
+                "eval_case_collection=test_collection",
+            )
+            assert len(os.listdir(partition_dir)) == 1
+
+    def test_lazy_load_supports_column_pruning_and_filtering(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = ParquetAdapter(os.path.join(temp_dir, "results"))
+            self._save(adapter, "group1", "model_a", [1, 0], ["a", "b"])
+            self._save(adapter, "group1", "model_b", [1, 1], ["c", "d"])
+            self._save(adapter, "group2", "model_a", [0, 0], ["e", "f"])
+
+            dataset = adapter.load(r"eval:group1:.*", lazy=True)
+            table = dataset.to_table(columns=["model", "score"])
+
+            assert table.column_names == ["model", "score"]
+            mean_scores = table.group_by("model").aggregate([("score", "mean")])
+            assert dict(
+                zip(
+                    mean_scores["model"].to_pylist(),
+                    mean_scores["score_mean"].to_pylist(),
+                )
+            ) == {"model_a": 0.5, "model_b": 1.0}
+
+    def test_load_with_columns_skips_answers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = ParquetAdapter(os.path.join(temp_dir, "results"))
+            self._save(adapter, "group1", "model_a", [1, 0], ["a", "b"])
+
+            results = adapter.load(r".*", columns=["score"])
+
+            assert results[0]["scores"] == [1, 0]
+            assert "model_answers" not in results[0]
+
+
+class TestAddScores:
+    ADAPTER_FACTORIES = {
+        "jsonl": lambda temp_dir: LocalJsonlAdapter(
+            os.path.join(temp_dir, "results.jsonl")
+        ),
+        "sqlite": lambda temp_dir: SqliteAdapter(
+            os.path.join(temp_dir, "results.sqlite")
+        ),
+        "parquet": lambda temp_dir: ParquetAdapter(os.path.join(temp_dir, "results")),
+    }
+
+    @pytest.mark.parametrize("adapter_name", sorted(ADAPTER_FACTORIES))
+    def test_added_scores_are_loaded_with_result(self, adapter_name):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = self.ADAPTER_FACTORIES[adapter_name](temp_dir)
+            mock_model = Mock(spec=Model)
+            mock_model.name = "test_model"
+            mock_collection = Mock(spec=EvalCaseCollection)
+            mock_collection.name = "test_collection"
+            adapter.save(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+                scores=[1, 0, 1],
+                model_answers=["a", "b", "c"],
+            )
+            (result_dict,) = adapter.load(r".*")
+
+            adapter.add_scores(result_dict["id"], {"exact_match": [0, 0, 1]})
+            adapter.add_scores(
+                result_dict["id"],
+                {"exact_match": [1, 0, 1], "ignore_all_whitespaces": [1, 1, 1]},
+            )
+            (reloaded,) = adapter.load(r".*")
+
+            assert reloaded["scores"] == [1, 0, 1]
+            assert reloaded["model_answers"] == ["a", "b", "c"]
+            assert reloaded["scores_by_scorer"] == {
+                "exact_match": [1, 0, 1],
+                "ignore_all_whitespaces": [1, 1, 1],
+            }
+            if adapter_name == "parquet":
+                assert adapter.load(r".*", lazy=True).count_rows() == 3
+
+    @pytest.mark.parametrize("adapter_name", sorted(ADAPTER_FACTORIES))
+    def test_cases_without_extra_scores_keep_vectors_aligned(self, adapter_name):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = self.ADAPTER_FACTORIES[adapter_name](temp_dir)
+            mock_model = Mock(spec=Model)
+            mock_model.name = "test_model"
+            mock_collection = Mock(spec=EvalCaseCollection)
+            mock_collection.name = "test_collection"
+            run_writer = adapter.open_run("test_group", mock_model, mock_collection)
+
+            # Case 0 was resumed from a checkpoint without the extra scorer
+            run_writer.append(0, 1, "a")
+            run_writer.append(1, 0, "b", {"em": 0})
+            run_writer.append(2, 1, "c", {"em": 1})
+            run_writer.close()
+            (result_dict,) = adapter.load(r".*")
+
+        assert result_dict["scores_by_scorer"] == {"em": [None, 0, 1]}
+
+    @pytest.mark.parametrize("adapter_name", sorted(ADAPTER_FACTORIES))
+    def test_loaded_types_match_saved_types(self, adapter_name):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = self.ADAPTER_FACTORIES[adapter_name](temp_dir)
+            mock_model = Mock(spec=Model)
+            mock_model.name = "test_model"
+            mock_collection = Mock(spec=EvalCaseCollection)
+            mock_collection.name = "test_collection"
+            adapter.save(
+                group_id="test_group",
+                model=mock_model,
+                eval_case_collection=mock_collection,
+                scores=[1, 0.5],
+                model_answers=["a", {"label": 2}],
+                scores_by_scorer={"exact_match": [0, 1]},
+            )
+            (result_dict,) = adapter.load(r".*")
+
+        assert [type(score) for score in result_dict["scores"]] == [int, float]
+        assert result_dict["scores"] == [1, 0.5]
+        assert result_dict["model_answers"] == ["a", {"label": 2}]
+        assert [
+            type(score) for score in result_dict["scores_by_scorer"]["exact_match"]
+        ] == [int, int]
+
+    @pytest.mark.parametrize("adapter_name", sorted(ADAPTER_FACTORIES))
+    @pytest.mark.parametrize("streamed", [False, True])
+    def test_whole_valued_float_scores_stay_floats(self, adapter_name, streamed):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = self.ADAPTER_FACTORIES[adapter_name](temp_dir)
+            mock_model = Mock(spec=Model)
+            mock_model.name = "test_model"
+            mock_collection = Mock(spec=EvalCaseCollection)
+            mock_collection.name = "test_collection"
+            scores = [1.0, 0.5, 0.0]
+            if streamed:
+                run_writer = adapter.open_run("test_group", mock_model, mock_collection)
+                for index, score in enumerate(scores):
+                    run_writer.append(index, score, "a", {"f1": score})
+                run_writer.close()
+            else:
+                adapter.save(
+                    group_id="test_group",
+                    model=mock_model,
+                    eval_case_collection=mock_collection,
+                    scores=scores,
+                    model_answers=["a"] * len(scores),
+                    scores_by_scorer={"f1": scores},
+                )
+            (result_dict,) = adapter.load(r".*")
+
+        f1_scores = result_dict["scores_by_scorer"]["f1"]
+        assert result_dict["scores"] == f1_scores == scores
+        assert [type(score) for score in result_dict["scores"]] == [float] * 3
+        assert [type(score) for score in f1_scores] == [float] * 3
+
+    @pytest.mark.parametrize("adapter_name", sorted(ADAPTER_FACTORIES))
+    def test_streamed_scores_of_several_scorers(self, adapter_name):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = self.ADAPTER_FACTORIES[adapter_name](temp_dir)
+            mock_model = Mock(spec=Model)
+            mock_model.name = "test_model"
+            mock_collection = Mock(spec=EvalCaseCollection)
+            mock_collection.name = "test_collection"
+            run_writer = adapter.open_run("test_group", mock_model, mock_collection)
+
+            run_writer.append(1, 0, "b ", {"exact_match": 0, "ignore_ws": 1})
+            run_writer.append(0, 1, "a", {"exact_match": 1, "ignore_ws": 1})
+            run_writer.close()
+            (result_dict,) = adapter.load(r".*")
+
+            assert result_dict["scores"] == [1, 0]
+            assert result_dict["scores_by_scorer"] == {
+                "exact_match": [1, 0],
+                "ignore_ws": [1, 1],
+            }
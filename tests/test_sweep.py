@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+import hydra
+import pytest
+
+from slam_eval.model import Model
+from slam_eval.scripts.sweep import main
+from slam_eval.storage_adapter import LocalJsonlAdapter
+from tests.test_main import SimpleEvalCaseCollection
+
+FINISHED_MODELS = []
+
+
+class CountingCollection(SimpleEvalCaseCollection):
+    num_loads = 0
+
+    def _load(self):
+        CountingCollection.num_loads += 1
+        return super()._load()
+
+
+class AnsweringModel(Model):
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__(name)
+        self.delay = delay
+        self._lock = threading.Lock()
+        self.num_calls = 0
+
+    def predict(self, x):
+        time.sleep(self.delay)
+        with self._lock:
+            self.num_calls += 1
+        return "Test answer 1"
+
+    def close(self) -> None:
+        FINISHED_MODELS.append(self.name)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    with hydra.initialize(
+        version_base="1.3",
+        config_path="../config",
+        job_name="test_app"
+    ):
+        default_cfg = hydra.compose(config_name="config_sweep")
+
+    default_cfg.checkpoint_dir = str(tmp_path)
+    default_cfg.storage_adapter = {
+        "_target_": "slam_eval.storage_adapter.LocalJsonlAdapter",
+        "path_to_jsonl": os.path.join(tmp_path, "results.jsonl"),
+    }
+    default_cfg.models = {
+        name: {"_target_": "tests.test_sweep.AnsweringModel", "name": name, "delay": delay}
+        for name, delay in (("slow_model", 0.05), ("fast_model", 0.0))
+    }
+    default_cfg.collections = {
+        name: {
+            "collection": {"_target_": "tests.test_sweep.CountingCollection", "name": name},
+            "scorer": {"_target_": "slam_eval.scorer.ExactMatch", "name": "exact_match"},
+        }
+        for name in ("collection_a", "collection_b")
+    }
+    return default_cfg
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    CountingCollection.num_loads = 0
+    FINISHED_MODELS.clear()
+
+
+def test_sweep_evaluates_every_model_on_every_collection(cfg, tmp_path):
+    main(cfg)
+
+    results = LocalJsonlAdapter(os.path.join(tmp_path, "results.jsonl")).load(r".*")
+    assert sorted((r["model"], r["eval_case_collection"]) for r in results) == [
+        ("fast_model", "collection_a"),
+        ("fast_model", "collection_b"),
+        ("slow_model", "collection_a"),
+        ("slow_model", "collection_b"),
+    ]
+    for result_dict in results:
+        assert result_dict["scores"] == [1, 0, 0]
+    # Collections are loaded once for all models
+    assert CountingCollection.num_loads == 2
+    # The fast model does not wait for the slow one
+    assert FINISHED_MODELS[:2] == ["fast_model", "fast_model"]
+
+
+def test_sweep_goes_on_after_a_failed_run(cfg, monkeypatch):
+    def _fail_fast_model(self, x):
+        if self.name == "fast_model":
+            raise ConnectionError("endpoint is down")
+        return "Test answer 1"
+
+    monkeypatch.setattr(AnsweringModel, "predict", _fail_fast_model)
+
+    with pytest.raises(RuntimeError, match="fast_model_C_collection_a"):
+        main(cfg)
+
+    assert FINISHED_MODELS.count("slow_model") == 2
@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from slam_eval.transport import HttpTransport
+from tests.llm_stub_server import StubLlmServer, echo_responder
+
+
+class ConcurrencyTrackingResponder:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return echo_responder(payload)
+
+
+def make_payload(i: int) -> dict:
+    return {"messages": [{"role": "user", "content": f"prompt {i}"}]}
+
+
+class TestHttpTransport:
+    def test_post_reuses_keep_alive_connections(self):
+        with StubLlmServer() as server:
+            transport = HttpTransport(max_connections=2, max_keepalive_connections=2)
+            try:
+                for i in range(10):
+                    response = transport.post(
+                        server.url, json=make_payload(i), headers={}
+                    )
+                    assert response.status_code == 200
+            finally:
+                transport.close()
+
+        assert len(server.requests) == 10
+        assert len(server.client_addresses) == 1
+
+    def test_post_respects_max_connections_per_host(self):
+        responder = ConcurrencyTrackingResponder(delay=0.02)
+        with StubLlmServer(responder) as server:
+            transport = HttpTransport(max_connections=16, max_connections_per_host=3)
+            try:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    responses = list(
+                        executor.map(
+                            lambda i: transport.post(
+                                server.url, json=make_payload(i), headers={}
+                            ),
+                            range(24),
+                        )
+                    )
+            finally:
+                transport.close()
+
+        assert all(response.status_code == 200 for response in responses)
+        assert 1 <= responder.max_in_flight <= 3